@@ -0,0 +1,39 @@
+"""ETags des routes de lecture (RFC 9110 §8.8.3).
+
+- fort (`"<version>"`) pour une entité : colonne `version` de la ligne
+- faible (`W/"<revision>"`) pour une liste : compteur de changements du projet
+
+Le contrôle `If-None-Match` se fait avant la requête principale : en cas de
+correspondance, 304 sans requête de liste ni sérialisation.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def strong_etag(version: int, coding: Optional[str] = None) -> str:
+    """`coding` : ETag distinct pour une représentation encodée (ex. gzip)."""
+    return f'"{version}-{coding}"' if coding else f'"{version}"'
+
+
+def weak_etag(revision: int) -> str:
+    return f'W/"{revision}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible, celle prévue pour If-None-Match (préfixe W/ ignoré)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
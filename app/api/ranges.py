@@ -0,0 +1,44 @@
+"""Requêtes partielles `Range: bytes=...` (RFC 9110 §14).
+
+Une seule plage est servie : plusieurs plages, unité inconnue ou syntaxe
+invalide donnent la ressource entière (200), comme le permet la RFC.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+
+def byte_range(header: Optional[str], length: int) -> Optional[tuple[int, int]]:
+    """(début, fin exclue) de la plage demandée ; None = contenu entier.
+
+    416 si la plage ne recouvre aucun octet du contenu.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or first == last == "":
+        return None
+    if not all(part == "" or part.isdigit() for part in (first, last)):
+        return None
+
+    if first == "":  # suffixe : les N derniers octets
+        start, end = max(length - int(last), 0), length
+        satisfiable = int(last) > 0
+    else:
+        start = int(first)
+        end = min(int(last) + 1, length) if last else length
+        if last and int(last) < start:
+            return None
+        satisfiable = start < length
+    if not satisfiable or length == 0:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{length}"},
+        )
+    return start, end
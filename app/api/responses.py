@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, Iterator, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(adapter: TypeAdapter[Any], value: Any, response: Response) -> Response:
+    """JSON encodé par pydantic-core, en gardant les headers posés sur `response`.
+
+    La route renvoie une `Response` : FastAPI ne revalide pas le contenu contre
+    `response_model` (qui reste utilisé pour la doc OpenAPI).
+    """
+    return Response(
+        content=adapter.dump_json(value),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """`gzip` accepté par le client (et pas exclu par `;q=0`)."""
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def gzip_stream(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compresser un flux à la volée (Content-Encoding: gzip)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 : en-tête gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
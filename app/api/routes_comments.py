@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Query, Response, status
 
-from app.models.db import get_session
-from app.models.entities import Comment, Epic, Story
+from app.api.responses import json_response
+from app.models.db import Database, get_db
 from app.models.schemas import CommentBase, CommentRead
+from app.services import comments as comments_service
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.serialization import COMMENT_READS
 
 router = APIRouter(tags=["comments"])
 
@@ -17,28 +20,12 @@ router = APIRouter(tags=["comments"])
     response_model=CommentRead,
     status_code=status.HTTP_201_CREATED,
 )
-def add_comment_to_story(
+async def add_comment_to_story(
     story_id: UUID,
     payload: CommentBase,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> CommentRead:
-    story = session.get(Story, story_id)
-    if story is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not found",
-        )
-
-    comment = Comment(
-        story_id=story_id,
-        epic_id=None,
-        text=payload.text,
-        author=payload.author,
-    )
-    session.add(comment)
-    session.commit()
-    session.refresh(comment)
-    return comment
+    return await db.run(comments_service.add_comment_to_story, story_id, payload)
 
 
 @router.post(
@@ -46,61 +33,53 @@ def add_comment_to_story(
     response_model=CommentRead,
     status_code=status.HTTP_201_CREATED,
 )
-def add_comment_to_epic(
+async def add_comment_to_epic(
     epic_id: UUID,
     payload: CommentBase,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> CommentRead:
-    epic = session.get(Epic, epic_id)
-    if epic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Epic not found",
-        )
-
-    comment = Comment(
-        story_id=None,
-        epic_id=epic_id,
-        text=payload.text,
-        author=payload.author,
-    )
-    session.add(comment)
-    session.commit()
-    session.refresh(comment)
-    return comment
+    return await db.run(comments_service.add_comment_to_epic, epic_id, payload)
 
 
 @router.get("/stories/{story_id}/comments", response_model=list[CommentRead])
-def list_story_comments(
+async def list_story_comments(
     story_id: UUID,
-    session: Session = Depends(get_session),
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    db: Database = Depends(get_db),
 ) -> list[CommentRead]:
-    story = session.get(Story, story_id)
-    if story is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not found",
-        )
-
-    comments = session.exec(
-        select(Comment).where(Comment.story_id == story_id)
-    ).all()
-    return comments
+    """Lister les commentaires d’une story (page suivante : header X-Next-Cursor)."""
+    page = await db.run(
+        comments_service.list_story_comments,
+        story_id,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return json_response(COMMENT_READS.adapter, page.items, response)
 
 
 @router.get("/epics/{epic_id}/comments", response_model=list[CommentRead])
-def list_epic_comments(
+async def list_epic_comments(
     epic_id: UUID,
-    session: Session = Depends(get_session),
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    db: Database = Depends(get_db),
 ) -> list[CommentRead]:
-    epic = session.get(Epic, epic_id)
-    if epic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Epic not found",
-        )
-
-    comments = session.exec(
-        select(Comment).where(Comment.epic_id == epic_id)
-    ).all()
-    return comments
\ No newline at end of file
+    """Lister les commentaires d’un epic (page suivante : header X-Next-Cursor)."""
+    page = await db.run(
+        comments_service.list_epic_comments,
+        epic_id,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return json_response(COMMENT_READS.adapter, page.items, response)
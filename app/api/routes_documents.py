@@ -1,23 +1,35 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
-
-from app.models.db import get_session
-from app.models.entities import Document, Project
-from app.models.schemas import DocType, DocumentCreate, DocumentRead, DocumentUpdate
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.etags import etag_matches, not_modified, strong_etag, weak_etag
+from app.api.ranges import byte_range
+from app.api.responses import accepts_gzip, gzip_stream, json_response
+from app.models.db import Database, get_db
+from app.models.schemas import (
+    DocType,
+    DocumentCreate,
+    DocumentRead,
+    DocumentRevisionContent,
+    DocumentRevisionRead,
+    DocumentSummary,
+    DocumentUpdate,
+)
+from app.services import documents as documents_service
+from app.services import projects as projects_service
+from app.services import revisions as revisions_service
+from app.services.serialization import DOCUMENT_READS, DOCUMENT_SUMMARIES
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter(tags=["documents"])
 
-ALLOWED_DOC_TYPES: set[DocType] = {
-    "problem",
-    "vision",
-    "tdr",
-    "retrospective",
-}
+CONTENT_MEDIA_TYPE = "text/plain; charset=utf-8"
+# En dessous, la compression coûte plus qu’elle ne rapporte
+GZIP_MIN_SIZE = 4096
 
 
 @router.post(
@@ -25,90 +37,157 @@ ALLOWED_DOC_TYPES: set[DocType] = {
     response_model=DocumentRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_document(
+async def create_document(
     project_id: UUID,
     payload: DocumentCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> DocumentRead:
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
+    return await db.run(documents_service.create_document, project_id, payload)
 
-    if payload.type not in ALLOWED_DOC_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid document type",
-        )
 
-    doc = Document(
-        project_id=project_id,
-        type=payload.type,
-        content=payload.content,
-    )
-    session.add(doc)
-    session.commit()
-    session.refresh(doc)
+@router.get("/documents/{doc_id}", response_model=DocumentRead)
+async def get_document(
+    doc_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
+) -> DocumentRead:
+    """Lire un document (ETag fort ; 304 sans charger le contenu si inchangé)."""
+    etag = strong_etag(await db.run(documents_service.document_version, doc_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    doc = await db.run(documents_service.get_document, doc_id)
+    response.headers["ETag"] = etag
     return doc
 
 
-@router.get("/documents/{doc_id}", response_model=DocumentRead)
-def get_document(
+@router.get("/documents/{doc_id}/content", response_class=StreamingResponse)
+async def get_document_content(
     doc_id: UUID,
-    session: Session = Depends(get_session),
-) -> DocumentRead:
-    doc = session.get(Document, doc_id)
-    if doc is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
+    range_: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
+) -> Response:
+    """Contenu brut d’un document, en flux (lu par tranches côté base).
+
+    - `Range: bytes=début-fin` : 206 avec `Content-Range` (une plage), 416 hors contenu
+    - `If-Range` : la plage n’est servie que si l’ETag (identité) correspond encore
+    - sans plage, compressé en gzip si le client l’accepte (au-delà de 4 Kio),
+      avec son propre ETag (`"<version>-gzip"`)
+    """
+    info = await db.run(documents_service.document_content_info, doc_id)
+    identity_etag = strong_etag(info.version)
+    ranged = range_ is not None and if_range in (None, identity_etag)
+    gzipped = not ranged and info.length >= GZIP_MIN_SIZE and accepts_gzip(accept_encoding)
+    etag = strong_etag(info.version, "gzip") if gzipped else identity_etag
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
+    span = byte_range(range_, info.length) if ranged else None
+    if span is not None:
+        start, end = span
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{info.length}"
+        headers["Content-Length"] = str(end - start)
+        return StreamingResponse(
+            db.iterate(documents_service.iter_content, doc_id, info.version, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=CONTENT_MEDIA_TYPE,
+            headers=headers,
         )
-    return doc
+
+    chunks = db.iterate(documents_service.iter_content, doc_id, info.version, 0, info.length)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        chunks = gzip_stream(chunks)
+    else:
+        headers["Content-Length"] = str(info.length)
+    return StreamingResponse(chunks, media_type=CONTENT_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/documents/{doc_id}/revisions", response_model=list[DocumentRevisionRead])
+async def list_document_revisions(
+    doc_id: UUID,
+    db: Database = Depends(get_db),
+) -> list[DocumentRevisionRead]:
+    """Versions enregistrées du document (snapshot ou delta, octets stockés)."""
+    return await db.run(revisions_service.list_revisions, doc_id)
+
+
+@router.get(
+    "/documents/{doc_id}/revisions/{version}",
+    response_model=DocumentRevisionContent,
+)
+async def get_document_revision(
+    doc_id: UUID,
+    version: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
+) -> DocumentRevisionContent:
+    """Contenu du document à une version donnée (immuable : ETag fort = version)."""
+    etag = strong_etag(version)
+    if etag_matches(if_none_match, etag):
+        # 404 avant 304 : seule l’existence est vérifiée, sans reconstruction
+        await db.run(revisions_service.ensure_revision, doc_id, version)
+        return not_modified(etag)
+
+    revision = await db.run(revisions_service.get_revision, doc_id, version)
+    response.headers["ETag"] = etag
+    return revision
 
 
 @router.put("/documents/{doc_id}", response_model=DocumentRead)
-def update_document(
+async def update_document(
     doc_id: UUID,
     payload: DocumentUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> DocumentRead:
-    doc = session.get(Document, doc_id)
-    if doc is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
-
-    doc.content = payload.content
-    session.add(doc)
-    session.commit()
-    session.refresh(doc)
-    return doc
+    return await db.run(documents_service.update_document, doc_id, payload)
 
 
-@router.get("/projects/{project_id}/documents", response_model=list[DocumentRead])
-def list_documents(
+@router.get(
+    "/projects/{project_id}/documents",
+    response_model=Union[list[DocumentRead], list[DocumentSummary]],
+)
+async def list_documents(
     project_id: UUID,
+    response: Response,
     type_filter: Optional[DocType] = Query(None, alias="type"),
     search: Optional[str] = Query(None),
-    session: Session = Depends(get_session),
-) -> list[DocumentRead]:
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-
-    query = select(Document).where(Document.project_id == project_id)
-
-    if type_filter is not None:
-        query = query.where(Document.type == type_filter)
-
-    if search:
-        query = query.where(Document.content.contains(search))
-
-    docs = session.exec(query).all()
-    return docs
\ No newline at end of file
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query("full"),
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
+) -> Response:
+    """Lister les documents d’un projet (page suivante : header X-Next-Cursor).
+
+    `view=summary` : sans le contenu, avec sa taille (`content_length`) et un
+    extrait ; le contenu se lit ensuite sur `/documents/{id}/content`.
+
+    ETag faible (compteur de changements du projet), 304 si inchangé.
+    """
+    etag = weak_etag(await db.run(projects_service.project_revision, project_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    page = await db.run(
+        documents_service.list_documents,
+        project_id,
+        type_filter=type_filter,
+        search=search,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        summary=view == "summary",
+    )
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    response.headers["ETag"] = etag
+    reads = DOCUMENT_SUMMARIES if view == "summary" else DOCUMENT_READS
+    return json_response(reads.adapter, page.items, response)
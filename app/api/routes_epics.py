@@ -3,12 +3,17 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
-from app.models.db import get_session
-from app.models.entities import Epic, Project
+from app.api.etags import etag_matches, not_modified, strong_etag, weak_etag
+from app.api.responses import json_response
+
+from app.models.db import Database, get_db
 from app.models.schemas import EpicCreate, EpicRead, EpicUpdate, Status
+from app.services import epics as epics_service
+from app.services import projects as projects_service
+from app.services.serialization import EPIC_READS
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter(tags=["epics"])
 
@@ -18,105 +23,78 @@ router = APIRouter(tags=["epics"])
     response_model=EpicRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_epic(
+async def create_epic(
     project_id: UUID,
     payload: EpicCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> EpicRead:
     """Créer un epic dans un projet.
 
     - 404 si le projet n’existe pas
     - status initial = backlog
     """
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-
-    epic = Epic(
-        project_id=project_id,
-        title=payload.title,
-        status="backlog",
-    )
-    session.add(epic)
-    session.commit()
-    session.refresh(epic)
-    return epic
+    return await db.run(epics_service.create_epic, project_id, payload)
 
 
 @router.get("/epics/{epic_id}", response_model=EpicRead)
-def get_epic(
+async def get_epic(
     epic_id: UUID,
-    session: Session = Depends(get_session),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
 ) -> EpicRead:
-    """Lire un epic par son id."""
-    epic = session.get(Epic, epic_id)
-    if epic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Epic not found",
-        )
+    """Lire un epic par son id (ETag fort, 304 si `If-None-Match` correspond)."""
+    epic = await db.run(epics_service.get_epic, epic_id)
+    etag = strong_etag(epic.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return epic
 
 
 @router.put("/epics/{epic_id}", response_model=EpicRead)
-def update_epic(
+async def update_epic(
     epic_id: UUID,
     payload: EpicUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> EpicRead:
-    """Modifier un epic (titre, statut).
-
-    TODO (plus tard) : appliquer les règles de workflow sur status.
-    """
-    epic = session.get(Epic, epic_id)
-    if epic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Epic not found",
-        )
-
-    if payload.title is not None:
-        epic.title = payload.title
-
-    if payload.status is not None:
-        # Ici, Pydantic garantit déjà que le status est dans l’enum Status
-        epic.status = payload.status
-
-    session.add(epic)
-    session.commit()
-    session.refresh(epic)
-    return epic
+    """Modifier un epic (titre, statut)."""
+    return await db.run(epics_service.update_epic, epic_id, payload)
 
 
 @router.get("/projects/{project_id}/epics", response_model=list[EpicRead])
-def list_epics(
+async def list_epics(
     project_id: UUID,
+    response: Response,
     status_filter: Optional[Status] = Query(None, alias="status"),
     search: Optional[str] = Query(None),
-    session: Session = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
 ) -> list[EpicRead]:
     """Lister les epics d’un projet, avec filtre statut et recherche.
 
     - 404 si le projet n’existe pas
+    - sans `limit` : tous les epics (comportement historique)
+    - page suivante : header X-Next-Cursor, à repasser dans `cursor`
+    - ETag faible (compteur de changements du projet), 304 si inchangé
     """
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-
-    query = select(Epic).where(Epic.project_id == project_id)
-
-    if status_filter is not None:
-        query = query.where(Epic.status == status_filter)
-
-    if search:
-        # .contains fonctionne sur SQLite et Postgres, suffisant pour le TP
-        query = query.where(Epic.title.contains(search))
-
-    epics = session.exec(query).all()
-    return epics
\ No newline at end of file
+    etag = weak_etag(await db.run(projects_service.project_revision, project_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    page = await db.run(
+        epics_service.list_epics,
+        project_id,
+        status_filter=status_filter,
+        search=search,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    response.headers["ETag"] = etag
+    return json_response(EPIC_READS.adapter, page.items, response)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import tempfile
+from functools import partial
+from typing import IO, AsyncIterator, Optional
+from uuid import UUID
+
+import anyio
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response, status
+
+from app.models.db import Database, get_db
+from app.models.schemas import ImportFormat, ImportJobRead, ImportRowErrorRead
+from app.services import imports as imports_service
+
+router = APIRouter(tags=["imports"])
+
+# Corps de requête gardé en mémoire jusqu’à cette taille, puis sur disque
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+async def _spool(body: AsyncIterator[bytes]) -> IO[bytes]:
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    async for chunk in body:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+@router.post(
+    "/projects/{project_id}/import",
+    response_model=ImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def import_backlog(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    format: ImportFormat = Query("ndjson"),
+    resume: Optional[UUID] = Query(None),
+    chunk_size: int = Query(imports_service.IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    db: Database = Depends(get_db),
+) -> ImportJobRead:
+    """Importer des epics / stories (corps NDJSON ou CSV, même format que l’export).
+
+    - le corps est lu en flux puis traité en tâche de fond, par lots
+      transactionnels de `chunk_size` lignes
+    - progression : GET /imports/{job_id} (header Location) ; rejets :
+      GET /imports/{job_id}/errors
+    - `resume=<job_id>` avec le même fichier : reprise après le dernier lot validé
+    """
+    body = await _spool(request.stream())
+    job = await db.run(imports_service.open_import, project_id, format, resume)
+    background_tasks.add_task(
+        anyio.to_thread.run_sync,
+        partial(imports_service.import_stream, db, job.id, body, format, chunk_size),
+    )
+    response.headers["Location"] = f"/imports/{job.id}"
+    return job
+
+
+@router.get("/imports/{job_id}", response_model=ImportJobRead)
+async def get_import_job(
+    job_id: UUID,
+    db: Database = Depends(get_db),
+) -> ImportJobRead:
+    return await db.run(imports_service.get_import_job, job_id)
+
+
+@router.get("/imports/{job_id}/errors", response_model=list[ImportRowErrorRead])
+async def list_import_errors(
+    job_id: UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Database = Depends(get_db),
+) -> list[ImportRowErrorRead]:
+    """Lignes rejetées (numéro de ligne et erreur), dans l’ordre du fichier."""
+    return await db.run(imports_service.list_import_errors, job_id, offset, limit)
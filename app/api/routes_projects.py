@@ -1,19 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from uuid import UUID
 
-from app.models.db import get_session
-from app.models.entities import Project
-from app.models.schemas import ProjectCreate, ProjectRead
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.models.db import Database, get_db
+from app.models.schemas import ProjectCreate, ProjectRead, ProjectStats
+from app.services import export as export_service
+from app.services import projects as projects_service
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.post("", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     payload: ProjectCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> ProjectRead:
     """Créer un projet.
 
@@ -21,26 +24,46 @@ def create_project(
     - name longueur >= 3 (géré par Pydantic)
     - 409 si doublon de nom
     """
-    existing = session.exec(
-        select(Project).where(Project.name == payload.name)
-    ).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Project name already exists",
-        )
-
-    project = Project(name=payload.name)
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-    return project
+    return await db.run(projects_service.create_project, payload)
 
 
 @router.get("", response_model=list[ProjectRead])
-def list_projects(
-    session: Session = Depends(get_session),
+async def list_projects(
+    db: Database = Depends(get_db),
 ) -> list[ProjectRead]:
     """Lister tous les projets."""
-    projects = session.exec(select(Project)).all()
-    return projects
\ No newline at end of file
+    return await db.run(projects_service.list_projects)
+
+
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+async def get_project_stats(
+    project_id: UUID,
+    db: Database = Depends(get_db),
+) -> ProjectStats:
+    """Nombre de stories et points par statut, priorité et assigné.
+
+    Servi depuis les compteurs tenus à jour à chaque écriture (pas de scan).
+    """
+    return await db.run(projects_service.project_stats, project_id)
+
+
+@router.get("/{project_id}/export", response_class=StreamingResponse)
+async def export_project(
+    project_id: UUID,
+    format: export_service.ExportFormat = Query("ndjson"),
+    db: Database = Depends(get_db),
+) -> StreamingResponse:
+    """Exporter tout le backlog du projet (epics, stories, commentaires, sprints).
+
+    - ndjson : une ligne JSON par enregistrement, champ `type` en tête
+    - csv : une ligne par enregistrement, colonnes = union des champs
+    Flux lu par curseur côté serveur : mémoire constante quelle que soit la taille.
+    """
+    project = await db.run(projects_service.get_project, project_id)
+    return StreamingResponse(
+        db.iterate(export_service.export_project, project.id, format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="project-{project.id}.{format}"'
+        },
+    )
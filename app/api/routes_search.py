@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from app.models.db import Database, get_db
+from app.models.schemas import SearchEntityType, SearchResponse
+from app.services.search import search_in_project
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/projects/{project_id}/search", response_model=SearchResponse)
+async def search(
+    project_id: UUID,
+    q: str = Query(min_length=1, max_length=200),
+    entity_types: Optional[list[SearchEntityType]] = Query(None, alias="type"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Database = Depends(get_db),
+) -> SearchResponse:
+    """Recherche plein texte classée (stories, epics, documents, commentaires).
+
+    - `type` répétable pour restreindre les entités (?type=story&type=epic)
+    - 404 si le projet n’existe pas
+    """
+    return await db.run(search_in_project, project_id, q, entity_types, limit)
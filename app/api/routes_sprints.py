@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-
-from app.models.db import get_session
-from app.models.entities import Project, Sprint, Story, StorySprintHistory
-from app.models.schemas import SprintAssignResponse, SprintCreate, SprintRead
-from app.services.sprints import (
-    ensure_no_open_stories_in_sprint,
-    ensure_story_not_in_other_active_sprint,
+from fastapi import APIRouter, Depends, Query, status
+
+from app.models.db import Database, get_db
+from app.models.schemas import (
+    SprintAnalyticsResponse,
+    SprintAssignResponse,
+    SprintBoardResponse,
+    SprintBulkAssignResponse,
+    SprintCreate,
+    SprintRead,
+    SprintStoriesAssign,
 )
+from app.services import sprints as sprints_service
+from app.services.analytics import sprint_analytics
 
 router = APIRouter(tags=["sprints"])
 
@@ -21,130 +25,94 @@ router = APIRouter(tags=["sprints"])
     response_model=SprintRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_sprint(
+async def create_sprint(
     project_id: UUID,
     payload: SprintCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> SprintRead:
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
+    return await db.run(sprints_service.create_sprint, project_id, payload)
 
-    sprint = Sprint(project_id=project_id, name=payload.name, status="planning")
-    session.add(sprint)
-    session.commit()
-    session.refresh(sprint)
-    return sprint
+
+@router.get(
+    "/projects/{project_id}/sprints/analytics",
+    response_model=SprintAnalyticsResponse,
+)
+async def get_sprint_analytics(
+    project_id: UUID,
+    last: int = Query(3, ge=1, le=50),
+    db: Database = Depends(get_db),
+) -> SprintAnalyticsResponse:
+    """Rapport des sprints d’un projet calculé en SQL.
+
+    - par sprint : points engagés, points terminés, stories par statut
+    - vélocité : points terminés des `last` derniers sprints clos
+    - les sprints clos sont mis en cache (leurs chiffres ne bougent plus)
+    """
+    return await db.run(sprint_analytics, project_id, last)
 
 
 @router.put("/sprints/{sprint_id}/start", response_model=SprintRead)
-def start_sprint(
+async def start_sprint(
     sprint_id: UUID,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> SprintRead:
-    sprint = session.get(Sprint, sprint_id)
-    if sprint is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sprint not found",
-        )
-    if sprint.status == "active":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sprint already active",
-        )
-    if sprint.status == "closed":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot start a closed sprint",
-        )
-
-    sprint.status = "active"
-    session.add(sprint)
-    session.commit()
-    session.refresh(sprint)
-    return sprint
+    return await db.run(sprints_service.start_sprint, sprint_id)
+
+
+@router.get("/sprints/{sprint_id}/board", response_model=SprintBoardResponse)
+async def get_sprint_board(
+    sprint_id: UUID,
+    db: Database = Depends(get_db),
+) -> SprintBoardResponse:
+    """Board du sprint : stories par colonne du workflow avec total de points.
+
+    Une seule requête SQL (écrans de standup qui rafraîchissent souvent).
+    """
+    return await db.run(sprints_service.build_sprint_board, sprint_id)
 
 
 @router.put("/sprints/{sprint_id}/close", response_model=SprintRead)
-def close_sprint(
+async def close_sprint(
     sprint_id: UUID,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> SprintRead:
-    sprint = session.get(Sprint, sprint_id)
-    if sprint is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sprint not found",
-        )
+    return await db.run(sprints_service.close_sprint, sprint_id)
 
-    ensure_no_open_stories_in_sprint(session, sprint_id)
 
-    sprint.status = "closed"
-    session.add(sprint)
-    session.commit()
-    session.refresh(sprint)
-    return sprint
+@router.put("/sprints/{sprint_id}/stories", response_model=SprintBulkAssignResponse)
+async def assign_stories_to_sprint(
+    sprint_id: UUID,
+    payload: SprintStoriesAssign,
+    db: Database = Depends(get_db),
+) -> SprintBulkAssignResponse:
+    """Affecter plusieurs stories en une transaction (tout ou rien).
+
+    - 404 si une story n’existe pas dans le projet du sprint
+    - 400 si une story est dans un autre sprint actif ou si le sprint dépasse 20 stories
+    - les stories déjà dans le sprint sont ignorées (`already_assigned`)
+    """
+    return await db.run(
+        sprints_service.assign_stories_to_sprint, sprint_id, payload.story_ids
+    )
 
 
 @router.put(
     "/sprints/{sprint_id}/stories/{story_id}",
     response_model=SprintAssignResponse,
 )
-def assign_story_to_sprint(
+async def assign_story_to_sprint(
     sprint_id: UUID,
     story_id: UUID,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> SprintAssignResponse:
-    sprint = session.get(Sprint, sprint_id)
-    if sprint is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sprint not found",
-        )
-
-    story = session.get(Story, story_id)
-    if story is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not found",
-        )
-
-    ensure_story_not_in_other_active_sprint(session, story_id, sprint)
-
-    existing = session.get(
-        StorySprintHistory,
-        (story_id, sprint_id),
-    )
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Story already in this sprint",
-        )
-
-    link = StorySprintHistory(story_id=story_id, sprint_id=sprint_id)
-    session.add(link)
-    session.commit()
-
-    return SprintAssignResponse(story_id=story_id, sprint_id=sprint_id)
+    return await db.run(sprints_service.assign_story_to_sprint, sprint_id, story_id)
 
 
 @router.delete("/sprints/{sprint_id}/stories/{story_id}")
-def remove_story_from_sprint(
+async def remove_story_from_sprint(
     sprint_id: UUID,
     story_id: UUID,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> dict[str, str]:
-    link = session.get(StorySprintHistory, (story_id, sprint_id))
-    if link is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not in sprint",
-        )
-
-    session.delete(link)
-    session.commit()
-    return {"message": "removed"}
\ No newline at end of file
+    await db.run(sprints_service.remove_story_from_sprint, sprint_id, story_id)
+    return {"message": "removed"}
@@ -3,160 +3,157 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
-from app.models.db import get_session
-from app.models.entities import Epic, Project, Story
+from app.api.etags import etag_matches, not_modified, strong_etag, weak_etag
+from app.api.responses import json_response
+
+from app.models.db import Database, get_db
 from app.models.schemas import (
     Priority,
     Status,
+    StoryBatchCreate,
+    StoryBatchResponse,
+    StoryBatchUpdate,
+    StoryBulkTransition,
+    StoryBulkTransitionResponse,
     StoryCreate,
     StoryRead,
     StoryUpdate,
     StoriesListResponse,
 )
-from app.services.stories import validate_status_transition
+from app.services import projects as projects_service
+from app.services import stories as stories_service
+from app.services.serialization import STORIES_LIST_RESPONSE
 
 router = APIRouter(tags=["stories"])
 
+# `include=comment_count,last_comment` (liste séparée par des virgules)
+INCLUDE_PATTERN = r"^(comment_count|last_comment)(,(comment_count|last_comment))*$"
+
 
 @router.post(
     "/epics/{epic_id}/stories",
     response_model=StoryRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_story(
+async def create_story(
     epic_id: UUID,
     payload: StoryCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> StoryRead:
     """Créer une story dans un epic.
 
     - points : Fibonacci (géré par Pydantic StoryPoints)
     - status initial : backlog
     """
-    epic = session.get(Epic, epic_id)
-    if epic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Epic not found",
-        )
-
-    story = Story(
-        epic_id=epic_id,
-        title=payload.title,
-        description=payload.description,
-        story_points=payload.story_points,
-        priority=payload.priority,
-        status="backlog",
-        assigned_to=None,
-    )
-    session.add(story)
-    session.commit()
-    session.refresh(story)
-    return story
+    return await db.run(stories_service.create_story, epic_id, payload)
+
+
+@router.post("/epics/{epic_id}/stories:batch", response_model=StoryBatchResponse)
+async def create_stories_batch(
+    epic_id: UUID,
+    payload: StoryBatchCreate,
+    db: Database = Depends(get_db),
+) -> StoryBatchResponse:
+    """Créer jusqu’à 1000 stories en une transaction (résultat ou erreur par élément)."""
+    return await db.run(stories_service.create_stories_batch, epic_id, payload.items)
+
+
+@router.patch("/stories:batch", response_model=StoryBatchResponse)
+async def update_stories_batch(
+    payload: StoryBatchUpdate,
+    db: Database = Depends(get_db),
+) -> StoryBatchResponse:
+    """Modifier jusqu’à 1000 stories en une transaction (mêmes règles que PUT)."""
+    return await db.run(stories_service.update_stories_batch, payload.items)
+
+
+@router.post(
+    "/projects/{project_id}/stories:transition",
+    response_model=StoryBulkTransitionResponse,
+)
+async def transition_stories(
+    project_id: UUID,
+    payload: StoryBulkTransition,
+    db: Database = Depends(get_db),
+) -> StoryBulkTransitionResponse:
+    """Passer un ensemble de stories (ids et/ou filtre) à un statut cible.
+
+    Les stories qui sauteraient une étape sont rejetées, les autres passent
+    en un seul UPDATE (nombre de requêtes constant).
+    """
+    return await db.run(stories_service.transition_stories, project_id, payload)
 
 
 @router.get("/stories/{story_id}", response_model=StoryRead)
-def get_story(
+async def get_story(
     story_id: UUID,
-    session: Session = Depends(get_session),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
 ) -> StoryRead:
-    story = session.get(Story, story_id)
-    if story is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not found",
-        )
+    """Lire une story (ETag fort, 304 si `If-None-Match` correspond)."""
+    story = await db.run(stories_service.get_story, story_id)
+    etag = strong_etag(story.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return story
 
 
 @router.put("/stories/{story_id}", response_model=StoryRead)
-def update_story(
+async def update_story(
     story_id: UUID,
     payload: StoryUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
 ) -> StoryRead:
-    story = session.get(Story, story_id)
-    if story is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Story not found",
-        )
-
-    # Gestion du workflow (pas de saut d’étapes)
-    if payload.status is not None:
-        validate_status_transition(story.status, payload.status)
-        story.status = payload.status
-
-    if payload.title is not None:
-        story.title = payload.title
-    if payload.description is not None:
-        story.description = payload.description
-    if payload.story_points is not None:
-        story.story_points = payload.story_points
-    if payload.priority is not None:
-        story.priority = payload.priority
-    if payload.assigned_to is not None:
-        story.assigned_to = payload.assigned_to
-
-    session.add(story)
-    session.commit()
-    session.refresh(story)
-    return story
+    """Modifier une story (400 si le workflow saute une étape)."""
+    return await db.run(stories_service.update_story, story_id, payload)
 
 
 @router.get("/projects/{project_id}/stories", response_model=StoriesListResponse)
-def list_stories(
+async def list_stories(
     project_id: UUID,
+    response: Response,
     status_filter: Optional[Status] = Query(None, alias="status"),
     priority_filter: Optional[Priority] = Query(None, alias="priority"),
     assigned_to: Optional[str] = Query(None),
     sprint_id: Optional[UUID] = Query(None),
     search: Optional[str] = Query(None),
-    offset: int = 0,
-    limit: int = 50,
-    session: Session = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    include: Optional[str] = Query(None, pattern=INCLUDE_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+    db: Database = Depends(get_db),
 ) -> StoriesListResponse:
-    """Lister les stories d’un projet, avec filtres et pagination."""
-    project = session.get(Project, project_id)
-    if project is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-
-    # Jointure via Epic -> Story
-    query = (
-        select(Story)
-        .join(Epic, Epic.id == Story.epic_id)
-        .where(Epic.project_id == project_id)
-    )
-
-    if status_filter is not None:
-        query = query.where(Story.status == status_filter)
-
-    if priority_filter is not None:
-        query = query.where(Story.priority == priority_filter)
-
-    if assigned_to is not None:
-        query = query.where(Story.assigned_to == assigned_to)
+    """Lister les stories d’un projet, avec filtres et pagination.
 
-    if search:
-        query = query.where(
-            Story.title.contains(search) | Story.description.contains(search)
-        )
-
-
-    result = session.exec(query)
-    all_stories = result.all()
-    total = len(all_stories)
-
-    # Pagination côté Python (suffisant pour le TP)
-    stories_page = all_stories[offset : offset + limit]
-
-    # Conversion vers les modèles Pydantic de sortie
-    stories_read = [StoryRead.model_validate(s, from_attributes=True) for s in stories_page]
-    
-    return StoriesListResponse(stories=stories_read, total=total)
\ No newline at end of file
+    - LIMIT/OFFSET appliqués en base
+    - cursor : pagination keyset via `next_cursor` (coût constant par page)
+    - include_total=false : pas de COUNT, `total` vaut null
+    - include=comment_count,last_comment : commentaires par story (une requête par page)
+    - ETag faible (compteur de changements du projet), 304 si inchangé
+    """
+    etag = weak_etag(await db.run(projects_service.project_revision, project_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    result = await db.run(
+        stories_service.list_stories,
+        project_id,
+        status_filter=status_filter,
+        priority_filter=priority_filter,
+        assigned_to=assigned_to,
+        sprint_id=sprint_id,
+        search=search,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        include=include.split(",") if include else (),
+    )
+    response.headers["ETag"] = etag
+    return json_response(STORIES_LIST_RESPONSE, result, response)
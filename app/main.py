@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+from typing import Any
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
+
+from app import metrics
 from app.api import (
     routes_projects,
     routes_epics,
@@ -8,21 +13,42 @@ from app.api import (
     routes_sprints,
     routes_comments,
     routes_documents,
+    routes_search,
+    routes_imports,
 )
-from app.models.db import init_db
+from app.models.db import Database, get_db, init_db, pool_stats
+from app.services.cache import entity_cache
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="LLM Task Manager")
+    app.add_middleware(metrics.MetricsMiddleware)
 
     @app.on_event("startup")
     def on_startup() -> None:
-        init_db()
+        # Base de la dépendance get_db, éventuellement surchargée (tests, benchmarks)
+        db = app.dependency_overrides.get(get_db, get_db)()
+        init_db(db.bind)
 
     @app.get("/health")
     def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/health/db")
+    def database_health(db: Database = Depends(get_db)) -> dict[str, Any]:
+        """Statistiques du pool de connexions (taille, connexions prises, débordement)."""
+        return {"async": db.is_async, **pool_stats(db.active_engine)}
+
+    @app.get("/health/cache")
+    def cache_health() -> dict[str, Any]:
+        """Cache d’entités : taille, hits / misses, évictions."""
+        return entity_cache.stats()
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def prometheus_metrics() -> PlainTextResponse:
+        """Latence par route, requêtes SQL et temps base par requête, attente du pool."""
+        return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
     # Routers REST
     app.include_router(routes_projects.router)
     app.include_router(routes_epics.router)
@@ -30,6 +56,8 @@ def create_app() -> FastAPI:
     app.include_router(routes_sprints.router)
     app.include_router(routes_comments.router)
     app.include_router(routes_documents.router)
+    app.include_router(routes_search.router)
+    app.include_router(routes_imports.router)
     
 
     return app
@@ -1,86 +1,137 @@
 from __future__ import annotations
 
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
 from uuid import UUID
 
+import anyio
+from anyio import CapacityLimiter
+from fastapi import HTTPException
 from fastmcp import FastMCP
-from sqlmodel import Session, select
-
-from app.models.db import engine, init_db
-from app.models.entities import (
-    Project,
-    Epic,
-    Story,
-    Sprint,
-    StorySprintHistory,
-    Comment,
-    Document,
-)
+from pydantic import TypeAdapter
+
+from app.mcp.stats import ToolStatsMiddleware, ToolStatsRegistry
+from app.models.db import Database, async_engine, engine, init_db, settings
 from app.models.schemas import (
+    CommentBase,
+    DocumentCreate,
     ProjectCreate,
     ProjectRead,
-    EpicRead,
+    StoryBulkTransition,
     StoryCreate,
+    StoryInclude,
     StoryRead,
-    StoriesListResponse,
+    StoryTransitionFilter,
     Priority,
     Status,
-    DocType,
+    SearchEntityType,
+)
+from app.services import comments as comments_service
+from app.services import documents as documents_service
+from app.services import epics as epics_service
+from app.services import projects as projects_service
+from app.services import search as search_service
+from app.services import sprints as sprints_service
+from app.services import stories as stories_service
+from app.services.analytics import sprint_analytics
+
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    # Initialiser la base de `runner` au démarrage du serveur, pas à l’import
+    # (les tests et benchmarks remplacent `runner`)
+    await anyio.to_thread.run_sync(init_db, runner.bind)
+    tool_stats.register(*(tool.name for tool in await server.list_tools()))
+    yield
+
+
+mcp = FastMCP("llm-task-manager", lifespan=lifespan)
+
+# Appels, erreurs, latence p50/p95/p99 et octets par tool (tool `server_stats`)
+tool_stats = ToolStatsRegistry()
+mcp.add_middleware(ToolStatsMiddleware(tool_stats))
+
+# Les outils ne font jamais d'I/O DB sur la boucle d'événements : les services
+# passent par le driver async (DB_ASYNC) ou par le pool de threads, au plus
+# MCP_MAX_CONCURRENCY appels à la fois (heartbeats et autres sessions restent fluides)
+runner = Database(
+    engine,
+    async_engine,
+    limiter=CapacityLimiter(settings.mcp_max_concurrency),
 )
-from app.services.sprints import ensure_story_not_in_other_active_sprint
-
-
-def get_session() -> Session:
-    return Session(engine)
-
-
-# Initialiser la base au démarrage du module (équivalent à l'ancien init_db() dans main)
-init_db()
 
 
-mcp = FastMCP("llm-task-manager")
+async def _run(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Exécuter un service via `runner` ; les HTTPException deviennent des ValueError."""
+    try:
+        return await runner.run(fn, *args, **kwargs)
+    except HTTPException as exc:
+        raise ValueError(exc.detail) from exc
 
 
 @mcp.tool
-def create_project(name: str) -> dict:
+async def create_project(name: str) -> dict:
     """Crée un projet Jira-like minimal pour LLMs."""
     payload = ProjectCreate(name=name)
 
-    with get_session() as session:
-        existing = session.exec(
-            select(Project).where(Project.name == payload.name)
-        ).first()
-        if existing:
-            raise ValueError("Project name already exists")
+    project = await _run(projects_service.create_project, payload)
+    return ProjectRead(id=project.id, name=project.name).model_dump()
 
-        project = Project(name=payload.name)
-        session.add(project)
-        session.commit()
-        session.refresh(project)
 
-        return ProjectRead(id=project.id, name=project.name).model_dump()
+@mcp.tool
+async def get_project_stats(project_id: str) -> dict:
+    """Nombre de stories et points d’un projet par statut, priorité et assigné."""
+    stats = await _run(projects_service.project_stats, UUID(project_id))
+    return stats.model_dump(mode="json")
 
 
 @mcp.tool
-def search_epics(project_id: str, search: Optional[str] = None) -> list[dict]:
-    """Recherche des epics dans un projet par mot-clé dans le titre."""
-    proj_uuid = UUID(project_id)
-
-    with get_session() as session:
-        project = session.get(Project, proj_uuid)
-        if project is None:
-            raise ValueError("Project not found")
+async def search_epics(
+    project_id: str,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Recherche des epics dans un projet par mot-clé dans le titre (ordre de création).
+
+    Pour parcourir de gros projets page par page : `search_epics_page`.
+    """
+    page = await _run(
+        epics_service.list_epics,
+        UUID(project_id),
+        search=search,
+        limit=limit,
+    )
+    return [epic.model_dump() for epic in page.items]
 
-        query = select(Epic).where(Epic.project_id == proj_uuid)
-        if search:
-            query = query.where(Epic.title.contains(search))
 
-        epics = session.exec(query).all()
-        return [EpicRead.model_validate(e, from_attributes=True).model_dump() for e in epics]
+@mcp.tool
+async def search_epics_page(
+    project_id: str,
+    search: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> dict:
+    """Comme `search_epics`, paginé par curseur : `{epics, next_cursor}`.
+
+    Repasser `next_cursor` pour la page suivante (None sur la dernière).
+    """
+    page = await _run(
+        epics_service.list_epics,
+        UUID(project_id),
+        search=search,
+        limit=limit,
+        cursor=cursor,
+    )
+    return {
+        "epics": [epic.model_dump() for epic in page.items],
+        "next_cursor": page.next_cursor,
+    }
 
 
 @mcp.tool
-def create_story(
+async def create_story(
     epic_id: str,
     title: str,
     description: str,
@@ -96,183 +147,200 @@ def create_story(
         priority=priority,
     )
 
-    with get_session() as session:
-        epic = session.get(Epic, payload.epic_id)
-        if epic is None:
-            raise ValueError("Epic not found")
-
-        story = Story(
-            epic_id=payload.epic_id,
-            title=payload.title,
-            description=payload.description,
-            story_points=payload.story_points,
-            priority=payload.priority,
-            status="backlog",
-            assigned_to=None,
-        )
-        session.add(story)
-        session.commit()
-        session.refresh(story)
-
-        return StoryRead.model_validate(story, from_attributes=True).model_dump()
+    story = await _run(stories_service.create_story, payload.epic_id, payload)
+    return StoryRead.model_validate(story, from_attributes=True).model_dump()
 
 
 @mcp.tool
-def list_stories(
+async def list_stories(
     project_id: str,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     assigned_to: Optional[str] = None,
+    sprint_id: Optional[str] = None,
     search: Optional[str] = None,
     limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    include: Optional[list[StoryInclude]] = None,
 ) -> dict:
-    """Liste les stories d’un projet avec filtres statut/priorité/assigné."""
-    proj_uuid = UUID(project_id)
+    """Liste les stories d’un projet avec filtres statut/priorité/assigné/sprint.
 
+    Pagination par offset ou par curseur (`next_cursor` de la page précédente).
+    `include` : ["comment_count", "last_comment"] pour le nombre de commentaires
+    et le plus récent de chaque story.
+    """
     status_filter: Optional[Status] = None
     if status is not None:
-        status_filter = Status(status)  # type: ignore[arg-type]
+        status_filter = TypeAdapter(Status).validate_python(status)
 
     priority_filter: Optional[Priority] = None
     if priority is not None:
-        priority_filter = Priority(priority)  # type: ignore[arg-type]
-
-    with get_session() as session:
-        project = session.get(Project, proj_uuid)
-        if project is None:
-            raise ValueError("Project not found")
-
-        query = (
-            select(Story)
-            .join(Epic, Epic.id == Story.epic_id)
-            .where(Epic.project_id == proj_uuid)
-        )
-
-        if status_filter is not None:
-            query = query.where(Story.status == status_filter)
-
-        if priority_filter is not None:
-            query = query.where(Story.priority == priority_filter)
-
-        if assigned_to is not None:
-            query = query.where(Story.assigned_to == assigned_to)
+        priority_filter = TypeAdapter(Priority).validate_python(priority)
+
+    response = await _run(
+        stories_service.list_stories,
+        UUID(project_id),
+        status_filter=status_filter,
+        priority_filter=priority_filter,
+        assigned_to=assigned_to,
+        sprint_id=UUID(sprint_id) if sprint_id is not None else None,
+        search=search,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        include=include or (),
+    )
+    return response.model_dump()
 
-        if search:
-            query = query.where(
-                Story.title.contains(search) | Story.description.contains(search)
-            )
 
-        all_stories = session.exec(query).all()
-        total = len(all_stories)
-        stories_page = all_stories[:limit]
+@mcp.tool
+async def transition_stories(
+    project_id: str,
+    target_status: str,
+    story_ids: Optional[list[str]] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    sprint_id: Optional[str] = None,
+    search: Optional[str] = None,
+) -> dict:
+    """Passe plusieurs stories (ids et/ou filtres) à un statut cible en une requête.
 
-        stories_read = [
-            StoryRead.model_validate(s, from_attributes=True).model_dump()
-            for s in stories_page
-        ]
+    Les stories qui sauteraient une étape du workflow sont listées dans `rejected`.
+    """
+    criteria = StoryTransitionFilter(
+        status=status,
+        priority=priority,
+        assigned_to=assigned_to,
+        sprint_id=sprint_id,
+        search=search,
+    )
+    payload = StoryBulkTransition(
+        target_status=target_status,
+        story_ids=story_ids,
+        filter=criteria,
+    )
 
-        return StoriesListResponse(stories=stories_read, total=total).model_dump()
+    response = await _run(stories_service.transition_stories, UUID(project_id), payload)
+    return response.model_dump(mode="json")
 
 
 @mcp.tool
-def assign_story_to_sprint(
+async def assign_story_to_sprint(
     sprint_id: str,
     story_id: str,
 ) -> dict:
     """Assigne une story à un sprint (1 seul sprint actif par story)."""
-    sprint_uuid = UUID(sprint_id)
-    story_uuid = UUID(story_id)
+    link = await _run(
+        sprints_service.assign_story_to_sprint, UUID(sprint_id), UUID(story_id)
+    )
+    return {"story_id": str(link.story_id), "sprint_id": str(link.sprint_id)}
 
-    with get_session() as session:
-        sprint = session.get(Sprint, sprint_uuid)
-        if sprint is None:
-            raise ValueError("Sprint not found")
 
-        story = session.get(Story, story_uuid)
-        if story is None:
-            raise ValueError("Story not found")
+@mcp.tool
+async def assign_stories_to_sprint(
+    sprint_id: str,
+    story_ids: list[str],
+) -> dict:
+    """Assigne plusieurs stories à un sprint en une fois (tout ou rien, max 20 par sprint)."""
+    response = await _run(
+        sprints_service.assign_stories_to_sprint,
+        UUID(sprint_id),
+        [UUID(story_id) for story_id in story_ids],
+    )
+    return response.model_dump(mode="json")
 
-        ensure_story_not_in_other_active_sprint(session, story_uuid, sprint)
 
-        existing = session.get(StorySprintHistory, (story_uuid, sprint_uuid))
-        if existing:
-            raise ValueError("Story already in this sprint")
+@mcp.tool
+async def get_sprint_board(sprint_id: str) -> dict:
+    """Board d’un sprint : stories groupées par statut avec points par colonne."""
+    board = await _run(sprints_service.build_sprint_board, UUID(sprint_id))
+    return board.model_dump(mode="json")
 
-        link = StorySprintHistory(story_id=story_uuid, sprint_id=sprint_uuid)
-        session.add(link)
-        session.commit()
 
-        return {"story_id": str(story_uuid), "sprint_id": str(sprint_uuid)}
+@mcp.tool
+async def get_sprint_analytics(project_id: str, last: int = 3) -> dict:
+    """Rapport des sprints d’un projet : points engagés/terminés, stories par statut,
+    vélocité des `last` derniers sprints clos."""
+    response = await _run(sprint_analytics, UUID(project_id), last)
+    return response.model_dump(mode="json")
 
 
 @mcp.tool
-def add_comment_to_story(
+async def add_comment_to_story(
     story_id: str,
     text: str,
     author: Optional[str] = None,
 ) -> dict:
     """Ajoute un commentaire à une story (>=10 caractères)."""
-    story_uuid = UUID(story_id)
-
-    with get_session() as session:
-        story = session.get(Story, story_uuid)
-        if story is None:
-            raise ValueError("Story not found")
-
-        if len(text) < 10:
-            raise ValueError("Comment text must be at least 10 characters")
-
-        comment = Comment(
-            story_id=story_uuid,
-            epic_id=None,
-            text=text,
-            author=author,
-        )
-        session.add(comment)
-        session.commit()
-        session.refresh(comment)
-
-        return {
-            "id": str(comment.id),
-            "story_id": str(comment.story_id),
-            "epic_id": comment.epic_id and str(comment.epic_id),
-            "text": comment.text,
-            "author": comment.author,
-        }
+    if len(text) < 10:
+        raise ValueError("Comment text must be at least 10 characters")
+
+    comment = await _run(
+        comments_service.add_comment_to_story,
+        UUID(story_id),
+        CommentBase(text=text, author=author),
+    )
+    return {
+        "id": str(comment.id),
+        "story_id": str(comment.story_id),
+        "epic_id": comment.epic_id and str(comment.epic_id),
+        "text": comment.text,
+        "author": comment.author,
+    }
 
 
 @mcp.tool
-def create_document(
+async def create_document(
     project_id: str,
     type: str,
     content: str,
 ) -> dict:
     """Crée un document (problem, vision, tdr, retrospective) pour un projet."""
-    proj_uuid = UUID(project_id)
-    doc_type = DocType(type)
-
-    with get_session() as session:
-        project = session.get(Project, proj_uuid)
-        if project is None:
-            raise ValueError("Project not found")
-
-        doc = Document(
-            project_id=proj_uuid,
-            type=doc_type,
-            content=content,
-        )
-        session.add(doc)
-        session.commit()
-        session.refresh(doc)
-
-        return {
-            "id": str(doc.id),
-            "project_id": str(doc.project_id),
-            "type": doc.type,
-            "content": doc.content,
-        }
+    payload = DocumentCreate(project_id=UUID(project_id), type=type, content=content)
+
+    doc = await _run(documents_service.create_document, payload.project_id, payload)
+    return {
+        "id": str(doc.id),
+        "project_id": str(doc.project_id),
+        "type": doc.type,
+        "content": doc.content,
+    }
+
+
+@mcp.tool
+async def search(
+    project_id: str,
+    query: str,
+    types: Optional[list[SearchEntityType]] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Recherche plein texte classée dans un projet (stories, epics, documents, commentaires).
+
+    Chaque résultat contient un extrait où les mots trouvés sont entre <mark>…</mark>.
+    """
+    response = await _run(
+        search_service.search_in_project, UUID(project_id), query, types, limit
+    )
+    return [hit.model_dump(mode="json") for hit in response.hits]
+
+
+@mcp.tool
+async def server_stats() -> dict:
+    """Statistiques des tools depuis le démarrage : appels, taux d’erreur,
+    latence (moyenne, p50/p95/p99, max en ms), octets reçus / renvoyés."""
+    return tool_stats.snapshot()
+
+
+@mcp.resource("stats://tools", mime_type="application/json")
+def server_stats_resource() -> dict:
+    """Statistiques des tools (même contenu que le tool `server_stats`)."""
+    return tool_stats.snapshot()
 
 
 if __name__ == "__main__":
     # Transport stdio par défaut (compatible MCP)
-    mcp.run()
\ No newline at end of file
+    mcp.run()
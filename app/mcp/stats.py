@@ -0,0 +1,176 @@
+"""Statistiques des tools MCP : appels, erreurs, latence, volume échangé.
+
+`ToolStatsMiddleware` chronomètre chaque appel de tool (middleware FastMCP,
+donc tous les `@mcp.tool` sans décorateur supplémentaire). Les quantiles
+viennent d’un sketch à erreur relative bornée (type DDSketch) : mémoire
+constante quel que soit le nombre d’appels. Les appels passent tous par la
+boucle d’événements : pas de verrou.
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import pydantic_core
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools import ToolResult
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QuantileSketch:
+    """Quantiles approchés à `relative_accuracy` près, au plus `max_bins` cases.
+
+    Une valeur x tombe dans la case ceil(log_gamma(x)) ; au-delà de
+    `max_bins`, les plus petites cases sont fusionnées (les quantiles hauts,
+    ceux qui comptent pour la latence, restent exacts à l’erreur près).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 1024):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0  # valeurs <= 0 (non représentables en log)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_bins:
+            low, next_low = sorted(self.bins)[:2]
+            self.bins[next_low] += self.bins.pop(low)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+@dataclass
+class ToolStats:
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    latency: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def record(self, elapsed: float, request_bytes: int, response_bytes: int, error: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.total_seconds += elapsed
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.latency.add(elapsed)
+
+    def summary(self) -> dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.errors / self.calls if self.calls else 0.0,
+            "latency_ms": {
+                "mean": ms(self.total_seconds / self.calls) if self.calls else None,
+                **{f"p{round(q * 100)}": ms(self.latency.quantile(q)) for q in QUANTILES},
+                "max": ms(self.latency.max) if self.calls else None,
+            },
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class ToolStatsRegistry:
+    """Statistiques par tool depuis le démarrage du process.
+
+    Seuls les tools enregistrés (`register`) ont leurs propres statistiques :
+    les noms inconnus, fournis par le client, partagent le compteur
+    `UNKNOWN_TOOL` (mémoire bornée par le nombre de tools du serveur).
+    """
+
+    UNKNOWN_TOOL = "<unknown>"
+
+    def __init__(self) -> None:
+        self.tools: dict[str, ToolStats] = {}
+        self.known: set[str] = set()
+        self.started_at = time.time()
+
+    def register(self, *names: str) -> None:
+        self.known.update(names)
+
+    def get(self, name: str) -> ToolStats:
+        if name not in self.known:
+            name = self.UNKNOWN_TOOL
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = ToolStats()
+        return stats
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "tools": {name: self.tools[name].summary() for name in sorted(self.tools)},
+        }
+
+    def reset(self) -> None:
+        self.tools.clear()
+        self.started_at = time.time()
+
+
+def _result_size(result: ToolResult) -> int:
+    size = 0
+    for block in result.content or ():
+        text = getattr(block, "text", None)
+        size += len(text.encode()) if isinstance(text, str) else len(pydantic_core.to_json(block))
+    if result.structured_content is not None:
+        size += len(pydantic_core.to_json(result.structured_content))
+    return size
+
+
+class ToolStatsMiddleware(Middleware):
+    """Chronomètre les appels de tools et mesure arguments / réponse en octets JSON."""
+
+    def __init__(self, registry: ToolStatsRegistry):
+        self.registry = registry
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[Any],
+        call_next: CallNext[Any, ToolResult],
+    ) -> ToolResult:
+        name = context.message.name
+        request_bytes = len(pydantic_core.to_json(context.message.arguments or {}))
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            self.registry.get(name).record(time.perf_counter() - start, request_bytes, 0, True)
+            raise
+        self.registry.get(name).record(
+            time.perf_counter() - start,
+            request_bytes,
+            _result_size(result),
+            bool(result.is_error),
+        )
+        return result
@@ -0,0 +1,276 @@
+"""Métriques par requête, exposées sur `/metrics` (format texte Prometheus).
+
+- `MetricsMiddleware` (ASGI) : latence par route, nombre de requêtes SQL,
+  temps passé en base et attente de connexion pour chaque requête HTTP
+- `install_engine_metrics(engine)` : hooks `before/after_cursor_execute`
+  qui chronomètrent chaque requête SQL et l’imputent à la requête HTTP en
+  cours (ContextVar, propagée aux threads d’AnyIO)
+- l’attente du pool est mesurée par les classes de pool `Timed*` (db.py)
+- `METRICS_QUERY_BUDGET` : requêtes HTTP au-delà du budget journalisées
+
+Enregistrement sans verrou : chaque thread écrit dans sa propre « shard » ;
+le rendu additionne les shards (lecture éventuellement en léger retard).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.settings import get_metrics_settings
+
+logger = logging.getLogger(__name__)
+
+# Bornes des histogrammes (secondes, puis nombre de requêtes SQL)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Shards:
+    """Valeurs par thread : chaque thread n’écrit que dans son dictionnaire."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._all: list[dict[Labels, list[float]]] = []
+        self._register = threading.Lock()  # pris une fois par thread
+
+    def mine(self) -> dict[Labels, list[float]]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values: dict[Labels, list[float]] = {}
+            with self._register:
+                self._all.append(values)
+            self._local.values = values
+            return values
+
+    def merged(self, width: int) -> dict[Labels, list[float]]:
+        total: dict[Labels, list[float]] = {}
+        for shard in list(self._all):
+            for labels, values in list(shard.items()):
+                acc = total.setdefault(labels, [0.0] * width)
+                for i, value in enumerate(values):
+                    acc[i] += value
+        return total
+
+    def clear(self) -> None:
+        for shard in list(self._all):
+            shard.clear()
+
+
+class Histogram:
+    """Histogramme Prometheus : une case par borne, +Inf, somme."""
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._width = len(self.buckets) + 2  # cases, +Inf, somme
+        self._shards = _Shards()
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shards.mine()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = [0.0] * self._width
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._shards.merged(self._width).items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format(bound)
+                lines.append(
+                    f"{self.name}_bucket{_labels((*labels, ('le', le)))} {_format(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{_labels(labels)} {_format(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(labels)} {_format(cumulative)}")
+        return lines
+
+    def clear(self) -> None:
+        self._shards.clear()
+
+
+def _format(value: Any) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Latence des requêtes HTTP par route", LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP", QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Temps passé en base par requête HTTP", LATENCY_BUCKETS
+)
+REQUEST_POOL_WAIT = Histogram(
+    "http_request_pool_wait_seconds",
+    "Attente d’une connexion du pool par requête HTTP",
+    LATENCY_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL (HTTP, MCP, scripts)", LATENCY_BUCKETS
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Attente d’une connexion du pool", LATENCY_BUCKETS
+)
+
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    REQUEST_QUERIES,
+    REQUEST_DB_TIME,
+    REQUEST_POOL_WAIT,
+    QUERY_DURATION,
+    POOL_WAIT,
+)
+
+
+@dataclass
+class RequestStats:
+    """Compteurs d’une requête HTTP (un seul thread y écrit à la fois)."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def render() -> str:
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+# --- Base de données ---
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, executemany: bool) -> None:
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, executemany: bool) -> None:
+    start = getattr(context, "_metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    QUERY_DURATION.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def install_engine_metrics(engine: Engine) -> None:
+    """Chronométrer les requêtes SQL de `engine` (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_pool_wait(elapsed: float) -> None:
+    POOL_WAIT.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += elapsed
+
+
+class _TimedCheckout:
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            record_pool_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool qui mesure l’attente d’une connexion (ouverture comprise)."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Équivalent pour les engines async."""
+
+
+# --- HTTP ---
+
+class MetricsMiddleware:
+    """Middleware ASGI : une observation par requête HTTP, par route (gabarit de chemin)."""
+
+    def __init__(self, app: Any, query_budget: Optional[int] = None):
+        self.app = app
+        if query_budget is None:
+            query_budget = get_metrics_settings().query_budget
+        self.query_budget = query_budget
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            labels = (("method", scope["method"]), ("route", path))
+            REQUEST_DURATION.observe(elapsed, (*labels, ("status", str(status_code))))
+            REQUEST_QUERIES.observe(stats.queries, labels)
+            REQUEST_DB_TIME.observe(stats.db_seconds, labels)
+            REQUEST_POOL_WAIT.observe(stats.pool_wait_seconds, labels)
+            if self.query_budget is not None and stats.queries > self.query_budget:
+                logger.warning(
+                    "%s %s : %d requêtes SQL (budget %d), %.1f ms en base",
+                    scope["method"],
+                    path,
+                    stats.queries,
+                    self.query_budget,
+                    stats.db_seconds * 1000,
+                )
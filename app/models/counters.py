@@ -0,0 +1,175 @@
+"""Compteurs de stories par projet (table `project_counter`).
+
+Les services qui créent ou modifient des stories accumulent les variations
+dans un `CounterDeltas` puis les appliquent dans leur transaction (upsert
+`ON CONFLICT DO UPDATE` sur SQLite et Postgres, UPDATE puis INSERT ailleurs). `GET /projects/{id}/stats` lit
+ces lignes au lieu de parcourir Epic ⨝ Story.
+
+En cas de dérive (écriture SQL directe, restauration de base) :
+
+    python -m app.models.counters [--project <uuid>]
+"""
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from typing import Any, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.models.entities import Epic, ProjectCounter, Story
+
+DIMENSIONS = ("total", "status", "priority", "assignee")
+
+_TABLE = ProjectCounter.__table__
+
+
+def counter_keys(story: Mapping[str, Any]) -> list[tuple[str, str]]:
+    """(dimension, clé) comptant une story."""
+    return [
+        ("total", ""),
+        ("status", story["status"]),
+        ("priority", story["priority"] or ""),
+        ("assignee", story["assigned_to"] or ""),
+    ]
+
+
+class CounterDeltas:
+    """Variations de compteurs accumulées pendant une écriture."""
+
+    def __init__(self) -> None:
+        self._deltas: dict[tuple[UUID, str, str], list[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, project_id: UUID, story: Mapping[str, Any], sign: int = 1) -> None:
+        points = story["story_points"] or 0
+        for dimension, key in counter_keys(story):
+            delta = self._deltas[(project_id, dimension, key)]
+            delta[0] += sign
+            delta[1] += sign * points
+
+    def change(
+        self,
+        project_id: UUID,
+        before: Mapping[str, Any],
+        after: Mapping[str, Any],
+    ) -> None:
+        self.add(project_id, before, -1)
+        self.add(project_id, after, 1)
+
+    def apply(self, session: Session) -> None:
+        """Upsert des variations non nulles (un seul executemany)."""
+        rows = [
+            {
+                "project_id": project_id,
+                "dimension": dimension,
+                "key": key,
+                "story_count": count,
+                "points": points,
+            }
+            for (project_id, dimension, key), (count, points) in self._deltas.items()
+            if count or points
+        ]
+        if rows:
+            dialect = session.get_bind().dialect.name
+            if dialect in _UPSERT_DIALECTS:
+                session.execute(_upsert(dialect), rows)
+            else:
+                _update_or_insert(session, rows)
+        self._deltas.clear()
+
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _upsert(dialect: str) -> Any:
+    stmt = _UPSERT_DIALECTS[dialect](_TABLE)
+    return stmt.on_conflict_do_update(
+        index_elements=[_TABLE.c.project_id, _TABLE.c.dimension, _TABLE.c.key],
+        set_={
+            "story_count": _TABLE.c.story_count + stmt.excluded.story_count,
+            "points": _TABLE.c.points + stmt.excluded.points,
+        },
+    )
+
+
+def _update_or_insert(session: Session, rows: list[dict[str, Any]]) -> None:
+    """Repli sans `ON CONFLICT` : incrément de la ligne, INSERT si elle n’existe pas."""
+    for row in rows:
+        result = session.execute(
+            update(_TABLE)
+            .where(
+                _TABLE.c.project_id == row["project_id"],
+                _TABLE.c.dimension == row["dimension"],
+                _TABLE.c.key == row["key"],
+            )
+            .values(
+                story_count=_TABLE.c.story_count + row["story_count"],
+                points=_TABLE.c.points + row["points"],
+            )
+        )
+        if result.rowcount == 0:
+            session.execute(insert(_TABLE).values(**row))
+
+
+def _aggregate(dimension: str, key: Any, project_id: Optional[UUID]) -> Any:
+    query = (
+        select(
+            Epic.project_id,
+            literal(dimension),
+            key,
+            func.count(),
+            func.coalesce(func.sum(Story.story_points), 0),
+        )
+        .join(Epic, Epic.id == Story.epic_id)
+        .group_by(Epic.project_id)
+    )
+    if dimension != "total":
+        query = query.group_by(key)
+    if project_id is not None:
+        query = query.where(Epic.project_id == project_id)
+    return query
+
+
+def rebuild_counters(bind: Engine, project_id: Optional[UUID] = None) -> None:
+    """Recalculer les compteurs depuis les stories (tous les projets par défaut)."""
+    keys = {
+        "total": literal(""),
+        "status": Story.status,
+        "priority": func.coalesce(Story.priority, ""),
+        "assignee": func.coalesce(Story.assigned_to, ""),
+    }
+    columns = ["project_id", "dimension", "key", "story_count", "points"]
+    with bind.begin() as conn:
+        purge = delete(_TABLE)
+        if project_id is not None:
+            purge = purge.where(_TABLE.c.project_id == project_id)
+        conn.execute(purge)
+        for dimension in DIMENSIONS:
+            conn.execute(
+                insert(_TABLE).from_select(
+                    columns, _aggregate(dimension, keys[dimension], project_id)
+                )
+            )
+
+
+def install_counters(bind: Engine) -> None:
+    """Remplir les compteurs d’une base existante (appelé par init_db)."""
+    with bind.connect() as conn:
+        empty = conn.execute(select(_TABLE.c.project_id).limit(1)).first() is None
+        has_stories = conn.execute(select(Story.id).limit(1)).first() is not None
+    if empty and has_stories:
+        rebuild_counters(bind)
+
+
+if __name__ == "__main__":
+    from app.models.db import engine, init_db
+
+    parser = argparse.ArgumentParser(description="Recalculer les compteurs de stories par projet")
+    parser.add_argument("--project", type=UUID, default=None)
+    args = parser.parse_args()
+    init_db(engine)
+    rebuild_counters(engine, args.project)
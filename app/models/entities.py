@@ -1,58 +1,169 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Project(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(index=True, min_length=3, max_length=100)
+    # Compteur de changements du projet (ETag faible des listes)
+    revision: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
 
 class Epic(SQLModel, table=True):
+    # (projet, created_at, id) : filtre et tri de la pagination keyset dans le même index
+    __table_args__ = (Index("idx_epics_project_created", "project_id", "created_at", "id"),)
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     title: str = Field(min_length=3, max_length=200)
     status: str = Field(default="backlog")  # on raffinera avec des enums Pydantic
+    # Version de la ligne (ETag fort), incrémentée à chaque modification
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Ordre des listes : (created_at, id) ; rempli à l’ajout de la colonne
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class Story(SQLModel, table=True):
+    # Index documentés dans ARCHITECTURE.md (filtres de list_stories)
+    __table_args__ = (
+        Index("idx_stories_status", "status"),
+        Index("idx_stories_priority_assigned", "priority", "assigned_to"),
+    )
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    epic_id: UUID = Field(foreign_key="epic.id")
+    epic_id: UUID = Field(foreign_key="epic.id", index=True)
     title: str = Field(min_length=3, max_length=200)
     description: Optional[str] = Field(default=None)
     story_points: Optional[int] = Field(default=None)
     priority: Optional[str] = Field(default=None)
     status: str = Field(default="backlog")
     assigned_to: Optional[str] = Field(default=None, max_length=100)
+    # Version de la ligne (ETag fort), incrémentée à chaque modification
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Ordre des listes : (created_at, id) ; rempli à l’ajout de la colonne
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class Sprint(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     name: str = Field(max_length=100)
     status: str = Field(default="planning")
+    # Chronologie (analytics : vélocité des N derniers sprints clos)
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = Field(default=None)
+    closed_at: Optional[datetime] = Field(default=None)
+    # JSON : [[statut, stories, points], ...] figés à la clôture (analytics)
+    analytics: Optional[str] = Field(default=None)
 
 
 class StorySprintHistory(SQLModel, table=True):
+    # La clé primaire (story_id, sprint_id) couvre déjà les recherches par story
+    __table_args__ = (Index("idx_stories_sprint", "sprint_id"),)
+
     story_id: UUID = Field(foreign_key="story.id", primary_key=True)
     sprint_id: UUID = Field(foreign_key="sprint.id", primary_key=True)
     # on ajoutera un timestamp plus tard si besoin
 
 
 class Comment(SQLModel, table=True):
+    # (parent, created_at, id) : filtre et tri de la pagination keyset dans le même index
+    __table_args__ = (
+        Index("idx_comments_story", "story_id", "created_at", "id"),
+        Index("idx_comments_epic", "epic_id", "created_at", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     story_id: Optional[UUID] = Field(default=None, foreign_key="story.id")
     epic_id: Optional[UUID] = Field(default=None, foreign_key="epic.id")
     text: str = Field(min_length=5)
     author: Optional[str] = Field(default=None, max_length=100)
+    # Rempli à l’ajout de la colonne pour les commentaires existants
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class Document(SQLModel, table=True):
+    # (projet, created_at, id) : filtre et tri de la pagination keyset dans le même index
+    __table_args__ = (Index("idx_documents_project_created", "project_id", "created_at", "id"),)
+
     id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     type: str = Field(max_length=50)
-    content: str
\ No newline at end of file
+    content: str
+    # Version de la ligne (ETag fort), incrémentée à chaque modification
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Ordre des listes : (created_at, id) ; rempli à l’ajout de la colonne
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class DocumentRevision(SQLModel, table=True):
+    """Historique d’un document : une ligne par version.
+
+    `kind` : « snapshot » (contenu complet, toutes les K versions) ou
+    « delta » (diff par lignes depuis la version précédente, JSON).
+    """
+
+    __tablename__ = "document_revision"
+
+    document_id: UUID = Field(foreign_key="document.id", primary_key=True)
+    version: int = Field(primary_key=True)
+    kind: str = Field(max_length=10)
+    data: str
+    size: int  # octets UTF-8 de `data` (suivi du stockage)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ProjectCounter(SQLModel, table=True):
+    """Compteurs de stories par projet (dashboard), tenus à jour à chaque écriture.
+
+    dimension : total, status, priority ou assignee ; key : valeur de la
+    dimension ("" pour total et pour les stories non assignées).
+    """
+
+    __tablename__ = "project_counter"
+
+    project_id: UUID = Field(foreign_key="project.id", primary_key=True)
+    dimension: str = Field(primary_key=True, max_length=20)
+    key: str = Field(default="", primary_key=True, max_length=100)
+    story_count: int = Field(default=0)
+    points: int = Field(default=0)
+
+
+class ImportJob(SQLModel, table=True):
+    """Import en flux d’epics / stories (NDJSON ou CSV), repris par lots.
+
+    `rows_read` : lignes du fichier traitées par les lots déjà validés ; une
+    reprise saute ces lignes.
+    """
+
+    __tablename__ = "import_job"
+
+    id: UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    project_id: UUID = Field(foreign_key="project.id", index=True)
+    format: str = Field(max_length=10)
+    status: str = Field(default="running", max_length=20)  # running, completed, failed
+    rows_read: int = Field(default=0)
+    epics_created: int = Field(default=0)
+    stories_created: int = Field(default=0)
+    skipped: int = Field(default=0)  # types d’enregistrement non importés
+    failed: int = Field(default=0)
+    message: Optional[str] = Field(default=None)  # cause de l’échec du dernier lot
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ImportRowError(SQLModel, table=True):
+    """Journal des lignes rejetées d’un import (une ligne par rejet)."""
+
+    __tablename__ = "import_row_error"
+
+    job_id: UUID = Field(foreign_key="import_job.id", primary_key=True)
+    row: int = Field(primary_key=True)
+    detail: str  # JSON : message ou erreurs de validation
@@ -0,0 +1,28 @@
+"""Fonctions SQL portables SQLite / Postgres."""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class utf8_bytes(FunctionElement[bytes]):
+    """Texte encodé en UTF-8 : `length` et `substr` comptent alors en octets
+    (plages HTTP `Range` sur le contenu des documents)."""
+
+    type = LargeBinary()
+    name = "utf8_bytes"
+    inherit_cache = True
+
+
+@compiles(utf8_bytes)
+def _compile_default(element: utf8_bytes, compiler: Any, **kw: Any) -> str:
+    return f"CAST({compiler.process(element.clauses, **kw)} AS BLOB)"
+
+
+@compiles(utf8_bytes, "postgresql")
+def _compile_postgresql(element: utf8_bytes, compiler: Any, **kw: Any) -> str:
+    # CAST(text AS bytea) interpréterait les antislashs : convert_to encode tel quel
+    return f"convert_to({compiler.process(element.clauses, **kw)}, 'UTF8')"
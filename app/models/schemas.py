@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Literal, Optional
+from datetime import datetime
+from typing import Any, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -27,6 +28,20 @@ class ProjectRead(ProjectBase):
     id: UUID
 
 
+class CounterValue(BaseModel):
+    story_count: int
+    points: int
+
+
+class ProjectStats(BaseModel):
+    """Compteurs de stories d’un projet (clé "" : story non assignée)."""
+    project_id: UUID
+    total: CounterValue
+    by_status: dict[str, CounterValue]
+    by_priority: dict[str, CounterValue]
+    by_assignee: dict[str, CounterValue]
+
+
 # --- Epic ---
 
 class EpicBase(BaseModel):
@@ -48,6 +63,7 @@ class EpicRead(EpicBase):
     id: UUID
     project_id: UUID
     status: Status
+    version: int = 1
 
 
 
@@ -84,14 +100,124 @@ class StoryRead(BaseModel):
     priority: Priority
     status: Status
     assigned_to: Optional[str]
+    version: int = 1
+
+
+# Champs optionnels des listes de stories (`include=comment_count,last_comment`)
+StoryInclude = Literal["comment_count", "last_comment"]
+
+
+class StoryWithComments(StoryRead):
+    """Story d’une liste avec `include` : null pour un champ non demandé."""
+    comment_count: Optional[int] = None
+    last_comment: Optional[CommentRead] = None
 
 
 class StoriesListResponse(BaseModel):
-    stories: list[StoryRead]
-    total: int
+    # sous-classe en tête : c’est elle qui sérialise les champs `include`
+    stories: list[Union[StoryWithComments, StoryRead]]
+    total: Optional[int]  # None si le comptage a été désactivé
+    next_cursor: Optional[str] = None
+
+
+# Lots : chaque élément est validé séparément (StoryCreate / StoryBatchUpdateItem)
+# pour renvoyer une erreur par élément au lieu d'un 422 global
+class StoryBatchCreate(BaseModel):
+    """Création en lot dans un epic (epic_id de l’URL)."""
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=1000)
+
+
+class StoryBatchUpdateItem(StoryUpdate):
+    id: UUID
+
+
+class StoryBatchUpdate(BaseModel):
+    """Mises à jour en lot, chaque élément porte l’id de sa story."""
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=1000)
+
+
+class StoryBatchResult(BaseModel):
+    index: int
+    story: Optional[StoryRead] = None
+    error: Optional[Union[str, list[dict[str, Any]]]] = None  # message ou erreurs de validation
+
+
+class StoryBatchResponse(BaseModel):
+    results: list[StoryBatchResult]
+    succeeded: int
+    failed: int
+
+
+class StoryTransitionFilter(BaseModel):
+    """Mêmes filtres que la liste des stories d’un projet."""
+    status: Optional[Status] = None
+    priority: Optional[Priority] = None
+    assigned_to: Optional[str] = None
+    sprint_id: Optional[UUID] = None
+    search: Optional[str] = None
+
+
+class StoryBulkTransition(BaseModel):
+    """Transition en masse vers `target_status` (ids et/ou filtre, au moins l’un des deux)."""
+    target_status: Status
+    story_ids: Optional[list[UUID]] = Field(default=None, min_length=1, max_length=1000)
+    filter: Optional[StoryTransitionFilter] = None
+
+
+class StoryTransitionRejection(BaseModel):
+    id: UUID
+    status: Status
+    reason: str
+
+
+class StoryBulkTransitionResponse(BaseModel):
+    target_status: Status
+    moved: list[UUID]
+    unchanged: list[UUID]  # déjà au statut cible
+    rejected: list[StoryTransitionRejection]
+    not_found: list[UUID]  # ids demandés absents du projet
 
 
 
+# --- Import en flux ---
+
+ImportFormat = Literal["ndjson", "csv"]
+ImportStatus = Literal["running", "completed", "failed"]
+
+
+class EpicImportRow(EpicBase):
+    """Ligne `type=epic` d’un import (projet pris dans l’URL, id conservé si fourni)."""
+    id: Optional[UUID] = None
+    status: Status = "backlog"
+
+
+class StoryImportRow(StoryCreate):
+    """Ligne `type=story` d’un import (epic du projet ou importé plus haut)."""
+    id: Optional[UUID] = None
+    status: Status = "backlog"
+    assigned_to: Optional[str] = Field(default=None, max_length=100)
+
+
+class ImportJobRead(BaseModel):
+    id: UUID
+    project_id: UUID
+    format: ImportFormat
+    status: ImportStatus
+    rows_read: int
+    epics_created: int
+    stories_created: int
+    skipped: int
+    failed: int
+    message: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+class ImportRowErrorRead(BaseModel):
+    row: int
+    error: Union[str, list[dict[str, Any]]]
+
+
 # --- Sprint ---
 
 SprintStatus = Literal["planning", "active", "closed"]
@@ -109,6 +235,8 @@ class SprintRead(SprintBase):
     id: UUID
     project_id: UUID
     status: SprintStatus
+    started_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
 
 
 class SprintAssignResponse(BaseModel):
@@ -116,6 +244,55 @@ class SprintAssignResponse(BaseModel):
     sprint_id: UUID
 
 
+class SprintStoriesAssign(BaseModel):
+    story_ids: list[UUID] = Field(min_length=1, max_length=100)
+
+
+class SprintBulkAssignResponse(BaseModel):
+    sprint_id: UUID
+    assigned: list[UUID]
+    already_assigned: list[UUID]  # déjà dans ce sprint, ignorées
+    story_count: int  # stories du sprint après affectation
+
+
+class SprintBoardColumn(BaseModel):
+    status: Status
+    stories: list[StoryRead]
+    story_count: int
+    points: int
+
+
+class SprintBoardResponse(BaseModel):
+    sprint: SprintRead
+    columns: list[SprintBoardColumn]  # une colonne par étape du workflow
+    total_points: int
+
+
+class SprintAnalytics(BaseModel):
+    """Agrégats d’un sprint (points des stories affectées au sprint)."""
+    sprint_id: UUID
+    name: str
+    status: SprintStatus
+    started_at: Optional[datetime]
+    closed_at: Optional[datetime]
+    story_count: int
+    points_committed: int
+    points_done: int
+    stories_by_status: dict[Status, int]
+
+
+class SprintVelocity(BaseModel):
+    """Points terminés des derniers sprints clos (du plus récent au plus ancien)."""
+    sprint_ids: list[UUID]
+    points_done: list[int]
+    average: float
+
+
+class SprintAnalyticsResponse(BaseModel):
+    sprints: list[SprintAnalytics]  # ordre de création
+    velocity: SprintVelocity
+
+
 # --- Comment ---
 
 class CommentBase(BaseModel):
@@ -127,6 +304,7 @@ class CommentRead(CommentBase):
     id: UUID
     story_id: Optional[UUID]
     epic_id: Optional[UUID]
+    created_at: Optional[datetime] = None
 
 
 # --- Document ---
@@ -149,4 +327,46 @@ class DocumentUpdate(BaseModel):
 
 class DocumentRead(DocumentBase):
     id: UUID
-    project_id: UUID
\ No newline at end of file
+    project_id: UUID
+    version: int = 1
+
+
+class DocumentSummary(BaseModel):
+    """Document sans son contenu (listes `view=summary`)."""
+
+    id: UUID
+    project_id: UUID
+    type: DocType
+    version: int = 1
+    content_length: int  # octets (UTF-8), cf. GET /documents/{id}/content
+    excerpt: str  # premiers caractères du contenu
+
+
+class DocumentRevisionRead(BaseModel):
+    version: int
+    kind: Literal["snapshot", "delta"]
+    size: int  # octets stockés pour cette version
+    created_at: datetime
+
+
+class DocumentRevisionContent(BaseModel):
+    document_id: UUID
+    version: int
+    content: str
+
+
+# --- Recherche plein texte ---
+
+SearchEntityType = Literal["story", "epic", "document", "comment"]
+
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    id: UUID
+    title: str
+    snippet: str  # extrait, mots trouvés entre <mark>…</mark>
+    score: float  # pertinence, plus grand = meilleur
+
+
+class SearchResponse(BaseModel):
+    hits: list[SearchHit]
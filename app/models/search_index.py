@@ -0,0 +1,246 @@
+"""Index plein texte partagé par stories, epics, documents et commentaires.
+
+- Postgres : index GIN sur `to_tsvector('simple', ...)` (cf. ARCHITECTURE.md),
+  toujours à jour puisque calculé par la base.
+- SQLite : table virtuelle FTS5 `search_fts` + table de correspondance
+  `search_doc` (type, id, projet), synchronisées par triggers à chaque écriture.
+
+`text_search(Model, terme)` produit le filtre SQL adapté au dialecte, à utiliser
+à la place de `.contains()` (LIKE '%terme%').
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import Boolean, bindparam, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.models.entities import Comment, Document, Epic, Story
+
+# type d'entité -> (modèle, colonnes indexées)
+SEARCHABLE: dict[str, tuple[Any, tuple[str, ...]]] = {
+    "story": (Story, ("title", "description")),
+    "epic": (Epic, ("title",)),
+    "document": (Document, ("content",)),
+    "comment": (Comment, ("text",)),
+}
+
+_ENTITY_TYPES = {model: entity_type for entity_type, (model, _) in SEARCHABLE.items()}
+
+# Balises de surlignage des extraits (FTS5 snippet / ts_headline)
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(term: str) -> list[str]:
+    """Mots de la recherche (la ponctuation et les opérateurs sont ignorés)."""
+    return _WORD_RE.findall(term)
+
+
+def fts5_query(terms: list[str]) -> str:
+    """Requête FTS5 : tous les mots, chacun en préfixe ("mot"*)."""
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def tsquery(terms: list[str]) -> str:
+    """Requête to_tsquery Postgres : tous les mots, chacun en préfixe (mot:*)."""
+    return " & ".join(f"{t.lower()}:*" for t in terms)
+
+
+def pg_vector_sql(columns: tuple[str, ...], alias: str = "") -> str:
+    """Expression tsvector, identique dans l’index GIN et dans les requêtes."""
+    prefix = f"{alias}." if alias else ""
+    parts = " || ' ' || ".join(f"coalesce({prefix}{c}, '')" for c in columns)
+    return f"to_tsvector('simple', {parts})"
+
+
+# --- Filtre SQL réutilisable ---
+
+class _TextSearch(FunctionElement[bool]):
+    """`<id> IN (hits FTS5)` sur SQLite, `tsvector @@ tsquery` sur Postgres."""
+
+    type = Boolean()
+    name = "text_search"
+    inherit_cache = False
+
+    def __init__(self, entity_type: str, table: str, terms: list[str]):
+        self.entity_type = entity_type
+        self.table = table
+        self.terms = terms
+        super().__init__(
+            bindparam(None, fts5_query(terms)),
+            bindparam(None, tsquery(terms)),
+        )
+
+
+@compiles(_TextSearch, "sqlite")
+def _compile_sqlite(element: _TextSearch, compiler: Any, **kw: Any) -> str:
+    fts_param = compiler.process(element.clauses.clauses[0], **kw)
+    return (
+        f"{element.table}.id IN (SELECT d.entity_id FROM search_doc AS d "
+        "JOIN search_fts ON search_fts.rowid = d.doc_id "
+        f"WHERE search_fts MATCH {fts_param} AND d.entity_type = '{element.entity_type}')"
+    )
+
+
+@compiles(_TextSearch, "postgresql")
+def _compile_postgresql(element: _TextSearch, compiler: Any, **kw: Any) -> str:
+    ts_param = compiler.process(element.clauses.clauses[1], **kw)
+    _, columns = SEARCHABLE[element.entity_type]
+    vector = pg_vector_sql(columns, alias=element.table)
+    return f"{vector} @@ to_tsquery('simple', {ts_param})"
+
+
+@compiles(_TextSearch)
+def _compile_default(element: _TextSearch, compiler: Any, **kw: Any) -> str:
+    return compiler.process(like_search(element.entity_type, element.terms), **kw)
+
+
+def like_search(entity_type: str, terms: list[str]) -> ColumnElement[bool]:
+    """LIKE '%mots%' sur les colonnes indexées (dialectes sans plein texte)."""
+    model, columns = SEARCHABLE[entity_type]
+    return or_(*(getattr(model, c).contains(" ".join(terms)) for c in columns))
+
+
+def text_search(model: Any, term: str) -> ColumnElement[bool]:
+    """Filtre plein texte sur `model` (Story, Epic, Document, Comment).
+
+    Chaque mot est cherché en préfixe ; sans mot exploitable (ex. "%%"),
+    on retombe sur un LIKE classique.
+    """
+    entity_type = _ENTITY_TYPES[model]
+    terms = search_terms(term)
+    if not terms:
+        _, columns = SEARCHABLE[entity_type]
+        return or_(*(getattr(model, c).contains(term) for c in columns))
+    return _TextSearch(entity_type, model.__tablename__, terms)
+
+
+# --- DDL ---
+
+def _pg_ddl() -> list[str]:
+    names = {
+        "story": "idx_stories_search",
+        "epic": "idx_epics_search",
+        "document": "idx_documents_search",
+        "comment": "idx_comments_search",
+    }
+    return [
+        f"CREATE INDEX IF NOT EXISTS {names[entity_type]} ON {model.__tablename__} "
+        f"USING GIN ({pg_vector_sql(columns)})"
+        for entity_type, (model, columns) in SEARCHABLE.items()
+    ]
+
+
+# Projet d'un commentaire : via sa story (-> epic) ou directement via son epic
+_COMMENT_PROJECT = (
+    "coalesce("
+    "(SELECT e.project_id FROM story AS s JOIN epic AS e ON e.id = s.epic_id WHERE s.id = NEW.story_id), "
+    "(SELECT e.project_id FROM epic AS e WHERE e.id = NEW.epic_id))"
+)
+
+# type -> (table, expression projet, expression titre, expression corps, colonnes suivies)
+_SQLITE_SOURCES: dict[str, tuple[str, str, str, str, str]] = {
+    "story": (
+        "story",
+        "(SELECT e.project_id FROM epic AS e WHERE e.id = NEW.epic_id)",
+        "NEW.title",
+        "coalesce(NEW.description, '')",
+        "title, description",
+    ),
+    "epic": ("epic", "NEW.project_id", "NEW.title", "''", "title"),
+    "document": ("document", "NEW.project_id", "NEW.type", "NEW.content", "type, content"),
+    "comment": ("comment", _COMMENT_PROJECT, "''", "NEW.text", "text"),
+}
+
+_SQLITE_TABLES = [
+    "CREATE TABLE IF NOT EXISTS search_doc ("
+    "doc_id INTEGER PRIMARY KEY, "
+    "entity_type TEXT NOT NULL, "
+    "entity_id TEXT NOT NULL, "
+    "project_id TEXT, "
+    "UNIQUE (entity_type, entity_id))",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2')",
+]
+
+
+def _sqlite_triggers() -> list[str]:
+    ddl = []
+    for entity_type, (table, project, title, body, watched) in _SQLITE_SOURCES.items():
+        doc_id = (
+            f"(SELECT doc_id FROM search_doc "
+            f"WHERE entity_type = '{entity_type}' AND entity_id = {{row}}.id)"
+        )
+        ddl.append(
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO search_doc (entity_type, entity_id, project_id) "
+            f"VALUES ('{entity_type}', NEW.id, {project}); "
+            f"INSERT INTO search_fts (rowid, title, body) "
+            f"VALUES ({doc_id.format(row='NEW')}, {title}, {body}); "
+            "END"
+        )
+        ddl.append(
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_au "
+            f"AFTER UPDATE OF {watched} ON {table} BEGIN "
+            f"UPDATE search_fts SET title = {title}, body = {body} "
+            f"WHERE rowid = {doc_id.format(row='NEW')}; "
+            "END"
+        )
+        ddl.append(
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM search_fts WHERE rowid = {doc_id.format(row='OLD')}; "
+            f"DELETE FROM search_doc WHERE entity_type = '{entity_type}' AND entity_id = OLD.id; "
+            "END"
+        )
+    return ddl
+
+
+def _sqlite_backfill() -> list[str]:
+    """Indexer les lignes existantes (base créée avant l’index)."""
+    ddl = ["DELETE FROM search_fts", "DELETE FROM search_doc"]
+    for entity_type, (table, project, title, body, _) in _SQLITE_SOURCES.items():
+        ddl.append(
+            f"INSERT INTO search_doc (entity_type, entity_id, project_id) "
+            f"SELECT '{entity_type}', NEW.id, {project} FROM {table} AS NEW"
+        )
+        ddl.append(
+            f"INSERT INTO search_fts (rowid, title, body) "
+            f"SELECT d.doc_id, {title}, {body} FROM {table} AS NEW "
+            f"JOIN search_doc AS d ON d.entity_type = '{entity_type}' AND d.entity_id = NEW.id"
+        )
+    return ddl
+
+
+def install_search_index(bind: Engine) -> None:
+    """Créer l’index plein texte s’il manque (idempotent, appelé par init_db)."""
+    dialect = bind.dialect.name
+    with bind.begin() as conn:
+        if dialect == "postgresql":
+            for statement in _pg_ddl():
+                conn.execute(text(statement))
+        elif dialect == "sqlite":
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'search_doc'")
+            ).first()
+            for statement in _SQLITE_TABLES + _sqlite_triggers():
+                conn.execute(text(statement))
+            if not exists:
+                for statement in _sqlite_backfill():
+                    conn.execute(text(statement))
+
+
+def rebuild_search_index(bind: Engine) -> None:
+    """Reconstruire entièrement l’index SQLite (dérive, restauration de base)."""
+    if bind.dialect.name != "sqlite":
+        return
+    install_search_index(bind)
+    with bind.begin() as conn:
+        for statement in _sqlite_backfill():
+            conn.execute(text(statement))
@@ -0,0 +1,63 @@
+"""Budget de requêtes SQL : détecter les N+1 et les requêtes en trop.
+
+    with query_budget(engine, 3):
+        client.get(f"/projects/{project_id}/stories")
+
+Au-delà du budget, `QueryBudgetExceeded` (AssertionError) liste le SQL
+exécuté. Fixture pytest `query_budget` dans tests/conftest.py ; en
+production, `METRICS_QUERY_BUDGET` journalise les requêtes HTTP en
+dépassement (cf. app/metrics.py).
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class QueryLog:
+    """Requêtes SQL exécutées sur un engine pendant le bloc `with`."""
+
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {i}. {sql}" for i, sql in enumerate(self.statements, 1))
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryLog]:
+    """Enregistrer les requêtes SQL émises sur `engine` (tous threads)."""
+    log = QueryLog()
+
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        log.statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def query_budget(engine: Engine, max_queries: int, label: Optional[str] = None) -> Iterator[QueryLog]:
+    """Échouer si le bloc émet plus de `max_queries` requêtes SQL."""
+    with count_queries(engine) as log:
+        yield log
+    if log.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{label or 'bloc'} : {log.count} requêtes SQL pour un budget de "
+            f"{max_queries}\n{log.report()}"
+        )
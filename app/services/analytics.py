@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.entities import Project, Sprint, Story, StorySprintHistory
+from app.models.schemas import (
+    SprintAnalytics,
+    SprintAnalyticsResponse,
+    SprintVelocity,
+    Status,
+)
+from app.services.common import ensure_exists
+from app.services.stories import WORKFLOW_ORDER
+
+
+def _aggregate(
+    session: Session,
+    sprint_ids: Sequence[UUID],
+) -> dict[UUID, list[tuple[Status, int, int]]]:
+    """(statut, nombre de stories, points) par sprint, en une requête GROUP BY."""
+    rows = session.exec(
+        select(
+            StorySprintHistory.sprint_id,
+            Story.status,
+            func.count(),
+            func.coalesce(func.sum(Story.story_points), 0),
+        )
+        .join(Story, Story.id == StorySprintHistory.story_id)
+        .where(StorySprintHistory.sprint_id.in_(sprint_ids))
+        .group_by(StorySprintHistory.sprint_id, Story.status)
+    ).all()
+
+    grouped: dict[UUID, list[tuple[Status, int, int]]] = defaultdict(list)
+    for sprint_id, story_status, count, points in rows:
+        grouped[sprint_id].append((story_status, count, points))
+    return grouped
+
+
+def _build(sprint: Sprint, per_status: list[tuple[Status, int, int]]) -> SprintAnalytics:
+    by_status: dict[Status, int] = {s: 0 for s in WORKFLOW_ORDER}
+    committed = done = 0
+    for story_status, count, points in per_status:
+        by_status[story_status] = count
+        committed += points
+        if story_status == "done":
+            done = points
+
+    return SprintAnalytics(
+        sprint_id=sprint.id,
+        name=sprint.name,
+        status=sprint.status,
+        started_at=sprint.started_at,
+        closed_at=sprint.closed_at,
+        story_count=sum(by_status.values()),
+        points_committed=committed,
+        points_done=done,
+        stories_by_status=by_status,
+    )
+
+
+def snapshot_sprint_analytics(session: Session, sprint: Sprint) -> None:
+    """Figer les agrégats d’un sprint clos (`Sprint.analytics`), avant le commit.
+
+    À la clôture, puis à chaque story ajoutée / retirée d’un sprint clos.
+    """
+    per_status = _aggregate(session, [sprint.id]).get(sprint.id, [])
+    sprint.analytics = json.dumps([list(row) for row in per_status])
+    session.add(sprint)
+
+
+def sprint_analytics(
+    session: Session,
+    project_id: UUID,
+    last: int = 3,
+) -> SprintAnalyticsResponse:
+    """Points engagés / terminés et stories par statut pour chaque sprint,
+    plus la vélocité des `last` derniers sprints clos.
+
+    Les sprints clos sont servis par leur instantané (chiffres à la
+    clôture) ; seuls les autres passent par l’agrégat SQL.
+    """
+    ensure_exists(session, Project, project_id)
+
+    sprints = session.exec(
+        select(Sprint)
+        .where(Sprint.project_id == project_id)
+        .order_by(Sprint.created_at, Sprint.id)
+    ).all()
+
+    # Sprints clos avant l’instantané (bases existantes) : calculés en direct
+    to_compute = [s.id for s in sprints if s.status != "closed" or s.analytics is None]
+    grouped = _aggregate(session, to_compute) if to_compute else {}
+
+    analytics: list[SprintAnalytics] = []
+    for sprint in sprints:
+        if sprint.status == "closed" and sprint.analytics is not None:
+            per_status = [tuple(row) for row in json.loads(sprint.analytics)]
+        else:
+            per_status = grouped.get(sprint.id, [])
+        analytics.append(_build(sprint, per_status))
+
+    recent = sorted(
+        (a for a in analytics if a.status == "closed"),
+        key=lambda a: a.closed_at or datetime.min,
+        reverse=True,
+    )[:last]
+    points = [a.points_done for a in recent]
+
+    return SprintAnalyticsResponse(
+        sprints=analytics,
+        velocity=SprintVelocity(
+            sprint_ids=[a.sprint_id for a in recent],
+            points_done=points,
+            average=sum(points) / len(points) if points else 0.0,
+        ),
+    )
@@ -0,0 +1,103 @@
+"""Cache LRU + TTL des lectures par id (Project, Epic, Story).
+
+Évite l’aller-retour en base des contrôles d’existence (404) et des
+`GET /epics/{id}` / `GET /stories/{id}`. Les valeurs sont des modèles de
+lecture Pydantic, jamais des objets ORM liés à une session.
+
+Les écritures invalident les entrées concernées après commit ; le TTL borne
+l’obsolescence due aux autres process (plusieurs workers, SQL direct).
+Désactivable avec CACHE_ENABLED=false.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+from app.settings import get_cache_settings
+
+
+class EntityCache:
+    """Cache borné (LRU) à expiration (TTL), partagé entre threads."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 30.0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._data: OrderedDict[tuple[str, UUID], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrémentée à chaque invalidation : une lecture commencée avant
+        # n’écrit pas sa valeur (potentiellement périmée) dans le cache
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model: type, entity_id: UUID) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        key = (model.__name__, entity_id)
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] < time.monotonic():
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(
+        self,
+        model: type,
+        entity_id: UUID,
+        value: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (model.__name__, entity_id)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, model: type, *entity_ids: UUID) -> None:
+        with self._lock:
+            self.generation += 1
+            for entity_id in entity_ids:
+                self._data.pop((model.__name__, entity_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_settings = get_cache_settings()
+entity_cache = EntityCache(
+    max_entries=_settings.max_entries,
+    ttl=_settings.ttl,
+    enabled=_settings.enabled,
+)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.entities import Comment, Epic, Story
+from app.models.schemas import CommentBase, CommentRead
+from app.services.common import ensure_exists, get_read_or_404, save, touch_project
+from app.services.pagination import Page, paginate
+from app.services.serialization import COMMENT_READS
+
+
+def add_comment_to_story(session: Session, story_id: UUID, payload: CommentBase) -> Comment:
+    story = get_read_or_404(session, Story, story_id)
+
+    comment = Comment(
+        story_id=story_id,
+        epic_id=None,
+        text=payload.text,
+        author=payload.author,
+    )
+    session.add(comment)
+    touch_project(session, get_read_or_404(session, Epic, story.epic_id).project_id)
+    return save(session, comment)
+
+
+def add_comment_to_epic(session: Session, epic_id: UUID, payload: CommentBase) -> Comment:
+    epic = get_read_or_404(session, Epic, epic_id)
+
+    comment = Comment(
+        story_id=None,
+        epic_id=epic_id,
+        text=payload.text,
+        author=payload.author,
+    )
+    session.add(comment)
+    touch_project(session, epic.project_id)
+    return save(session, comment)
+
+
+def list_story_comments(
+    session: Session,
+    story_id: UUID,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Page:
+    ensure_exists(session, Story, story_id)
+
+    page = paginate(
+        session,
+        COMMENT_READS.narrow(select(Comment).where(Comment.story_id == story_id)),
+        Comment,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        with_total=False,
+    )
+    page.items = COMMENT_READS.validate(page.items)
+    return page
+
+
+def list_epic_comments(
+    session: Session,
+    epic_id: UUID,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Page:
+    ensure_exists(session, Epic, epic_id)
+
+    page = paginate(
+        session,
+        COMMENT_READS.narrow(select(Comment).where(Comment.epic_id == epic_id)),
+        Comment,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        with_total=False,
+    )
+    page.items = COMMENT_READS.validate(page.items)
+    return page
+
+
+@dataclass
+class CommentSummary:
+    count: int
+    last: Optional[CommentRead] = None
+
+
+def story_comment_summaries(
+    session: Session, story_ids: Sequence[UUID], with_last: bool = False
+) -> dict[UUID, CommentSummary]:
+    """Nombre de commentaires (et le plus récent) par story, en une requête.
+
+    Les stories sans commentaire sont absentes du résultat.
+    """
+    if not story_ids:
+        return {}
+    if not with_last:
+        rows = session.execute(
+            select(Comment.story_id, func.count())
+            .where(Comment.story_id.in_(story_ids))
+            .group_by(Comment.story_id)
+        ).all()
+        return {story_id: CommentSummary(count=count) for story_id, count in rows}
+
+    ranked = (
+        select(
+            *COMMENT_READS.columns,
+            func.count().over(partition_by=Comment.story_id).label("comment_count"),
+            func.row_number()
+            .over(
+                partition_by=Comment.story_id,
+                order_by=(Comment.created_at.desc().nulls_last(), Comment.id.desc()),
+            )
+            .label("comment_rank"),
+        )
+        .where(Comment.story_id.in_(story_ids))
+        .subquery()
+    )
+    rows = session.execute(select(ranked).where(ranked.c.comment_rank == 1)).all()
+    comments = COMMENT_READS.validate(rows)  # colonnes en trop ignorées
+    return {
+        comment.story_id: CommentSummary(count=row.comment_count, last=comment)
+        for comment, row in zip(comments, rows)
+    }
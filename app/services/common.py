@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.models.entities import Epic, Project, Story
+from app.models.schemas import EpicRead, ProjectRead, StoryRead
+from app.services.cache import entity_cache
+
+ModelT = TypeVar("ModelT")
+
+# Entités servies par le cache et leur modèle de lecture
+CACHED_READS: dict[type, type[BaseModel]] = {
+    Project: ProjectRead,
+    Epic: EpicRead,
+    Story: StoryRead,
+}
+
+
+def get_or_404(session: Session, model: type[ModelT], entity_id: UUID) -> ModelT:
+    """Charger une entité par id, 404 « <Model> not found » si elle n’existe pas."""
+    entity = session.get(model, entity_id)
+    if entity is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} not found",
+        )
+    return entity
+
+
+def get_read_or_404(session: Session, model: type, entity_id: UUID) -> Any:
+    """Modèle de lecture d’une entité via le cache d’entités, 404 si absente."""
+    cached = entity_cache.get(model, entity_id)
+    if cached is not None:
+        return cached
+
+    generation = entity_cache.generation
+    value = CACHED_READS[model].model_validate(
+        get_or_404(session, model, entity_id), from_attributes=True
+    )
+    entity_cache.set(model, entity_id, value, generation)
+    return value
+
+
+def ensure_exists(session: Session, model: type, entity_id: UUID) -> None:
+    """Contrôle d’existence (404) servi par le cache quand c’est possible."""
+    get_read_or_404(session, model, entity_id)
+
+
+def save(session: Session, entity: Any) -> Any:
+    """Persister une entité et la renvoyer.
+
+    Les sessions de `Database` sont ouvertes avec expire_on_commit=False :
+    l’objet reste chargé après le commit, pas besoin d’un `refresh`
+    (aller-retour en moins).
+    """
+    session.add(entity)
+    session.commit()
+    if session.expire_on_commit:
+        session.refresh(entity)
+    return entity
+
+
+def touch_project(session: Session, *project_ids: UUID) -> None:
+    """Incrémenter le compteur de changements des projets (ETag des listes).
+
+    À appeler dans la transaction de l’écriture, avant le commit.
+    """
+    for project_id in set(project_ids):
+        session.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(revision=Project.revision + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def bump_version(session: Session, model: type, entity_id: UUID) -> int:
+    """Incrémenter `version` en SQL et renvoyer la nouvelle valeur, 404 si absente.
+
+    À appeler en premier dans la transaction : l’UPDATE prend le verrou
+    d’écriture, les écritures concurrentes sont sérialisées et aucune
+    incrémentation n’est perdue (contrairement à `entity.version += 1`).
+    """
+    version = session.execute(
+        update(model)
+        .where(model.id == entity_id)
+        .values(version=model.version + 1)
+        .returning(model.version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} not found",
+        )
+    return version
+
+
+def validation_errors(exc: ValidationError) -> list[dict[str, Any]]:
+    """Erreurs Pydantic sérialisables (rapport par élément des lots et imports)."""
+    return [
+        {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+        for err in exc.errors()
+    ]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.entities import Document, Project
+from app.models.functions import utf8_bytes
+from app.models.schemas import DocType, DocumentCreate, DocumentUpdate
+from app.models.search_index import text_search
+from app.services.common import (
+    bump_version,
+    ensure_exists,
+    get_or_404,
+    save,
+    touch_project,
+)
+from app.services.pagination import Page, paginate
+from app.services.revisions import record_revision
+from app.services.serialization import DOCUMENT_READS, DOCUMENT_SUMMARIES
+
+ALLOWED_DOC_TYPES: set[DocType] = {
+    "problem",
+    "vision",
+    "tdr",
+    "retrospective",
+}
+
+# GET /documents/{id}/content : taille des tranches envoyées
+CONTENT_CHUNK_SIZE = 256 * 1024
+
+
+def create_document(session: Session, project_id: UUID, payload: DocumentCreate) -> Document:
+    ensure_exists(session, Project, project_id)
+
+    if payload.type not in ALLOWED_DOC_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid document type",
+        )
+
+    doc = Document(
+        project_id=project_id,
+        type=payload.type,
+        content=payload.content,
+    )
+    session.add(doc)
+    record_revision(session, doc)
+    touch_project(session, project_id)
+    return save(session, doc)
+
+
+def get_document(session: Session, doc_id: UUID) -> Document:
+    return get_or_404(session, Document, doc_id)
+
+
+def update_document(session: Session, doc_id: UUID, payload: DocumentUpdate) -> Document:
+    """Nouvelle version du contenu, ajoutée à l’historique.
+
+    La version est incrémentée en SQL avant de lire le contenu précédent :
+    les mises à jour concurrentes sont sérialisées (delta calculé sur la
+    bonne base). Un conflit résiduel sur l’historique renvoie 409.
+    """
+    bump_version(session, Document, doc_id)
+    doc = get_or_404(session, Document, doc_id)
+
+    previous = doc.content
+    doc.content = payload.content
+    try:
+        record_revision(session, doc, previous)
+        touch_project(session, doc.project_id)
+        return save(session, doc)
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document modified concurrently",
+        )
+
+
+def document_version(session: Session, doc_id: UUID) -> int:
+    """Version courante d’un document (ETag) sans charger son contenu, 404 sinon."""
+    version = session.exec(select(Document.version).where(Document.id == doc_id)).first()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    return version
+
+
+@dataclass
+class ContentInfo:
+    version: int
+    length: int  # octets UTF-8
+
+
+def document_content_info(session: Session, doc_id: UUID) -> ContentInfo:
+    """Version et taille du contenu, sans le charger ; 404 sinon."""
+    row = session.exec(
+        select(Document.version, func.length(utf8_bytes(Document.content))).where(
+            Document.id == doc_id
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    return ContentInfo(version=row[0], length=row[1] or 0)
+
+
+def iter_content(
+    session: Session,
+    doc_id: UUID,
+    version: int,
+    start: int,
+    end: int,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Octets [start, end) du contenu à la `version` annoncée (ETag).
+
+    Une seule requête (`substr` côté base : le contenu n’est converti qu’une
+    fois), puis envoi par tranches de `chunk_size`. La lecture a lieu une fois
+    les en-têtes envoyés : si le document a changé entre-temps, le flux
+    s’interrompt (connexion coupée, réponse tronquée) plutôt que de servir
+    une autre version sous cet ETag.
+    """
+    chunk_size = chunk_size or CONTENT_CHUNK_SIZE
+    data = session.exec(
+        select(func.substr(utf8_bytes(Document.content), start + 1, end - start)).where(
+            Document.id == doc_id, Document.version == version
+        )
+    ).first()
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document modified during transfer",
+        )
+    data = memoryview(bytes(data))
+    for position in range(0, len(data), chunk_size):
+        yield bytes(data[position:position + chunk_size])
+
+
+def list_documents(
+    session: Session,
+    project_id: UUID,
+    type_filter: Optional[DocType] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+) -> Page:
+    """Documents d’un projet ; `summary` : métadonnées, taille et extrait
+    (le contenu n’est pas lu)."""
+    ensure_exists(session, Project, project_id)
+    reads = DOCUMENT_SUMMARIES if summary else DOCUMENT_READS
+
+    query = select(Document).where(Document.project_id == project_id)
+
+    if type_filter is not None:
+        query = query.where(Document.type == type_filter)
+
+    if search:
+        query = query.where(text_search(Document, search))
+
+    page = paginate(
+        session,
+        reads.narrow(query),
+        Document,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        with_total=False,
+    )
+    page.items = reads.validate(page.items)
+    return page
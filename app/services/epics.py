@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.models.entities import Epic, Project
+from app.models.schemas import EpicCreate, EpicRead, EpicUpdate, Status
+from app.models.search_index import text_search
+from app.services.cache import entity_cache
+from app.services.common import (
+    bump_version,
+    ensure_exists,
+    get_or_404,
+    get_read_or_404,
+    save,
+    touch_project,
+)
+from app.services.pagination import Page, paginate
+from app.services.serialization import EPIC_READS
+
+
+def create_epic(session: Session, project_id: UUID, payload: EpicCreate) -> Epic:
+    """Créer un epic (status initial = backlog), 404 si le projet n’existe pas."""
+    ensure_exists(session, Project, project_id)
+
+    epic = Epic(
+        project_id=project_id,
+        title=payload.title,
+        status="backlog",
+    )
+    session.add(epic)
+    touch_project(session, project_id)
+    return save(session, epic)
+
+
+def get_epic(session: Session, epic_id: UUID) -> EpicRead:
+    return get_read_or_404(session, Epic, epic_id)
+
+
+def update_epic(session: Session, epic_id: UUID, payload: EpicUpdate) -> Epic:
+    """Modifier un epic (titre, statut).
+
+    TODO (plus tard) : appliquer les règles de workflow sur status.
+    """
+    bump_version(session, Epic, epic_id)
+    epic = get_or_404(session, Epic, epic_id)
+
+    if payload.title is not None:
+        epic.title = payload.title
+
+    if payload.status is not None:
+        # Ici, Pydantic garantit déjà que le status est dans l’enum Status
+        epic.status = payload.status
+
+    touch_project(session, epic.project_id)
+    save(session, epic)
+    entity_cache.invalidate(Epic, epic_id)
+    return epic
+
+
+def list_epics(
+    session: Session,
+    project_id: UUID,
+    status_filter: Optional[Status] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Page:
+    """Epics d’un projet, filtre statut et recherche, 404 si le projet n’existe pas."""
+    ensure_exists(session, Project, project_id)
+
+    query = select(Epic).where(Epic.project_id == project_id)
+
+    if status_filter is not None:
+        query = query.where(Epic.status == status_filter)
+
+    if search:
+        # Index plein texte (FTS5 / GIN) plutôt qu'un LIKE '%...%'
+        query = query.where(text_search(Epic, search))
+
+    page = paginate(
+        session,
+        EPIC_READS.narrow(query),
+        Epic,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        with_total=False,
+    )
+    page.items = EPIC_READS.validate(page.items)
+    return page
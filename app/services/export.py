@@ -0,0 +1,123 @@
+"""Export complet d’un projet en flux (NDJSON ou CSV).
+
+Chaque section (epics, stories, commentaires, sprints, historique) est lue
+par un curseur côté serveur (`yield_per`) et émise lot par lot : la mémoire
+reste bornée à un lot de lignes, quelle que soit la taille du projet.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from typing import Any, Iterator, Literal, Mapping, Optional
+from uuid import UUID
+
+from pydantic_core import to_json
+from sqlalchemy import Select, or_, select
+from sqlmodel import Session
+
+from app.models.entities import (
+    Comment,
+    Epic,
+    Project,
+    Sprint,
+    Story,
+    StorySprintHistory,
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 500
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Type d’enregistrement -> table, dans l’ordre d’émission
+SECTION_TABLES = {
+    "project": Project.__table__,
+    "epic": Epic.__table__,
+    "story": Story.__table__,
+    "comment": Comment.__table__,
+    "sprint": Sprint.__table__,
+    "sprint_history": StorySprintHistory.__table__,
+}
+
+# En-tête CSV : union ordonnée des colonnes de toutes les sections
+CSV_COLUMNS: list[str] = ["type"]
+for _table in SECTION_TABLES.values():
+    CSV_COLUMNS.extend(c.name for c in _table.columns if c.name not in CSV_COLUMNS)
+
+# Par type : colonnes CSV présentes dans sa table (None = cellule vide)
+_CSV_LAYOUTS: dict[str, list[Optional[str]]] = {
+    kind: [c if c in table.columns else None for c in CSV_COLUMNS[1:]]
+    for kind, table in SECTION_TABLES.items()
+}
+
+
+def _sections(project_id: UUID) -> list[tuple[str, Select[Any]]]:
+    epic_ids = select(Epic.id).where(Epic.project_id == project_id)
+    story_ids = select(Story.id).where(Story.epic_id.in_(epic_ids))
+    tables = SECTION_TABLES
+    return [
+        ("project", select(tables["project"]).where(Project.id == project_id)),
+        ("epic", select(tables["epic"]).where(Epic.project_id == project_id)),
+        ("story", select(tables["story"]).where(Story.epic_id.in_(epic_ids))),
+        (
+            "comment",
+            select(tables["comment"]).where(
+                or_(Comment.story_id.in_(story_ids), Comment.epic_id.in_(epic_ids))
+            ),
+        ),
+        ("sprint", select(tables["sprint"]).where(Sprint.project_id == project_id)),
+        (
+            "sprint_history",
+            select(tables["sprint_history"])
+            .join(Sprint, StorySprintHistory.sprint_id == Sprint.id)
+            .where(Sprint.project_id == project_id),
+        ),
+    ]
+
+
+def iter_records(
+    session: Session,
+    project_id: UUID,
+    batch_size: Optional[int] = None,
+) -> Iterator[list[tuple[str, Mapping[str, Any]]]]:
+    """Lots de `(type, ligne)` lus par curseur côté serveur."""
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    for kind, query in _sections(project_id):
+        result = session.execute(query.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [(kind, row._mapping) for row in partition]
+
+
+def _ndjson_chunk(batch: list[tuple[str, Mapping[str, Any]]]) -> bytes:
+    return b"".join(to_json({"type": kind, **row}) + b"\n" for kind, row in batch)
+
+
+def _csv_chunk(batch: list[tuple[str, Mapping[str, Any]]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for kind, row in batch:
+        cells = [row[c] if c is not None else None for c in _CSV_LAYOUTS[kind]]
+        writer.writerow([kind, *("" if v is None else v for v in cells)])
+    return buffer.getvalue().encode("utf-8")
+
+
+def export_project(
+    session: Session,
+    project_id: UUID,
+    fmt: ExportFormat = "ndjson",
+    batch_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Flux d’octets de l’export, un morceau par lot de lignes.
+
+    L’existence du projet est à contrôler avant (le flux ne lève pas de 404).
+    """
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+    for batch in iter_records(session, project_id, batch_size):
+        yield _csv_chunk(batch) if fmt == "csv" else _ndjson_chunk(batch)
@@ -0,0 +1,375 @@
+"""Import en flux d’epics et de stories (NDJSON ou CSV).
+
+- lecture ligne à ligne, validation par les schémas existants
+  (EpicCreate / StoryCreate, via EpicImportRow / StoryImportRow)
+- écriture par lots, un lot = une transaction : `COPY` sur Postgres
+  (psycopg), INSERT executemany ailleurs ; la progression du job et le
+  journal des lignes rejetées sont validés dans la même transaction
+- reprise (`resume`) : les lignes des lots déjà validés sont sautées
+
+Même format que l’export (`type` = epic / story ; les autres types exportés
+sont ignorés). En ligne de commande :
+
+    python -m app.services.imports backlog.ndjson --project <uuid> [--resume <job>]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import Table, insert
+from sqlmodel import Session, select
+
+from app.models.counters import CounterDeltas
+from app.models.db import Database, database, init_db
+from app.models.entities import Epic, ImportJob, ImportRowError, Project, Story
+from app.models.schemas import (
+    EpicImportRow,
+    ImportFormat,
+    ImportJobRead,
+    ImportRowErrorRead,
+    StoryImportRow,
+)
+from app.services.common import (
+    ensure_exists,
+    get_or_404,
+    save,
+    touch_project,
+    validation_errors,
+)
+from app.services.export import SECTION_TABLES
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Enregistrements de l’export qui ne sont pas importés (comptés dans `skipped`)
+SKIPPED_TYPES = set(SECTION_TABLES) - {"epic", "story"}
+
+_CSV_INT_FIELDS = {"story_points"}
+
+# (numéro de ligne, enregistrement décodé ou message d’erreur de lecture)
+Record = tuple[int, Any]
+
+
+# --- Lecture ---
+
+def read_ndjson(stream: IO[str]) -> Iterator[Record]:
+    for row, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row, f"Invalid JSON: {exc.msg}"
+
+
+def _csv_cell(column: str, value: str) -> Any:
+    if column in _CSV_INT_FIELDS and value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def read_csv(stream: IO[str]) -> Iterator[Record]:
+    """Lignes CSV avec en-tête ; cellule vide = champ absent (numéros à partir de 1)."""
+    for row, record in enumerate(csv.DictReader(stream), start=1):
+        yield row, {
+            column: _csv_cell(column, value)
+            for column, value in record.items()
+            if column is not None and value not in (None, "")
+        }
+
+
+def read_records(stream: IO[str], fmt: ImportFormat) -> Iterator[Record]:
+    return read_csv(stream) if fmt == "csv" else read_ndjson(stream)
+
+
+# --- Écriture d’un lot ---
+
+def _insert_rows(session: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    """COPY ... FROM STDIN sur Postgres (psycopg), INSERT executemany sinon."""
+    if not rows:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg":
+        preparer = connection.dialect.identifier_preparer
+        columns = list(rows[0])
+        sql = (
+            f"COPY {preparer.format_table(table)} "
+            f"({', '.join(preparer.quote(c) for c in columns)}) FROM STDIN"
+        )
+        with connection.connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row([row[c] for c in columns])
+        return
+    session.execute(insert(table), rows)
+
+
+def _existing_ids(session: Session, model: Any, ids: Iterable[UUID]) -> set[UUID]:
+    ids = list(ids)
+    if not ids:
+        return set()
+    return set(session.exec(select(model.id).where(model.id.in_(ids))).all())
+
+
+def import_chunk(session: Session, job_id: UUID, records: list[Record]) -> ImportJob:
+    """Valider et écrire un lot, avec la progression du job, en une transaction."""
+    job = get_or_404(session, ImportJob, job_id)
+    project_id = job.project_id
+
+    errors: list[tuple[int, Any]] = []
+    epics: list[tuple[int, EpicImportRow]] = []
+    stories: list[tuple[int, StoryImportRow]] = []
+    for row, record in records:
+        if isinstance(record, str):
+            errors.append((row, record))
+            continue
+        kind = record.get("type") if isinstance(record, dict) else None
+        if kind in SKIPPED_TYPES:
+            job.skipped += 1
+            continue
+        schema = {"epic": EpicImportRow, "story": StoryImportRow}.get(kind)
+        if schema is None:
+            errors.append((row, f"Unknown record type: {kind!r}"))
+            continue
+        try:
+            payload = schema.model_validate(record)
+        except ValidationError as exc:
+            errors.append((row, validation_errors(exc)))
+            continue
+        (epics if kind == "epic" else stories).append((row, payload))
+
+    # ids fournis : déjà en base ou en double dans le lot -> rejet de la ligne
+    taken = _existing_ids(session, Epic, (e.id for _, e in epics if e.id)) | _existing_ids(
+        session, Story, (s.id for _, s in stories if s.id)
+    )
+
+    epic_rows: list[dict[str, Any]] = []
+    for row, epic in epics:
+        epic_id = epic.id or uuid4()
+        if epic_id in taken:
+            errors.append((row, "Epic already exists"))
+            continue
+        taken.add(epic_id)
+        epic_rows.append(
+            {
+                "id": epic_id,
+                "project_id": project_id,
+                "title": epic.title,
+                "status": epic.status,
+                "version": 1,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+
+    referenced = {s.epic_id for _, s in stories}
+    project_epics = {r["id"] for r in epic_rows} | set(
+        session.exec(
+            select(Epic.id).where(Epic.project_id == project_id, Epic.id.in_(referenced))
+        ).all()
+    )
+    story_rows: list[dict[str, Any]] = []
+    counters = CounterDeltas()
+    for row, story in stories:
+        story_id = story.id or uuid4()
+        if story.epic_id not in project_epics:
+            errors.append((row, "Epic not found in project"))
+            continue
+        if story_id in taken:
+            errors.append((row, "Story already exists"))
+            continue
+        taken.add(story_id)
+        story_row = {
+            "id": story_id,
+            "epic_id": story.epic_id,
+            "title": story.title,
+            "description": story.description,
+            "story_points": story.story_points,
+            "priority": story.priority,
+            "status": story.status,
+            "assigned_to": story.assigned_to,
+            "version": 1,
+            "created_at": datetime.now(timezone.utc),
+        }
+        story_rows.append(story_row)
+        counters.add(project_id, story_row)
+
+    _insert_rows(session, Epic.__table__, epic_rows)
+    _insert_rows(session, Story.__table__, story_rows)
+    if errors:
+        session.execute(
+            insert(ImportRowError),
+            [
+                {"job_id": job_id, "row": row, "detail": json.dumps(error)}
+                for row, error in errors
+            ],
+        )
+    if epic_rows or story_rows:
+        counters.apply(session)
+        touch_project(session, project_id)
+
+    job.rows_read = records[-1][0]
+    job.epics_created += len(epic_rows)
+    job.stories_created += len(story_rows)
+    job.failed += len(errors)
+    job.updated_at = datetime.now(timezone.utc)
+    return save(session, job)
+
+
+# --- Jobs ---
+
+def open_import(
+    session: Session,
+    project_id: UUID,
+    fmt: ImportFormat,
+    resume: Optional[UUID] = None,
+) -> ImportJob:
+    """Créer un job d’import, ou rouvrir `resume` (même projet, même format)."""
+    ensure_exists(session, Project, project_id)
+    if resume is None:
+        return save(session, ImportJob(project_id=project_id, format=fmt))
+
+    job = get_or_404(session, ImportJob, resume)
+    if job.project_id != project_id or job.format != fmt:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import job belongs to another project or format",
+        )
+    if job.status == "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job already completed",
+        )
+    job.status = "running"
+    job.message = None
+    return save(session, job)
+
+
+def finish_import(session: Session, job_id: UUID, message: Optional[str] = None) -> ImportJob:
+    """Clore le job : completed, ou failed avec la cause (reprise possible)."""
+    job = get_or_404(session, ImportJob, job_id)
+    job.status = "failed" if message else "completed"
+    job.message = message
+    job.updated_at = datetime.now(timezone.utc)
+    return save(session, job)
+
+
+def get_import_job(session: Session, job_id: UUID) -> ImportJob:
+    return get_or_404(session, ImportJob, job_id)
+
+
+def list_import_errors(
+    session: Session,
+    job_id: UUID,
+    offset: int = 0,
+    limit: int = 100,
+) -> list[ImportRowErrorRead]:
+    get_or_404(session, ImportJob, job_id)
+    rows = session.exec(
+        select(ImportRowError)
+        .where(ImportRowError.job_id == job_id)
+        .order_by(ImportRowError.row)
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    return [ImportRowErrorRead(row=r.row, error=json.loads(r.detail)) for r in rows]
+
+
+def run_import(
+    db: Database,
+    job_id: UUID,
+    records: Iterable[Record],
+    chunk_size: Optional[int] = None,
+    on_progress: Optional[Callable[[ImportJob], None]] = None,
+) -> ImportJob:
+    """Importer `records` lot par lot (une transaction par lot).
+
+    Les lignes déjà traitées par le job (reprise) sont sautées. Si un lot
+    échoue, il est annulé et le job passe en `failed` : relancer avec
+    `resume` repart du dernier lot validé.
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    job = db.run_blocking(get_import_job, job_id)
+    done = job.rows_read
+    chunk: list[Record] = []
+    try:
+        for record in records:
+            if record[0] <= done:
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                job = db.run_blocking(import_chunk, job_id, chunk)
+                chunk = []
+                if on_progress is not None:
+                    on_progress(job)
+        if chunk:
+            job = db.run_blocking(import_chunk, job_id, chunk)
+            if on_progress is not None:
+                on_progress(job)
+    except Exception as exc:  # lot annulé : job repris plus tard
+        return db.run_blocking(finish_import, job_id, f"{type(exc).__name__}: {exc}")
+    return db.run_blocking(finish_import, job_id)
+
+
+def import_stream(
+    db: Database,
+    job_id: UUID,
+    stream: IO[bytes],
+    fmt: ImportFormat,
+    chunk_size: Optional[int] = None,
+    on_progress: Optional[Callable[[ImportJob], None]] = None,
+) -> ImportJob:
+    """Importer un flux d’octets UTF-8 (fichier, corps de requête en tampon), puis le fermer."""
+    with io.TextIOWrapper(stream, encoding="utf-8-sig", newline="") as text_stream:
+        return run_import(db, job_id, read_records(text_stream, fmt), chunk_size, on_progress)
+
+
+# --- Ligne de commande ---
+
+def _print_progress(job: ImportJob) -> None:
+    print(
+        f"rows {job.rows_read} | epics {job.epics_created} | "
+        f"stories {job.stories_created} | failed {job.failed}",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importer des epics / stories (NDJSON ou CSV)")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--project", type=UUID, required=True)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--resume", type=UUID, default=None, help="id du job à reprendre")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--errors", type=Path, default=None, help="journal des rejets (NDJSON)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    init_db(database.bind)
+    job = database.run_blocking(open_import, args.project, fmt, args.resume)
+    print(f"import job {job.id}", file=sys.stderr)
+    job = import_stream(
+        database, job.id, args.path.open("rb"), fmt, args.chunk_size, _print_progress
+    )
+
+    if args.errors is not None:
+        with args.errors.open("w", encoding="utf-8") as log:
+            offset = 0
+            while page := database.run_blocking(list_import_errors, job.id, offset, 1000):
+                log.writelines(error.model_dump_json() + "\n" for error in page)
+                offset += len(page)
+
+    print(ImportJobRead.model_validate(job, from_attributes=True).model_dump_json())
+    return 0 if job.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, tuple_
+from sqlmodel import Session
+from sqlmodel.sql.expression import SelectOfScalar
+
+CURSOR_PREFIX = "k2:"
+
+# Les listes renvoyées telles quelles (sans enveloppe) exposent le curseur ici
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page:
+    items: list[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, key: UUID) -> str:
+    """Curseur opaque : la clé de tri (created_at, id) du dernier élément de la page."""
+    raw = f"{CURSOR_PREFIX}{created_at.isoformat()}|{key.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Décoder un curseur, 400 s’il est invalide."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        if not raw.startswith(CURSOR_PREFIX):
+            raise ValueError(raw)
+        created_at, key = raw[len(CURSOR_PREFIX):].split("|")
+        return datetime.fromisoformat(created_at), UUID(hex=key)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def count_rows(session: Session, query: SelectOfScalar[Any]) -> int:
+    """COUNT(*) SQL sur les mêmes FROM/WHERE que `query` (sans ORDER BY ni LIMIT)."""
+    count_query = (
+        query.with_only_columns(func.count(), maintain_column_froms=True)
+        .order_by(None)
+        .limit(None)
+        .offset(None)
+    )
+    return session.execute(count_query).scalar_one()
+
+
+def paginate(
+    session: Session,
+    query: SelectOfScalar[Any],
+    entity: type,
+    *,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+) -> Page:
+    """Paginer en base, par offset (historique) ou par curseur (keyset).
+
+    - la requête est triée sur (created_at, id) de `entity` : ordre de
+      création, stable (l’id départage les égalités)
+    - mode curseur : `WHERE (created_at, id) > dernière clé`, coût constant
+      quelle que soit la profondeur de la page ; incompatible avec `offset`
+    - une ligne de plus est lue pour savoir s’il existe une page suivante
+    - le total n’est calculé (COUNT dédié) que si `with_total` est vrai
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor and offset cannot be combined",
+        )
+
+    page_query = query.order_by(None).order_by(entity.created_at, entity.id)
+    if cursor is not None:
+        page_query = page_query.where(
+            tuple_(entity.created_at, entity.id) > tuple_(*decode_cursor(cursor))
+        )
+    if offset:
+        page_query = page_query.offset(offset)
+    if limit is not None:
+        page_query = page_query.limit(limit + 1)
+
+    # `execute` : objets pour un select(Entité), lignes pour une liste de colonnes
+    result = session.execute(page_query)
+    single = len(page_query.column_descriptions) == 1
+    items = list(result.scalars().all() if single else result.all())
+    has_more = limit is not None and len(items) > limit
+    if has_more:
+        items = items[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    total: Optional[int] = None
+    if with_total:
+        if not has_more and cursor is None and (items or offset == 0):
+            # Dernière page en mode offset : le total se déduit sans COUNT
+            total = offset + len(items)
+        else:
+            total = count_rows(session, query)
+
+    return Page(items=items, total=total, next_cursor=next_cursor)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.models.entities import Project, ProjectCounter
+from app.models.schemas import CounterValue, ProjectCreate, ProjectRead, ProjectStats
+from app.services.common import ensure_exists, get_read_or_404, save
+
+
+def create_project(session: Session, payload: ProjectCreate) -> Project:
+    """Créer un projet.
+
+    Règles :
+    - name longueur >= 3 (géré par Pydantic)
+    - 409 si doublon de nom
+    """
+    existing = session.exec(
+        select(Project).where(Project.name == payload.name)
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Project name already exists",
+        )
+
+    return save(session, Project(name=payload.name))
+
+
+def list_projects(session: Session) -> Sequence[Project]:
+    return session.exec(select(Project)).all()
+
+
+def get_project(session: Session, project_id: UUID) -> ProjectRead:
+    return get_read_or_404(session, Project, project_id)
+
+
+def project_revision(session: Session, project_id: UUID) -> int:
+    """Compteur de changements du projet (ETag des listes), 404 si absent."""
+    revision = session.exec(
+        select(Project.revision).where(Project.id == project_id)
+    ).first()
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return revision
+
+
+def project_stats(session: Session, project_id: UUID) -> ProjectStats:
+    """Compteurs de stories par statut, priorité et assigné (table project_counter).
+
+    Lecture par clé primaire, quel que soit le nombre de stories du projet.
+    """
+    ensure_exists(session, Project, project_id)
+
+    rows = session.exec(
+        select(ProjectCounter).where(ProjectCounter.project_id == project_id)
+    ).all()
+
+    grouped: dict[str, dict[str, CounterValue]] = {
+        "total": {},
+        "status": {},
+        "priority": {},
+        "assignee": {},
+    }
+    for row in rows:
+        if row.story_count:
+            grouped[row.dimension][row.key] = CounterValue(
+                story_count=row.story_count, points=row.points
+            )
+
+    return ProjectStats(
+        project_id=project_id,
+        total=grouped["total"].get("", CounterValue(story_count=0, points=0)),
+        by_status=grouped["status"],
+        by_priority=grouped["priority"],
+        by_assignee=grouped["assignee"],
+    )
@@ -0,0 +1,175 @@
+"""Historique des documents : snapshot toutes les K versions, deltas entre deux.
+
+- version n, (n - 1) % K == 0 : snapshot (contenu complet)
+- sinon : delta par lignes depuis la version n - 1 (snapshot aussi si le
+  delta est plus gros que le contenu, ou si la version précédente manque,
+  ex. document antérieur à l’historique)
+
+Reconstruire la version n : le dernier snapshot <= n puis au plus K - 1
+deltas, lus en une requête. Mesure : `python -m benchmarks.revisions`.
+"""
+from __future__ import annotations
+
+import json
+from difflib import SequenceMatcher
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, literal
+from sqlmodel import Session, select
+
+from app.models.entities import Document, DocumentRevision
+from app.models.schemas import DocumentRevisionContent, DocumentRevisionRead
+from app.services.common import get_or_404
+
+SNAPSHOT_INTERVAL = 16  # K
+
+# Opérations d’un delta : ["=", n] garder n lignes, ["-", n] en sauter n,
+# ["+", [lignes]] insérer des lignes
+Delta = list[list[Any]]
+
+
+def make_delta(old: str, new: str) -> Delta:
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append(["=", i2 - i1])
+            continue
+        if i2 > i1:
+            delta.append(["-", i2 - i1])
+        if j2 > j1:
+            delta.append(["+", b[j1:j2]])
+    return delta
+
+
+def apply_delta(old: str, delta: Delta) -> str:
+    lines = old.splitlines(keepends=True)
+    out: list[str] = []
+    position = 0
+    for op, arg in delta:
+        if op == "=":
+            out.extend(lines[position:position + arg])
+            position += arg
+        elif op == "-":
+            position += arg
+        else:
+            out.extend(arg)
+    return "".join(out)
+
+
+def _revision(document_id: UUID, version: int, kind: str, data: str) -> DocumentRevision:
+    return DocumentRevision(
+        document_id=document_id,
+        version=version,
+        kind=kind,
+        data=data,
+        size=len(data.encode()),
+    )
+
+
+def record_revision(
+    session: Session,
+    doc: Document,
+    previous: Optional[str] = None,
+    snapshot_interval: Optional[int] = None,
+) -> DocumentRevision:
+    """Ajouter la version courante de `doc` à l’historique (avant le commit).
+
+    `previous` : contenu de la version doc.version - 1 (None à la création).
+    """
+    interval = snapshot_interval or SNAPSHOT_INTERVAL
+    if previous is not None and (doc.version - 1) % interval != 0:
+        has_previous = session.exec(
+            select(DocumentRevision.version).where(
+                DocumentRevision.document_id == doc.id,
+                DocumentRevision.version == doc.version - 1,
+            )
+        ).first()
+        if has_previous is not None:
+            delta = make_delta(previous, doc.content)
+            data = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+            if len(data) < len(doc.content):
+                revision = _revision(doc.id, doc.version, "delta", data)
+                session.add(revision)
+                return revision
+
+    revision = _revision(doc.id, doc.version, "snapshot", doc.content)
+    session.add(revision)
+    return revision
+
+
+def list_revisions(session: Session, doc_id: UUID) -> list[DocumentRevisionRead]:
+    get_or_404(session, Document, doc_id)
+    rows = session.exec(
+        select(
+            DocumentRevision.version,
+            DocumentRevision.kind,
+            DocumentRevision.size,
+            DocumentRevision.created_at,
+        )
+        .where(DocumentRevision.document_id == doc_id)
+        .order_by(DocumentRevision.version)
+    ).all()
+    return [
+        DocumentRevisionRead(version=version, kind=kind, size=size, created_at=created_at)
+        for version, kind, size, created_at in rows
+    ]
+
+
+def rebuild(revisions: Sequence[DocumentRevision]) -> str:
+    """Contenu de la dernière révision : snapshot en tête, puis deltas dans l’ordre."""
+    content = revisions[0].data
+    for revision in revisions[1:]:
+        if revision.kind == "snapshot":
+            content = revision.data
+        else:
+            content = apply_delta(content, json.loads(revision.data))
+    return content
+
+
+def ensure_revision(session: Session, doc_id: UUID, version: int) -> None:
+    """404 si la version est absente de l’historique (sans reconstruire le contenu)."""
+    found = session.exec(
+        select(literal(1)).where(
+            DocumentRevision.document_id == doc_id,
+            DocumentRevision.version == version,
+        )
+    ).first()
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found",
+        )
+
+
+def get_revision(session: Session, doc_id: UUID, version: int) -> DocumentRevisionContent:
+    """Contenu du document à la version `version` (404 si absente de l’historique)."""
+    last_snapshot = (
+        select(func.max(DocumentRevision.version))
+        .where(
+            DocumentRevision.document_id == doc_id,
+            DocumentRevision.kind == "snapshot",
+            DocumentRevision.version <= version,
+        )
+        .scalar_subquery()
+    )
+    revisions = session.exec(
+        select(DocumentRevision)
+        .where(
+            DocumentRevision.document_id == doc_id,
+            DocumentRevision.version >= last_snapshot,
+            DocumentRevision.version <= version,
+        )
+        .order_by(DocumentRevision.version)
+    ).all()
+    if not revisions or revisions[-1].version != version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found",
+        )
+    return DocumentRevisionContent(
+        document_id=doc_id, version=version, content=rebuild(revisions)
+    )
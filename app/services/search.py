@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, bindparam, func, literal, select, text, union_all
+from sqlmodel import Session
+
+from app.models.entities import Comment, Document, Epic, Project, Story
+from app.models.schemas import SearchEntityType, SearchHit, SearchResponse
+from app.models.search_index import (
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    SEARCHABLE,
+    fts5_query,
+    like_search,
+    pg_vector_sql,
+    search_terms,
+    tsquery,
+)
+from app.services.common import ensure_exists
+
+ALL_ENTITY_TYPES: tuple[SearchEntityType, ...] = ("story", "epic", "document", "comment")
+
+SNIPPET_WORDS = 16
+
+
+def search_in_project(
+    session: Session,
+    project_id: UUID,
+    term: str,
+    entity_types: Optional[list[SearchEntityType]] = None,
+    limit: int = 20,
+) -> SearchResponse:
+    """`search_project` précédé du contrôle 404 du projet (REST et MCP)."""
+    ensure_exists(session, Project, project_id)
+    return SearchResponse(hits=search_project(session, project_id, term, entity_types, limit))
+
+
+def search_project(
+    session: Session,
+    project_id: UUID,
+    term: str,
+    entity_types: Optional[list[SearchEntityType]] = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    """Recherche plein texte classée sur toutes les entités d’un projet.
+
+    Les résultats sont triés par pertinence (bm25 sur SQLite, ts_rank sur
+    Postgres) et accompagnés d’un extrait où les mots trouvés sont entourés
+    de <mark>…</mark>. Sur les autres dialectes : LIKE, sans classement
+    (score 0).
+    """
+    terms = search_terms(term)
+    if not terms:
+        return []
+    types = list(entity_types or ALL_ENTITY_TYPES)
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        rows = _search_sqlite(session, project_id, terms, types, limit)
+    elif dialect == "postgresql":
+        rows = _search_postgres(session, project_id, terms, types, limit)
+    else:
+        return _search_like(session, project_id, terms, types, limit)
+
+    return [
+        SearchHit(
+            entity_type=row.entity_type,
+            id=UUID(str(row.entity_id)),
+            title=row.title,
+            snippet=row.snippet,
+            score=float(row.score),
+        )
+        for row in rows
+    ]
+
+
+def _search_sqlite(
+    session: Session,
+    project_id: UUID,
+    terms: list[str],
+    types: list[SearchEntityType],
+    limit: int,
+) -> Sequence[Row]:
+    query = text(
+        "SELECT d.entity_type, d.entity_id, search_fts.title AS title, "
+        f"snippet(search_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', {SNIPPET_WORDS}) AS snippet, "
+        "-bm25(search_fts, 2.0, 1.0) AS score "
+        "FROM search_fts JOIN search_doc AS d ON d.doc_id = search_fts.rowid "
+        "WHERE search_fts MATCH :match "
+        "AND d.project_id = :project_id AND d.entity_type IN :types "
+        "ORDER BY score DESC LIMIT :limit"
+    ).bindparams(bindparam("types", expanding=True))
+    return session.exec(
+        query,
+        params={
+            "match": fts5_query(terms),
+            # Les UUID sont stockés en hexadécimal (CHAR(32)) sur SQLite
+            "project_id": project_id.hex,
+            "types": types,
+            "limit": limit,
+        },
+    ).all()
+
+
+# type -> (FROM/JOIN, colonne projet, expression titre, colonne de l'extrait)
+_PG_SOURCES = {
+    "story": (
+        "story AS t JOIN epic AS e ON e.id = t.epic_id",
+        "e.project_id",
+        "t.title",
+        "t.description",
+    ),
+    "epic": ("epic AS t", "t.project_id", "t.title", "t.title"),
+    "document": ("document AS t", "t.project_id", "t.type", "t.content"),
+    "comment": (
+        "comment AS t "
+        "LEFT JOIN story AS s ON s.id = t.story_id "
+        "LEFT JOIN epic AS e ON e.id = coalesce(t.epic_id, s.epic_id)",
+        "e.project_id",
+        "''",
+        "t.text",
+    ),
+}
+
+
+def _search_postgres(
+    session: Session,
+    project_id: UUID,
+    terms: list[str],
+    types: list[SearchEntityType],
+    limit: int,
+) -> Sequence[Row]:
+    options = (
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+        f"MaxWords={SNIPPET_WORDS}, MinWords=5, MaxFragments=1"
+    )
+    ts_query = "to_tsquery('simple', :tsquery)"
+    branches = []
+    for entity_type in types:
+        source, project_col, title, body = _PG_SOURCES[entity_type]
+        _, columns = SEARCHABLE[entity_type]
+        # Même expression que l'index GIN pour qu'il soit utilisé
+        vector = pg_vector_sql(columns, alias="t")
+        branches.append(
+            f"SELECT '{entity_type}' AS entity_type, t.id AS entity_id, {title} AS title, "
+            f"{body} AS body, ts_rank({vector}, {ts_query}) AS score "
+            f"FROM {source} "
+            f"WHERE {project_col} = :project_id AND {vector} @@ {ts_query}"
+        )
+    # Classement et LIMIT d'abord : ts_headline (coûteux, relit le texte)
+    # seulement pour les lignes gardées, pas pour toutes celles qui correspondent
+    statement = text(
+        "SELECT ranked.entity_type, ranked.entity_id, ranked.title, "
+        f"ts_headline('simple', coalesce(ranked.body, ''), {ts_query}, :options) AS snippet, "
+        "ranked.score "
+        f"FROM ({' UNION ALL '.join(branches)} ORDER BY score DESC LIMIT :limit) AS ranked "
+        "ORDER BY ranked.score DESC"
+    )
+    return session.exec(
+        statement,
+        params={
+            "tsquery": tsquery(terms),
+            "options": options,
+            "project_id": project_id,
+            "limit": limit,
+        },
+    ).all()
+
+
+def _search_like(
+    session: Session,
+    project_id: UUID,
+    terms: list[str],
+    types: list[SearchEntityType],
+    limit: int,
+) -> list[SearchHit]:
+    """Repli sans index plein texte : LIKE par type, extrait surligné en Python."""
+    story_epic = Epic.id == Story.epic_id
+    comment_epic = Epic.id == func.coalesce(Comment.epic_id, Story.epic_id)
+    # type -> (colonnes titre/extrait, jointures, colonne projet)
+    sources = {
+        "story": (Story.title, Story.description, [(Epic, story_epic, False)]),
+        "epic": (Epic.title, Epic.title, []),
+        "document": (Document.type, Document.content, []),
+        "comment": (
+            literal(""),
+            Comment.text,
+            [(Story, Story.id == Comment.story_id, True), (Epic, comment_epic, False)],
+        ),
+    }
+    branches = []
+    for entity_type in types:
+        model, _ = SEARCHABLE[entity_type]
+        title, body, joins = sources[entity_type]
+        branch = select(
+            literal(entity_type).label("entity_type"),
+            model.id.label("entity_id"),
+            title.label("title"),
+            body.label("body"),
+        ).select_from(model)
+        for target, onclause, outer in joins:
+            branch = branch.join(target, onclause, isouter=outer)
+        project_col = model.project_id if model in (Epic, Document) else Epic.project_id
+        branches.append(
+            branch.where(project_col == project_id, like_search(entity_type, terms))
+        )
+    rows = session.execute(union_all(*branches).limit(limit)).all()
+    return [
+        SearchHit(
+            entity_type=row.entity_type,
+            id=UUID(str(row.entity_id)),
+            title=row.title,
+            snippet=_highlight(row.body or "", terms),
+            score=0.0,
+        )
+        for row in rows
+    ]
+
+
+def _highlight(body: str, terms: list[str]) -> str:
+    """Extrait de SNIPPET_WORDS mots autour du premier mot trouvé, mots trouvés surlignés."""
+    words = body.split()
+    lowered = [t.lower() for t in terms]
+
+    def found(word: str) -> bool:
+        return any(t in word.lower() for t in lowered)
+
+    first = next((i for i, word in enumerate(words) if found(word)), 0)
+    start = max(0, first - SNIPPET_WORDS // 2)
+    window = words[start:start + SNIPPET_WORDS]
+    snippet = " ".join(
+        f"{HIGHLIGHT_START}{word}{HIGHLIGHT_STOP}" if found(word) else word for word in window
+    )
+    prefix = "…" if start else ""
+    suffix = "…" if start + SNIPPET_WORDS < len(words) else ""
+    return f"{prefix}{snippet}{suffix}"
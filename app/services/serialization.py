@@ -0,0 +1,83 @@
+"""Chemin rapide des listes : colonnes utiles, une validation, JSON direct.
+
+- la requête ne sélectionne que les colonnes du modèle de lecture (pas
+  d’objets ORM ni d’identity map à remplir)
+- les lignes sont validées en un seul appel d’un TypeAdapter précompilé
+  (boucle côté Rust) au lieu d’un `model_validate` par ligne
+- les routes encodent le résultat en JSON avec le même adapter
+  (`app.api.responses.json_response`) : FastAPI ne revalide pas la réponse
+
+Mesure : `python -m benchmarks.serialization`.
+"""
+from __future__ import annotations
+
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row, func
+
+from app.models.entities import Comment, Document, Epic, Story
+from app.models.functions import utf8_bytes
+from app.models.schemas import (
+    CommentRead,
+    DocumentRead,
+    DocumentSummary,
+    EpicRead,
+    StoriesListResponse,
+    StoryRead,
+)
+
+ReadT = TypeVar("ReadT", bound=BaseModel)
+
+
+class ReadList(Generic[ReadT]):
+    """Colonnes et adapter `list[ReadModel]` d’une entité, compilés une fois."""
+
+    def __init__(
+        self,
+        entity: type,
+        read_model: type[ReadT],
+        computed: Optional[dict[str, Any]] = None,
+    ):
+        # `computed` : expressions SQL des champs qui ne sont pas des colonnes
+        computed = computed or {}
+        self.columns = [
+            computed[name].label(name) if name in computed else getattr(entity, name)
+            for name in read_model.model_fields
+        ]
+        if "created_at" not in read_model.model_fields:
+            # Clé de tri de `paginate` (curseur), ignorée à la validation
+            self.columns.append(entity.created_at)
+        self.adapter: TypeAdapter[list[ReadT]] = TypeAdapter(list[read_model])
+
+    def narrow(self, query: Any) -> Any:
+        """Restreindre un `select(Entité)` aux colonnes du modèle de lecture.
+
+        À exécuter avec `session.execute` (lignes), pas `session.exec` :
+        celui-ci ne garderait que la première colonne (`paginate` s’en charge).
+        """
+        return query.with_only_columns(*self.columns, maintain_column_froms=True)
+
+    def validate(self, rows: Sequence[Row[Any]]) -> list[ReadT]:
+        if not rows:
+            return []
+        keys = rows[0]._fields
+        return self.adapter.validate_python([dict(zip(keys, row)) for row in rows])
+
+
+STORY_READS = ReadList(Story, StoryRead)
+EPIC_READS = ReadList(Epic, EpicRead)
+DOCUMENT_READS = ReadList(Document, DocumentRead)
+COMMENT_READS = ReadList(Comment, CommentRead)
+
+DOCUMENT_EXCERPT_LENGTH = 200
+DOCUMENT_SUMMARIES = ReadList(
+    Document,
+    DocumentSummary,
+    computed={
+        "content_length": func.length(utf8_bytes(Document.content)),
+        "excerpt": func.substr(Document.content, 1, DOCUMENT_EXCERPT_LENGTH),
+    },
+)
+
+STORIES_LIST_RESPONSE: TypeAdapter[StoriesListResponse] = TypeAdapter(StoriesListResponse)
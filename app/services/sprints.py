@@ -1,15 +1,38 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import func, insert
 from sqlmodel import Session, select
 
-from app.models.entities import Sprint, Story, StorySprintHistory
-from app.models.schemas import Status
+from app.models.entities import Epic, Project, Sprint, Story, StorySprintHistory
+from app.models.schemas import (
+    SprintAssignResponse,
+    SprintBulkAssignResponse,
+    SprintBoardColumn,
+    SprintBoardResponse,
+    SprintCreate,
+    SprintRead,
+    Status,
+    StoryRead,
+)
+from app.services.analytics import snapshot_sprint_analytics
+from app.services.common import (
+    ensure_exists,
+    get_or_404,
+    get_read_or_404,
+    save,
+    touch_project,
+)
+from app.services.stories import WORKFLOW_ORDER
 
 OPEN_STATUSES: set[Status] = {"in_progress", "in_review"}
 
+# ARCHITECTURE.md : max 20 stories par sprint
+MAX_STORIES_PER_SPRINT = 20
+
 
 def ensure_no_open_stories_in_sprint(session: Session, sprint_id: UUID) -> None:
     """Vérifie qu’aucune story du sprint n’est encore en cours/review."""
@@ -48,4 +71,234 @@ def ensure_story_not_in_other_active_sprint(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Story already assigned to active sprint {existing_active.id}",
-        )
\ No newline at end of file
+        )
+
+def build_sprint_board(session: Session, sprint_id: UUID) -> SprintBoardResponse:
+    """Board d’un sprint : stories groupées par colonne du workflow + points.
+
+    Une seule requête (sprint LEFT JOIN historique LEFT JOIN story) : un
+    sprint vide renvoie une ligne avec story = None, un sprint inconnu aucune.
+    """
+    query = (
+        select(Sprint, Story)
+        .outerjoin(StorySprintHistory, StorySprintHistory.sprint_id == Sprint.id)
+        .outerjoin(Story, Story.id == StorySprintHistory.story_id)
+        .where(Sprint.id == sprint_id)
+        .order_by(Story.id)
+    )
+    rows = session.exec(query).all()
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sprint not found",
+        )
+
+    columns: dict[Status, list[StoryRead]] = {s: [] for s in WORKFLOW_ORDER}
+    for _, story in rows:
+        if story is not None:
+            columns[story.status].append(StoryRead.model_validate(story, from_attributes=True))
+
+    board_columns = [
+        SprintBoardColumn(
+            status=column_status,
+            stories=stories,
+            story_count=len(stories),
+            points=sum(s.story_points for s in stories),
+        )
+        for column_status, stories in columns.items()
+    ]
+    return SprintBoardResponse(
+        sprint=SprintRead.model_validate(rows[0][0], from_attributes=True),
+        columns=board_columns,
+        total_points=sum(c.points for c in board_columns),
+    )
+
+
+def create_sprint(session: Session, project_id: UUID, payload: SprintCreate) -> Sprint:
+    ensure_exists(session, Project, project_id)
+
+    sprint = Sprint(project_id=project_id, name=payload.name, status="planning")
+    return save(session, sprint)
+
+
+def start_sprint(session: Session, sprint_id: UUID) -> Sprint:
+    sprint = get_or_404(session, Sprint, sprint_id)
+    if sprint.status == "active":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sprint already active",
+        )
+    if sprint.status == "closed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot start a closed sprint",
+        )
+
+    sprint.status = "active"
+    sprint.started_at = datetime.now(timezone.utc)
+    return save(session, sprint)
+
+
+def close_sprint(session: Session, sprint_id: UUID) -> Sprint:
+    sprint = get_or_404(session, Sprint, sprint_id)
+
+    ensure_no_open_stories_in_sprint(session, sprint_id)
+
+    sprint.status = "closed"
+    sprint.closed_at = datetime.now(timezone.utc)
+    snapshot_sprint_analytics(session, sprint)
+    return save(session, sprint)
+
+
+def _lock_sprint(session: Session, sprint_id: UUID) -> Sprint:
+    """Charger le sprint en SELECT ... FOR UPDATE (Postgres) : les affectations
+    concurrentes au même sprint sont sérialisées jusqu’au commit."""
+    sprint = session.get(Sprint, sprint_id, with_for_update=True)
+    if sprint is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sprint not found",
+        )
+    return sprint
+
+
+def _ensure_sprint_capacity(session: Session, sprint_id: UUID) -> int:
+    """Vérifier la limite de stories après insertion, dans la même transaction.
+
+    Le comptage suit l’INSERT : sous SQLite la transaction détient alors le
+    verrou d’écriture, sous Postgres le sprint est verrouillé (`_lock_sprint`).
+    Au-delà de la limite, tout est annulé.
+    """
+    count = session.exec(
+        select(func.count()).where(StorySprintHistory.sprint_id == sprint_id)
+    ).one()
+    if count > MAX_STORIES_PER_SPRINT:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sprint capacity exceeded (max {MAX_STORIES_PER_SPRINT} stories)",
+        )
+    return count
+
+
+def assign_story_to_sprint(
+    session: Session,
+    sprint_id: UUID,
+    story_id: UUID,
+) -> SprintAssignResponse:
+    sprint = _lock_sprint(session, sprint_id)
+    story = get_read_or_404(session, Story, story_id)
+    if get_read_or_404(session, Epic, story.epic_id).project_id != sprint.project_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Story not found in sprint project",
+        )
+
+    ensure_story_not_in_other_active_sprint(session, story_id, sprint)
+
+    existing = session.get(
+        StorySprintHistory,
+        (story_id, sprint_id),
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Story already in this sprint",
+        )
+
+    link = StorySprintHistory(story_id=story_id, sprint_id=sprint_id)
+    session.add(link)
+    session.flush()
+    _ensure_sprint_capacity(session, sprint_id)
+    touch_project(session, sprint.project_id)
+    if sprint.status == "closed":
+        snapshot_sprint_analytics(session, sprint)
+    session.commit()
+
+    return SprintAssignResponse(story_id=story_id, sprint_id=sprint_id)
+
+
+def assign_stories_to_sprint(
+    session: Session,
+    sprint_id: UUID,
+    story_ids: list[UUID],
+) -> SprintBulkAssignResponse:
+    """Affecter plusieurs stories à un sprint, tout ou rien.
+
+    - une requête pour vérifier que les stories existent dans le projet du sprint
+    - une requête pour tous les conflits (autre sprint actif) et les
+      stories déjà présentes dans ce sprint (ignorées)
+    - un INSERT executemany, puis contrôle de la limite de stories
+    """
+    sprint = _lock_sprint(session, sprint_id)
+    requested = list(dict.fromkeys(story_ids))
+
+    found = set(
+        session.exec(
+            select(Story.id)
+            .join(Epic, Epic.id == Story.epic_id)
+            .where(Story.id.in_(requested), Epic.project_id == sprint.project_id)
+        ).all()
+    )
+    missing = [str(i) for i in requested if i not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": "Stories not found in sprint project", "story_ids": missing},
+        )
+
+    links = session.exec(
+        select(StorySprintHistory.story_id, Sprint.id, Sprint.status)
+        .join(Sprint, Sprint.id == StorySprintHistory.sprint_id)
+        .where(
+            StorySprintHistory.story_id.in_(requested),
+            (Sprint.status == "active") | (Sprint.id == sprint_id),
+        )
+    ).all()
+    already = {story_id for story_id, other_id, _ in links if other_id == sprint_id}
+    conflicts = [
+        {"story_id": str(story_id), "sprint_id": str(other_id)}
+        for story_id, other_id, _ in links
+        if other_id != sprint_id
+    ]
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Stories already assigned to another active sprint", "conflicts": conflicts},
+        )
+
+    assigned = [i for i in requested if i not in already]
+    if assigned:
+        session.execute(
+            insert(StorySprintHistory),
+            [{"story_id": story_id, "sprint_id": sprint_id} for story_id in assigned],
+        )
+    story_count = _ensure_sprint_capacity(session, sprint_id)
+    if assigned:
+        touch_project(session, sprint.project_id)
+        if sprint.status == "closed":
+            snapshot_sprint_analytics(session, sprint)
+    session.commit()
+
+    return SprintBulkAssignResponse(
+        sprint_id=sprint_id,
+        assigned=assigned,
+        already_assigned=[i for i in requested if i in already],
+        story_count=story_count,
+    )
+
+
+def remove_story_from_sprint(session: Session, sprint_id: UUID, story_id: UUID) -> None:
+    link = session.get(StorySprintHistory, (story_id, sprint_id))
+    if link is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Story not in sprint",
+        )
+
+    session.delete(link)
+    sprint = get_or_404(session, Sprint, sprint_id)
+    touch_project(session, sprint.project_id)
+    if sprint.status == "closed":
+        snapshot_sprint_analytics(session, sprint)
+    session.commit()
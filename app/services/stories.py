@@ -1,10 +1,48 @@
 from __future__ import annotations
 
-from typing import Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.models.schemas import Status
+from app.models.counters import CounterDeltas
+from app.models.entities import Epic, Project, Story, StorySprintHistory
+from app.models.schemas import (
+    Priority,
+    Status,
+    StoriesListResponse,
+    StoryBatchResponse,
+    StoryBatchResult,
+    StoryBatchUpdateItem,
+    StoryBulkTransition,
+    StoryBulkTransitionResponse,
+    StoryCreate,
+    StoryInclude,
+    StoryTransitionFilter,
+    StoryTransitionRejection,
+    StoryRead,
+    StoryUpdate,
+    StoryWithComments,
+)
+from app.models.search_index import text_search
+from app.services.cache import entity_cache
+from app.services.comments import story_comment_summaries
+from app.services.common import (
+    bump_version,
+    ensure_exists,
+    get_or_404,
+    get_read_or_404,
+    save,
+    touch_project,
+    validation_errors,
+)
+from app.services.pagination import paginate
+from app.services.serialization import STORY_READS
 
 # Ordre des statuts défini dans ARCHITECTURE.md
 WORKFLOW_ORDER: list[Status] = [
@@ -36,4 +74,397 @@ def validate_status_transition(current: Status, new: Status) -> None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid status transition from {current} to {new} (workflow step cannot be skipped)",
-        )
\ No newline at end of file
+        )
+
+
+def allowed_predecessors(target: Status) -> list[Status]:
+    """Statuts depuis lesquels `target` est atteignable (règle de `validate_status_transition`)."""
+    return [
+        s
+        for s in WORKFLOW_ORDER
+        if s != target and STATUS_INDEX[target] <= STATUS_INDEX[s] + 1
+    ]
+
+
+def build_stories_query(
+    project_id: UUID,
+    status_filter: Optional[Status] = None,
+    priority_filter: Optional[Priority] = None,
+    assigned_to: Optional[str] = None,
+    sprint_id: Optional[UUID] = None,
+    search: Optional[str] = None,
+) -> SelectOfScalar[Story]:
+    """Requête des stories d’un projet (jointure Epic -> Story) avec filtres.
+
+    Partagée entre la route REST et le tool MCP ; le tri (created_at, id)
+    est appliqué par `paginate`. Le filtre (Epic.project_id) et le tri
+    (Story.created_at) portent sur deux tables : chaque page trie les
+    stories du projet, le curseur ne fait qu’éviter l’OFFSET.
+    """
+    query = (
+        select(Story)
+        .join(Epic, Epic.id == Story.epic_id)
+        .where(Epic.project_id == project_id)
+    )
+
+    if status_filter is not None:
+        query = query.where(Story.status == status_filter)
+
+    if priority_filter is not None:
+        query = query.where(Story.priority == priority_filter)
+
+    if assigned_to is not None:
+        query = query.where(Story.assigned_to == assigned_to)
+
+    if sprint_id is not None:
+        # Jointure via l'historique (index idx_stories_sprint)
+        query = query.join(
+            StorySprintHistory, StorySprintHistory.story_id == Story.id
+        ).where(StorySprintHistory.sprint_id == sprint_id)
+
+    if search:
+        query = query.where(text_search(Story, search))
+
+    return query
+
+
+def create_story(session: Session, epic_id: UUID, payload: StoryCreate) -> Story:
+    """Créer une story dans un epic (status initial : backlog)."""
+    epic = get_read_or_404(session, Epic, epic_id)
+
+    story = Story(
+        epic_id=epic_id,
+        title=payload.title,
+        description=payload.description,
+        story_points=payload.story_points,
+        priority=payload.priority,
+        status="backlog",
+        assigned_to=None,
+    )
+    session.add(story)
+
+    counters = CounterDeltas()
+    counters.add(epic.project_id, story.model_dump())
+    counters.apply(session)
+    touch_project(session, epic.project_id)
+    return save(session, story)
+
+
+def get_story(session: Session, story_id: UUID) -> StoryRead:
+    return get_read_or_404(session, Story, story_id)
+
+
+def update_story(session: Session, story_id: UUID, payload: StoryUpdate) -> Story:
+    bump_version(session, Story, story_id)  # avant la lecture : état à jour
+    story = get_or_404(session, Story, story_id)
+    before = story.model_dump()
+
+    # Gestion du workflow (pas de saut d’étapes)
+    if payload.status is not None:
+        validate_status_transition(story.status, payload.status)
+        story.status = payload.status
+
+    if payload.title is not None:
+        story.title = payload.title
+    if payload.description is not None:
+        story.description = payload.description
+    if payload.story_points is not None:
+        story.story_points = payload.story_points
+    if payload.priority is not None:
+        story.priority = payload.priority
+    if payload.assigned_to is not None:
+        story.assigned_to = payload.assigned_to
+
+    project_id = get_read_or_404(session, Epic, story.epic_id).project_id
+    counters = CounterDeltas()
+    counters.change(project_id, before, story.model_dump())
+    counters.apply(session)  # variations nulles ignorées
+
+    touch_project(session, project_id)
+    save(session, story)
+    entity_cache.invalidate(Story, story_id)
+    return story
+
+
+def list_stories(
+    session: Session,
+    project_id: UUID,
+    status_filter: Optional[Status] = None,
+    priority_filter: Optional[Priority] = None,
+    assigned_to: Optional[str] = None,
+    sprint_id: Optional[UUID] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    include: Sequence[StoryInclude] = (),
+) -> StoriesListResponse:
+    """Page de stories d’un projet (REST et MCP), 404 si le projet n’existe pas.
+
+    `include` : comment_count / last_comment, remplis par une requête groupée
+    sur les stories de la page (pas d’appel par story).
+    """
+    ensure_exists(session, Project, project_id)
+
+    query = build_stories_query(
+        project_id,
+        status_filter=status_filter,
+        priority_filter=priority_filter,
+        assigned_to=assigned_to,
+        sprint_id=sprint_id,
+        search=search,
+    )
+    # Colonnes de StoryRead seulement, validées en un appel
+    page = paginate(
+        session,
+        STORY_READS.narrow(query),
+        Story,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        with_total=include_total,
+    )
+
+    stories: list[Any] = STORY_READS.validate(page.items)
+    if include:
+        stories = _with_comments(session, stories, include)
+    return StoriesListResponse(
+        stories=stories,
+        total=page.total,
+        next_cursor=page.next_cursor,
+    )
+
+
+def _with_comments(
+    session: Session, stories: list[StoryRead], include: Sequence[StoryInclude]
+) -> list[StoryWithComments]:
+    with_count = "comment_count" in include
+    with_last = "last_comment" in include
+    summaries = story_comment_summaries(session, [s.id for s in stories], with_last)
+    result = []
+    for story in stories:
+        summary = summaries.get(story.id)
+        result.append(
+            StoryWithComments.model_construct(
+                **dict(story),
+                comment_count=(summary.count if summary else 0) if with_count else None,
+                last_comment=summary.last if summary and with_last else None,
+            )
+        )
+    return result
+
+
+def _batch_response(results: list[StoryBatchResult]) -> StoryBatchResponse:
+    results.sort(key=lambda r: r.index)
+    failed = sum(1 for r in results if r.error is not None)
+    return StoryBatchResponse(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+def create_stories_batch(
+    session: Session,
+    epic_id: UUID,
+    items: list[dict[str, Any]],
+) -> StoryBatchResponse:
+    """Créer des stories en lot : un seul INSERT (executemany), une transaction.
+
+    Chaque élément est validé avec StoryCreate (epic_id pris dans l’URL) ;
+    les éléments invalides sont rapportés sans bloquer les autres.
+    """
+    epic = get_read_or_404(session, Epic, epic_id)
+
+    results: list[StoryBatchResult] = []
+    rows: list[dict[str, Any]] = []
+    counters = CounterDeltas()
+    for index, item in enumerate(items):
+        try:
+            payload = StoryCreate.model_validate({**item, "epic_id": epic_id})
+        except ValidationError as exc:
+            results.append(StoryBatchResult(index=index, error=validation_errors(exc)))
+            continue
+
+        row = {
+            "id": uuid4(),
+            "epic_id": epic_id,
+            "title": payload.title,
+            "description": payload.description,
+            "story_points": payload.story_points,
+            "priority": payload.priority,
+            "status": "backlog",
+            "assigned_to": None,
+            "version": 1,
+            "created_at": datetime.now(timezone.utc),  # ordre du lot conservé
+        }
+        rows.append(row)
+        counters.add(epic.project_id, row)
+        results.append(StoryBatchResult(index=index, story=StoryRead.model_validate(row)))
+
+    if rows:
+        session.execute(insert(Story), rows)
+        counters.apply(session)
+        touch_project(session, epic.project_id)
+        session.commit()
+
+    return _batch_response(results)
+
+
+def update_stories_batch(
+    session: Session,
+    items: list[dict[str, Any]],
+) -> StoryBatchResponse:
+    """Mettre à jour des stories en lot : une lecture, un UPDATE (executemany).
+
+    Mêmes règles que `update_story` (workflow sans saut d’étape) ; une story
+    ne peut apparaître qu’une fois par lot.
+    """
+    results: list[StoryBatchResult] = []
+    payloads: list[tuple[int, StoryBatchUpdateItem]] = []
+    for index, item in enumerate(items):
+        try:
+            payloads.append((index, StoryBatchUpdateItem.model_validate(item)))
+        except ValidationError as exc:
+            results.append(StoryBatchResult(index=index, error=validation_errors(exc)))
+
+    ids = {payload.id for _, payload in payloads}
+    current: dict[UUID, dict[str, Any]] = {}
+    if ids:
+        rows = session.execute(
+            select(*Story.__table__.columns, Epic.project_id)
+            .join(Epic, Epic.id == Story.epic_id)
+            .where(Story.id.in_(ids))
+        )
+        current = {row["id"]: dict(row) for row in rows.mappings()}
+
+    updates: list[dict[str, Any]] = []
+    seen: set[UUID] = set()
+    counters = CounterDeltas()
+    for index, payload in payloads:
+        story = current.get(payload.id)
+        if story is None:
+            results.append(StoryBatchResult(index=index, error="Story not found"))
+            continue
+        if payload.id in seen:
+            results.append(StoryBatchResult(index=index, error="Duplicate story id in batch"))
+            continue
+
+        changes = payload.model_dump(exclude={"id"}, exclude_none=True)
+        if "status" in changes:
+            try:
+                validate_status_transition(story["status"], changes["status"])
+            except HTTPException as exc:
+                results.append(StoryBatchResult(index=index, error=exc.detail))
+                continue
+
+        seen.add(payload.id)
+        before = dict(story)
+        story.update(changes)
+        if changes:
+            updates.append({"id": payload.id, **changes})
+            counters.change(story["project_id"], before, story)
+            story["version"] += 1
+        results.append(StoryBatchResult(index=index, story=StoryRead.model_validate(story)))
+
+    if updates:
+        # UPDATE ORM par clé primaire : regroupé en executemany par jeu de colonnes
+        session.execute(update(Story), updates)
+        updated_ids = [u["id"] for u in updates]
+        session.execute(
+            update(Story)
+            .where(Story.id.in_(updated_ids))
+            .values(version=Story.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        counters.apply(session)
+        touch_project(session, *(current[i]["project_id"] for i in updated_ids))
+        session.commit()
+        entity_cache.invalidate(Story, *updated_ids)
+
+    return _batch_response(results)
+
+
+def transition_stories(
+    session: Session,
+    project_id: UUID,
+    payload: StoryBulkTransition,
+) -> StoryBulkTransitionResponse:
+    """Transition en masse, règle du workflow appliquée en base.
+
+    Une lecture des stories visées (rapport et compteurs du projet) puis un
+    seul `UPDATE ... WHERE status IN (prédécesseurs autorisés) RETURNING id` :
+    le nombre de requêtes ne dépend pas du nombre de stories.
+    """
+    ensure_exists(session, Project, project_id)
+
+    criteria = payload.filter or StoryTransitionFilter()
+    if payload.story_ids is None and not criteria.model_dump(exclude_none=True):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="story_ids or filter is required",
+        )
+
+    target = payload.target_status
+    allowed = allowed_predecessors(target)
+
+    query = build_stories_query(
+        project_id,
+        status_filter=criteria.status,
+        priority_filter=criteria.priority,
+        assigned_to=criteria.assigned_to,
+        sprint_id=criteria.sprint_id,
+        search=criteria.search,
+    )
+    if payload.story_ids is not None:
+        query = query.where(Story.id.in_(payload.story_ids))
+
+    stories = session.execute(
+        query.with_only_columns(
+            Story.id, Story.status, Story.story_points, Story.priority, Story.assigned_to
+        )
+    ).mappings().all()
+    blocked = [(row["id"], row["status"]) for row in stories if row["status"] not in allowed]
+    returned: set[UUID] = set()
+    if len(blocked) < len(stories):
+        candidates = query.with_only_columns(Story.id).correlate(None)
+        returned = set(
+            session.execute(
+                update(Story)
+                .where(Story.id.in_(candidates), Story.status.in_(allowed))
+                .values(status=target, version=Story.version + 1)
+                .returning(Story.id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+    # Deltas calculés sur la lecture préalable, pour les seules lignes modifiées
+    moved: list[UUID] = []
+    counters = CounterDeltas()
+    for row in stories:
+        if row["id"] in returned:
+            moved.append(row["id"])
+            counters.change(project_id, row, {**row, "status": target})
+    counters.apply(session)
+    if moved:
+        touch_project(session, project_id)
+    session.commit()
+    entity_cache.invalidate(Story, *moved)
+
+    unchanged = [story_id for story_id, current in blocked if current == target]
+    rejected = [
+        StoryTransitionRejection(
+            id=story_id,
+            status=current,
+            reason=f"Invalid status transition from {current} to {target} (workflow step cannot be skipped)",
+        )
+        for story_id, current in blocked
+        if current != target
+    ]
+
+    found = set(moved).union(story_id for story_id, _ in blocked)
+    not_found = [i for i in dict.fromkeys(payload.story_ids or []) if i not in found]
+
+    return StoryBulkTransitionResponse(
+        target_status=target,
+        moved=moved,
+        unchanged=unchanged,
+        rejected=rejected,
+        not_found=not_found,
+    )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DatabaseSettings(BaseSettings):
+    """Configuration de la base, lue depuis l’environnement (préfixe DB_).
+
+    `DATABASE_URL` reste accepté tel quel (Cloud Build / Cloud Run).
+    Les valeurs par défaut du pool visent Cloud Run (concurrency=80) :
+    10 connexions permanentes + 20 en débordement par instance.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="DB_", extra="ignore", populate_by_name=True)
+
+    url: str = Field(
+        default="sqlite:///./dev.db",
+        validation_alias=AliasChoices("DATABASE_URL", "DB_URL"),
+    )
+    echo: bool = False
+
+    # Pile async (aiosqlite / psycopg async) pour les routes ; false = sessions
+    # synchrones dans le pool de threads (comparaison A/B en benchmark)
+    async_mode: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("DB_ASYNC", "DB_ASYNC_MODE"),
+    )
+    async_url: Optional[str] = None  # déduite de `url` si absente
+
+    # Appels d'outils MCP exécutés en parallèle (au-delà : file d'attente)
+    mcp_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        validation_alias=AliasChoices("MCP_MAX_CONCURRENCY", "DB_MCP_MAX_CONCURRENCY"),
+    )
+
+    # Pool de connexions (ignoré pour SQLite en mémoire)
+    pool_size: int = Field(default=10, ge=1)
+    max_overflow: int = Field(default=20, ge=0)
+    pool_timeout: float = Field(default=10.0, gt=0)  # secondes d'attente max d'une connexion
+    pool_recycle: int = 1800  # secondes, -1 pour désactiver
+    pool_pre_ping: bool = True
+
+    # PRAGMA appliqués à chaque connexion SQLite
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_cache_size: int = -64000  # négatif = en Kio (~64 Mo)
+    sqlite_mmap_size: int = 268435456  # 256 Mo
+    sqlite_busy_timeout: int = 5000  # ms
+
+
+def get_database_settings() -> DatabaseSettings:
+    return DatabaseSettings()
+
+
+class CacheSettings(BaseSettings):
+    """Cache d’entités en mémoire (préfixe CACHE_), par process."""
+
+    model_config = SettingsConfigDict(env_prefix="CACHE_", extra="ignore")
+
+    enabled: bool = True
+    max_entries: int = Field(default=10_000, ge=1)
+    ttl: float = Field(default=30.0, gt=0)  # secondes
+
+
+def get_cache_settings() -> CacheSettings:
+    return CacheSettings()
+
+
+class MetricsSettings(BaseSettings):
+    """Métriques par requête (préfixe METRICS_)."""
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_", extra="ignore")
+
+    # Au-delà de ce nombre de requêtes SQL, la requête HTTP est journalisée
+    # (WARNING, logger app.metrics) ; None = pas de journalisation
+    query_budget: Optional[int] = Field(default=None, ge=0)
+
+
+def get_metrics_settings() -> MetricsSettings:
+    return MetricsSettings()
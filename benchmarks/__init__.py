@@ -0,0 +1 @@
+"""Benchmarks reproductibles (python -m benchmarks.<module>)."""
@@ -0,0 +1,87 @@
+"""Débit de l’export en flux (NDJSON / CSV) et pic mémoire Python.
+
+    python -m benchmarks.export --count 20000
+
+Le pic mémoire (tracemalloc) doit rester stable quand `--count` augmente.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.models.db import Database, create_db_engine, init_db
+from app.models.schemas import EpicCreate, ProjectCreate
+from app.services import epics as epics_service
+from app.services import export as export_service
+from app.services import projects as projects_service
+from app.services import stories as stories_service
+from app.settings import DatabaseSettings
+
+
+def _story(i: int) -> dict:
+    return {
+        "title": f"Story {i}",
+        "description": "Description générée pour le benchmark",
+        "story_points": 3,
+        "priority": "medium",
+    }
+
+
+def _consume(db: Database, project_id, fmt: str) -> int:
+    return sum(len(chunk) for chunk in db.iterate(export_service.export_project, project_id, fmt))
+
+
+def _measure(db: Database, project_id, fmt: str) -> dict[str, float]:
+    start = time.perf_counter()
+    size = _consume(db, project_id, fmt)
+    elapsed = time.perf_counter() - start
+
+    # second passage pour le pic mémoire (tracemalloc fausse le chrono)
+    tracemalloc.start()
+    _consume(db, project_id, fmt)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        f"{fmt}_s": round(elapsed, 4),
+        f"{fmt}_mb_per_s": round(size / 1e6 / elapsed, 2),
+        f"{fmt}_peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(count: int, db_path: Path) -> dict[str, float]:
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    init_db(engine)
+    db = Database(engine)
+
+    project = db.run_blocking(projects_service.create_project, ProjectCreate(name="Bench"))
+    epic = db.run_blocking(
+        epics_service.create_epic,
+        project.id,
+        EpicCreate(project_id=project.id, title="Bench epic"),
+    )
+    for offset in range(0, count, 1000):
+        items = [_story(i) for i in range(offset, min(offset + 1000, count))]
+        db.run_blocking(stories_service.create_stories_batch, epic.id, items)
+
+    result: dict[str, float] = {"count": count}
+    for fmt in ("ndjson", "csv"):
+        result.update(_measure(db, project.id, fmt))
+
+    engine.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(run(args.count, Path(tmp) / "bench.db")))
+
+
+if __name__ == "__main__":
+    main()
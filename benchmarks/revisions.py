@@ -0,0 +1,108 @@
+"""Historique des documents : stockage et temps de reconstruction selon K.
+
+    python -m benchmarks.revisions --versions 200 --lines 2000 --interval 1 8 16 32
+
+Chaque version modifie quelques lignes d’un document. Pour chaque K : octets
+stockés (vs une copie complète par version), temps d’écriture d’une version
+et temps de reconstruction (p50 / max, en ms) sur toutes les versions.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.models.db import Database, create_db_engine, init_db
+from app.models.entities import DocumentRevision
+from app.models.schemas import DocumentCreate, DocumentUpdate, ProjectCreate
+from app.services import documents as documents_service
+from app.services import projects as projects_service
+from app.services import revisions as revisions_service
+from app.settings import DatabaseSettings
+
+WORDS = ["contexte", "décision", "option", "risque", "latence", "coût", "api", "cache"]
+
+
+def _versions(count: int, lines: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    current = [f"{i} {' '.join(rng.choices(WORDS, k=8))}\n" for i in range(lines)]
+    contents = ["".join(current)]
+    for _ in range(count - 1):
+        for _ in range(rng.randint(1, 5)):  # quelques lignes modifiées / ajoutées
+            i = rng.randrange(len(current))
+            if rng.random() < 0.2:
+                current.insert(i, f"ajout {' '.join(rng.choices(WORDS, k=6))}\n")
+            else:
+                current[i] = f"{i} {' '.join(rng.choices(WORDS, k=8))}\n"
+        contents.append("".join(current))
+    return contents
+
+
+def _stored_bytes(session, doc_id) -> int:
+    return session.exec(
+        select(func.sum(DocumentRevision.size)).where(DocumentRevision.document_id == doc_id)
+    ).one()
+
+
+def run(versions: list[str], interval: int, db_path: Path) -> dict[str, float]:
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    init_db(engine)
+    db = Database(engine)
+    revisions_service.SNAPSHOT_INTERVAL = interval
+
+    project = db.run_blocking(
+        projects_service.create_project, ProjectCreate(name=f"Bench K={interval}")
+    )
+    doc = db.run_blocking(
+        documents_service.create_document,
+        project.id,
+        DocumentCreate(project_id=project.id, type="tdr", content=versions[0]),
+    )
+    start = time.perf_counter()
+    for content in versions[1:]:
+        db.run_blocking(documents_service.update_document, doc.id, DocumentUpdate(content=content))
+    write_ms = (time.perf_counter() - start) * 1000 / max(len(versions) - 1, 1)
+
+    rebuild_ms = []
+    for n, expected in enumerate(versions, start=1):
+        start = time.perf_counter()
+        revision = db.run_blocking(revisions_service.get_revision, doc.id, n)
+        rebuild_ms.append((time.perf_counter() - start) * 1000)
+        assert revision.content == expected, n
+
+    stored = db.run_blocking(_stored_bytes, doc.id)
+    full_copies = sum(len(c.encode()) for c in versions)
+    engine.dispose()
+    return {
+        "interval": interval,
+        "stored_kb": round(stored / 1024, 1),
+        "full_copies_kb": round(full_copies / 1024, 1),
+        "ratio": round(stored / full_copies, 4),
+        "write_ms": round(write_ms, 3),
+        "rebuild_p50_ms": round(statistics.median(rebuild_ms), 3),
+        "rebuild_max_ms": round(max(rebuild_ms), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--versions", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--interval", type=int, nargs="+", default=[1, 8, 16, 32])
+    args = parser.parse_args()
+
+    versions = _versions(args.versions, args.lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        for interval in args.interval:
+            print(json.dumps(run(versions, interval, Path(tmp) / f"bench-{interval}.db")))
+
+
+if __name__ == "__main__":
+    main()
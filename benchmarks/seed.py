@@ -0,0 +1,173 @@
+"""Jeu de données synthétique : projets × epics × stories × commentaires × sprints.
+
+Écrit par les services (lots executemany) sur n’importe quelle base : SQLite
+temporaire par défaut, Postgres local via `--database-url`.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.models.db import Database
+from app.models.entities import Comment
+from app.models.schemas import (
+    DocumentCreate,
+    EpicCreate,
+    ProjectCreate,
+    SprintCreate,
+    StoryBulkTransition,
+)
+from app.services import documents as documents_service
+from app.services import epics as epics_service
+from app.services import imports as imports_service
+from app.services import projects as projects_service
+from app.services import sprints as sprints_service
+from app.services import stories as stories_service
+from app.services.sprints import MAX_STORIES_PER_SPRINT
+
+PRIORITIES = ["low", "medium", "high", "critical"]
+POINTS = [1, 2, 3, 5, 8, 13]
+WORDS = ["auth", "oauth", "export", "import", "billing", "search", "dashboard", "api", "cache"]
+
+
+@dataclass
+class SeedConfig:
+    projects: int = 2
+    epics: int = 5  # par projet
+    stories: int = 100  # par epic
+    comments: int = 2  # par story
+    sprints: int = 3  # par projet, 20 stories au plus chacun
+    documents: int = 3  # par projet
+    random_seed: int = 42
+
+
+@dataclass
+class Dataset:
+    """Ids créés ; les scénarios travaillent sur le premier projet."""
+
+    config: SeedConfig
+    project_ids: list[UUID] = field(default_factory=list)
+    epic_ids: list[UUID] = field(default_factory=list)  # premier projet
+    story_ids: list[UUID] = field(default_factory=list)  # premier projet
+    sprint_ids: list[UUID] = field(default_factory=list)  # premier projet
+    document_ids: list[UUID] = field(default_factory=list)  # premier projet
+    import_job_id: Optional[UUID] = None
+
+    @property
+    def project_id(self) -> UUID:
+        return self.project_ids[0]
+
+
+def _story(rng: random.Random, i: int) -> dict:
+    topic = rng.choice(WORDS)
+    return {
+        "title": f"Story {i} {topic}",
+        "description": f"En tant qu'utilisateur je veux {topic} ({i}) pour avancer",
+        "story_points": rng.choice(POINTS),
+        "priority": rng.choice(PRIORITIES),
+    }
+
+
+def _insert_comments(session: Session, story_ids: list[UUID], per_story: int) -> None:
+    rows = [
+        {
+            "id": uuid4(),
+            "story_id": story_id,
+            "epic_id": None,
+            "text": f"Commentaire {n} sur la story",
+            "author": f"user{n}",
+        }
+        for story_id in story_ids
+        for n in range(per_story)
+    ]
+    if rows:
+        session.execute(insert(Comment), rows)
+        session.commit()
+
+
+def _close_with_done_stories(db: Database, project_id: UUID, sprint_id: UUID, story_ids: list[UUID]) -> None:
+    for target in ("todo", "in_progress", "in_review", "done"):
+        db.run_blocking(
+            stories_service.transition_stories,
+            project_id,
+            StoryBulkTransition(target_status=target, story_ids=story_ids),
+        )
+    db.run_blocking(sprints_service.start_sprint, sprint_id)
+    db.run_blocking(sprints_service.close_sprint, sprint_id)
+
+
+def seed(db: Database, config: SeedConfig) -> Dataset:
+    rng = random.Random(config.random_seed)
+    dataset = Dataset(config=config)
+    suffix = uuid4().hex[:6]
+
+    for p in range(config.projects):
+        project = db.run_blocking(
+            projects_service.create_project, ProjectCreate(name=f"Bench {suffix} {p}")
+        )
+        dataset.project_ids.append(project.id)
+        first = p == 0
+
+        story_ids: list[UUID] = []
+        for e in range(config.epics):
+            epic = db.run_blocking(
+                epics_service.create_epic,
+                project.id,
+                EpicCreate(project_id=project.id, title=f"Epic {e} {rng.choice(WORDS)}"),
+            )
+            if first:
+                dataset.epic_ids.append(epic.id)
+            for offset in range(0, config.stories, 1000):
+                items = [
+                    _story(rng, i)
+                    for i in range(offset, min(offset + 1000, config.stories))
+                ]
+                batch = db.run_blocking(stories_service.create_stories_batch, epic.id, items)
+                story_ids.extend(r.story.id for r in batch.results if r.story is not None)
+
+        db.run_blocking(_insert_comments, story_ids, config.comments)
+
+        for s in range(config.sprints):
+            sprint = db.run_blocking(
+                sprints_service.create_sprint,
+                project.id,
+                SprintCreate(project_id=project.id, name=f"Sprint {s}"),
+            )
+            members = story_ids[s * MAX_STORIES_PER_SPRINT:(s + 1) * MAX_STORIES_PER_SPRINT]
+            if members:
+                db.run_blocking(sprints_service.assign_stories_to_sprint, sprint.id, members)
+            if s == 0 and members:
+                _close_with_done_stories(db, project.id, sprint.id, members)
+            if first:
+                dataset.sprint_ids.append(sprint.id)
+
+        for d in range(config.documents):
+            doc = db.run_blocking(
+                documents_service.create_document,
+                project.id,
+                DocumentCreate(
+                    project_id=project.id,
+                    type="vision",
+                    content=f"Document {d} : " + " ".join(rng.choices(WORDS, k=200)),
+                ),
+            )
+            if first:
+                dataset.document_ids.append(doc.id)
+
+        if first:
+            dataset.story_ids = story_ids
+
+    # Un import terminé (routes /imports/{id})
+    job = db.run_blocking(imports_service.open_import, dataset.project_id, "ndjson")
+    records = [
+        (i + 1, {"type": "story", "epic_id": str(dataset.epic_ids[0]), **_story(rng, i)})
+        for i in range(20)
+    ]
+    imports_service.run_import(db, job.id, records)
+    dataset.import_job_id = job.id
+    return dataset
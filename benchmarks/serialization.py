@@ -0,0 +1,106 @@
+"""Coût par ligne d’une page de stories : chemin historique contre chemin rapide.
+
+    python -m benchmarks.serialization --count 10000
+
+- avant : objets ORM, `StoryRead.model_validate` par ligne, puis validation
+  de la réponse contre `response_model` et encodage JSON (FastAPI)
+- après : colonnes de StoryRead seulement, une validation (TypeAdapter),
+  encodage direct en octets JSON
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+from app.models.db import Database, create_db_engine, init_db
+from app.models.entities import Story
+from app.models.schemas import EpicCreate, ProjectCreate, StoriesListResponse, StoryRead
+from app.services import epics as epics_service
+from app.services import projects as projects_service
+from app.services import stories as stories_service
+from app.services.serialization import STORIES_LIST_RESPONSE, STORY_READS
+from app.settings import DatabaseSettings
+
+
+def _story(i: int) -> dict:
+    return {
+        "title": f"Story {i}",
+        "description": "Description générée pour le benchmark",
+        "story_points": 3,
+        "priority": "medium",
+    }
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(count: int, db_path: Path, repeat: int = 5) -> dict[str, float]:
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    init_db(engine)
+    db = Database(engine)
+
+    project = db.run_blocking(projects_service.create_project, ProjectCreate(name="Bench"))
+    epic = db.run_blocking(
+        epics_service.create_epic,
+        project.id,
+        EpicCreate(project_id=project.id, title="Bench epic"),
+    )
+    for offset in range(0, count, 1000):
+        items = [_story(i) for i in range(offset, min(offset + 1000, count))]
+        db.run_blocking(stories_service.create_stories_batch, epic.id, items)
+
+    query = stories_service.build_stories_query(project.id).order_by(Story.id)
+    response_model: TypeAdapter[StoriesListResponse] = TypeAdapter(StoriesListResponse)
+
+    def before(session: Session) -> bytes:
+        rows = session.exec(query).all()
+        page = StoriesListResponse(
+            stories=[StoryRead.model_validate(s, from_attributes=True) for s in rows],
+            total=len(rows),
+        )
+        # ce que fait FastAPI avec response_model : validation puis dump_json
+        return response_model.dump_json(response_model.validate_python(page))
+
+    def after(session: Session) -> bytes:
+        rows = session.execute(STORY_READS.narrow(query)).all()
+        page = StoriesListResponse(stories=STORY_READS.validate(rows), total=len(rows))
+        return STORIES_LIST_RESPONSE.dump_json(page)
+
+    with Session(engine) as session:
+        assert json.loads(before(session)) == json.loads(after(session))
+        before_s = _best_of(lambda: before(session), repeat)
+        after_s = _best_of(lambda: after(session), repeat)
+
+    engine.dispose()
+    return {
+        "count": count,
+        "before_us_per_row": round(before_s / count * 1e6, 2),
+        "after_us_per_row": round(after_s / count * 1e6, 2),
+        "speedup": round(before_s / after_s, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(run(args.count, Path(tmp) / "bench.db", args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Création de N stories : lot (executemany) contre un appel par story.
+
+    python -m benchmarks.story_batch --count 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.models.db import Database, create_db_engine, init_db
+from app.models.schemas import EpicCreate, ProjectCreate, StoryCreate
+from app.services import epics as epics_service
+from app.services import projects as projects_service
+from app.services import stories as stories_service
+from app.settings import DatabaseSettings
+
+
+def _story(i: int) -> dict:
+    return {
+        "title": f"Story {i}",
+        "description": "Description générée pour le benchmark",
+        "story_points": 3,
+        "priority": "medium",
+    }
+
+
+def run(count: int, db_path: Path) -> dict[str, float]:
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    init_db(engine)
+    db = Database(engine)
+
+    project = db.run_blocking(projects_service.create_project, ProjectCreate(name="Bench"))
+    epic = db.run_blocking(
+        epics_service.create_epic,
+        project.id,
+        EpicCreate(project_id=project.id, title="Bench epic"),
+    )
+    items = [_story(i) for i in range(count)]
+
+    start = time.perf_counter()
+    db.run_blocking(stories_service.create_stories_batch, epic.id, items)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in items:
+        db.run_blocking(
+            stories_service.create_story,
+            epic.id,
+            StoryCreate(epic_id=epic.id, **item),
+        )
+    one_by_one = time.perf_counter() - start
+
+    engine.dispose()
+    return {"count": count, "batch_s": round(batch, 4), "one_by_one_s": round(one_by_one, 4)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(run(args.count, Path(tmp) / "bench.db")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,631 @@
+"""Suite de benchmarks : toutes les routes REST (`app/api/*`) et tous les outils MCP.
+
+    python -m benchmarks.suite run --output bench-head.json
+    python -m benchmarks.suite run --database-url postgresql+psycopg://u:p@localhost/bench
+    python -m benchmarks.suite compare bench-base.json bench-head.json --threshold 0.25
+
+`run` crée le jeu de données (`benchmarks.seed`), mesure pour chaque scénario
+la latence (appels en série : p50 / p95 / p99) et le débit (appels concurrents),
+puis écrit un JSON. Les routes et outils sans scénario sont listés dans
+`uncovered`. `compare` sort en erreur si un scénario régresse au-delà du seuil
+(latence p50 ou débit), réglable par scénario avec `--scenario-threshold`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+from uuid import UUID, uuid4
+
+import anyio
+import httpx
+from anyio import CapacityLimiter
+from fastmcp import Client
+
+from app.main import create_app
+from app.mcp import server
+from app.models.db import Database, create_db_engine, get_db, init_db
+from app.models.schemas import SprintCreate
+from app.services import sprints as sprints_service
+from app.settings import DatabaseSettings
+from benchmarks.seed import Dataset, SeedConfig, seed
+
+DEFAULT_THRESHOLD = 0.25  # +25 % de latence p50 ou -25 % de débit
+
+# Appel préparé hors chrono : REST {"method", "url", ...kwargs httpx}, MCP {"tool", "arguments"}
+Call = dict[str, Any]
+
+
+@dataclass
+class Scenario:
+    name: str
+    kind: Literal["rest", "mcp"]
+    make_call: Callable[[Context, int], Call]  # (contexte, n° d’itération) -> appel
+
+
+class Context:
+    """Jeu de données et base, pour préparer des appels (sprint neuf, etc.)."""
+
+    def __init__(self, db: Database, dataset: Dataset):
+        self.db = db
+        self.dataset = dataset
+
+    def story(self, i: int) -> str:
+        return str(self.dataset.story_ids[i % len(self.dataset.story_ids)])
+
+    def stories(self, i: int, count: int) -> list[str]:
+        return [self.story(i * count + n) for n in range(count)]
+
+    def fresh_sprint(self) -> str:
+        project_id = self.dataset.project_id
+        sprint = self.db.run_blocking(
+            sprints_service.create_sprint,
+            project_id,
+            SprintCreate(project_id=project_id, name=f"Bench {uuid4().hex[:8]}"),
+        )
+        return str(sprint.id)
+
+    def sprint_with_story(self, i: int) -> tuple[str, str]:
+        sprint_id = self.fresh_sprint()
+        story_id = self.story(i)
+        self.db.run_blocking(
+            sprints_service.assign_story_to_sprint, UUID(sprint_id), UUID(story_id)
+        )
+        return sprint_id, story_id
+
+
+def _story_payload(epic_id: str, i: int) -> dict[str, Any]:
+    return {
+        "epic_id": epic_id,
+        "title": f"Bench story {i}",
+        "description": "Story créée par la suite de benchmarks",
+        "story_points": 3,
+        "priority": "medium",
+    }
+
+
+def _rest(name: str, make: Callable[[Context, int], Call]) -> Scenario:
+    return Scenario(name=name, kind="rest", make_call=make)
+
+
+def _mcp(tool: str, make: Callable[[Context, int], dict[str, Any]]) -> Scenario:
+    return Scenario(
+        name=f"mcp {tool}",
+        kind="mcp",
+        make_call=lambda ctx, i: {"tool": tool, "arguments": make(ctx, i)},
+    )
+
+
+def _get(url: Callable[[Context], str], **params: Any) -> Callable[[Context, int], Call]:
+    return lambda ctx, i: {"method": "GET", "url": url(ctx), "params": params}
+
+
+def build_scenarios() -> list[Scenario]:
+    p = lambda ctx: f"/projects/{ctx.dataset.project_id}"  # noqa: E731
+    epic = lambda ctx: str(ctx.dataset.epic_ids[0])  # noqa: E731
+    doc = lambda ctx: str(ctx.dataset.document_ids[0])  # noqa: E731
+    sprint = lambda ctx: str(ctx.dataset.sprint_ids[1 % len(ctx.dataset.sprint_ids)])  # noqa: E731
+    job = lambda ctx: str(ctx.dataset.import_job_id)  # noqa: E731
+    return [
+        # --- REST ---
+        _rest("GET /health", _get(lambda ctx: "/health")),
+        _rest("GET /health/db", _get(lambda ctx: "/health/db")),
+        _rest("GET /health/cache", _get(lambda ctx: "/health/cache")),
+        _rest("GET /metrics", _get(lambda ctx: "/metrics")),
+        _rest("GET /projects", _get(lambda ctx: "/projects")),
+        _rest(
+            "POST /projects",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": "/projects",
+                "json": {"name": f"Bench {uuid4().hex[:12]}"},
+            },
+        ),
+        _rest("GET /projects/{project_id}/stats", _get(lambda ctx: f"{p(ctx)}/stats")),
+        _rest("GET /projects/{project_id}/export", _get(lambda ctx: f"{p(ctx)}/export")),
+        _rest(
+            "POST /projects/{project_id}/epics",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"{p(ctx)}/epics",
+                "json": {"project_id": str(ctx.dataset.project_id), "title": f"Bench epic {i}"},
+            },
+        ),
+        _rest("GET /projects/{project_id}/epics", _get(lambda ctx: f"{p(ctx)}/epics", limit=50)),
+        _rest("GET /epics/{epic_id}", _get(lambda ctx: f"/epics/{epic(ctx)}")),
+        _rest(
+            "PUT /epics/{epic_id}",
+            lambda ctx, i: {
+                "method": "PUT",
+                "url": f"/epics/{epic(ctx)}",
+                "json": {"title": f"Epic renommé {i}"},
+            },
+        ),
+        _rest(
+            "POST /epics/{epic_id}/stories",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"/epics/{epic(ctx)}/stories",
+                "json": _story_payload(epic(ctx), i),
+            },
+        ),
+        _rest(
+            "POST /epics/{epic_id}/stories:batch",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"/epics/{epic(ctx)}/stories:batch",
+                "json": {"items": [_story_payload(epic(ctx), n) for n in range(50)]},
+            },
+        ),
+        _rest(
+            "PATCH /stories:batch",
+            lambda ctx, i: {
+                "method": "PATCH",
+                "url": "/stories:batch",
+                "json": {
+                    "items": [
+                        {"id": story_id, "assigned_to": f"user{i}"}
+                        for story_id in ctx.stories(i, 50)
+                    ]
+                },
+            },
+        ),
+        _rest(
+            "POST /projects/{project_id}/stories:transition",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"{p(ctx)}/stories:transition",
+                "json": {"target_status": "backlog", "story_ids": ctx.stories(i, 50)},
+            },
+        ),
+        _rest("GET /stories/{story_id}", lambda ctx, i: {"method": "GET", "url": f"/stories/{ctx.story(i)}"}),
+        _rest(
+            "PUT /stories/{story_id}",
+            lambda ctx, i: {
+                "method": "PUT",
+                "url": f"/stories/{ctx.story(i)}",
+                "json": {"assigned_to": f"user{i}"},
+            },
+        ),
+        _rest(
+            "GET /projects/{project_id}/stories",
+            _get(lambda ctx: f"{p(ctx)}/stories", limit=200),
+        ),
+        _rest(
+            "GET /projects/{project_id}/stories?include=comment_count,last_comment",
+            _get(
+                lambda ctx: f"{p(ctx)}/stories",
+                limit=200,
+                include="comment_count,last_comment",
+            ),
+        ),
+        _rest(
+            "POST /projects/{project_id}/sprints",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"{p(ctx)}/sprints",
+                "json": {"project_id": str(ctx.dataset.project_id), "name": f"Sprint bench {i}"},
+            },
+        ),
+        _rest(
+            "GET /projects/{project_id}/sprints/analytics",
+            _get(lambda ctx: f"{p(ctx)}/sprints/analytics"),
+        ),
+        _rest(
+            "PUT /sprints/{sprint_id}/start",
+            lambda ctx, i: {"method": "PUT", "url": f"/sprints/{ctx.fresh_sprint()}/start"},
+        ),
+        _rest("GET /sprints/{sprint_id}/board", _get(lambda ctx: f"/sprints/{sprint(ctx)}/board")),
+        _rest(
+            "PUT /sprints/{sprint_id}/close",
+            lambda ctx, i: {"method": "PUT", "url": f"/sprints/{ctx.fresh_sprint()}/close"},
+        ),
+        _rest(
+            "PUT /sprints/{sprint_id}/stories",
+            lambda ctx, i: {
+                "method": "PUT",
+                "url": f"/sprints/{ctx.fresh_sprint()}/stories",
+                "json": {"story_ids": ctx.stories(i, 10)},
+            },
+        ),
+        _rest(
+            "PUT /sprints/{sprint_id}/stories/{story_id}",
+            lambda ctx, i: {
+                "method": "PUT",
+                "url": f"/sprints/{ctx.fresh_sprint()}/stories/{ctx.story(i)}",
+            },
+        ),
+        _rest(
+            "DELETE /sprints/{sprint_id}/stories/{story_id}",
+            lambda ctx, i: {
+                "method": "DELETE",
+                "url": "/sprints/{}/stories/{}".format(*ctx.sprint_with_story(i)),
+            },
+        ),
+        _rest(
+            "POST /stories/{story_id}/comments",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"/stories/{ctx.story(i)}/comments",
+                "json": {"text": f"Commentaire de benchmark {i}"},
+            },
+        ),
+        _rest(
+            "GET /stories/{story_id}/comments",
+            lambda ctx, i: {"method": "GET", "url": f"/stories/{ctx.story(i)}/comments"},
+        ),
+        _rest(
+            "POST /epics/{epic_id}/comments",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"/epics/{epic(ctx)}/comments",
+                "json": {"text": f"Commentaire de benchmark {i}"},
+            },
+        ),
+        _rest("GET /epics/{epic_id}/comments", _get(lambda ctx: f"/epics/{epic(ctx)}/comments")),
+        _rest(
+            "POST /projects/{project_id}/documents",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"{p(ctx)}/documents",
+                "json": {
+                    "project_id": str(ctx.dataset.project_id),
+                    "type": "tdr",
+                    "content": f"Document de benchmark {i}",
+                },
+            },
+        ),
+        _rest("GET /projects/{project_id}/documents", _get(lambda ctx: f"{p(ctx)}/documents")),
+        _rest(
+            "GET /projects/{project_id}/documents?view=summary",
+            _get(lambda ctx: f"{p(ctx)}/documents", view="summary"),
+        ),
+        _rest("GET /documents/{doc_id}", _get(lambda ctx: f"/documents/{doc(ctx)}")),
+        _rest(
+            "GET /documents/{doc_id}/content",
+            _get(lambda ctx: f"/documents/{doc(ctx)}/content"),
+        ),
+        _rest(
+            "GET /documents/{doc_id}/revisions",
+            _get(lambda ctx: f"/documents/{doc(ctx)}/revisions"),
+        ),
+        _rest(
+            "GET /documents/{doc_id}/revisions/{version}",
+            _get(lambda ctx: f"/documents/{doc(ctx)}/revisions/1"),
+        ),
+        _rest(
+            "PUT /documents/{doc_id}",
+            lambda ctx, i: {
+                "method": "PUT",
+                "url": f"/documents/{doc(ctx)}",
+                "json": {"content": f"Contenu révisé {i}"},
+            },
+        ),
+        _rest("GET /projects/{project_id}/search", _get(lambda ctx: f"{p(ctx)}/search", q="oauth")),
+        _rest(
+            "POST /projects/{project_id}/import",
+            lambda ctx, i: {
+                "method": "POST",
+                "url": f"{p(ctx)}/import",
+                "content": "".join(
+                    json.dumps({"type": "story", **_story_payload(epic(ctx), n)}) + "\n"
+                    for n in range(20)
+                ).encode(),
+            },
+        ),
+        _rest("GET /imports/{job_id}", _get(lambda ctx: f"/imports/{job(ctx)}")),
+        _rest("GET /imports/{job_id}/errors", _get(lambda ctx: f"/imports/{job(ctx)}/errors")),
+        # --- MCP ---
+        _mcp("create_project", lambda ctx, i: {"name": f"Bench {uuid4().hex[:12]}"}),
+        _mcp("get_project_stats", lambda ctx, i: {"project_id": str(ctx.dataset.project_id)}),
+        _mcp(
+            "search_epics",
+            lambda ctx, i: {"project_id": str(ctx.dataset.project_id), "search": "auth"},
+        ),
+        _mcp(
+            "search_epics_page",
+            lambda ctx, i: {"project_id": str(ctx.dataset.project_id), "limit": 2},
+        ),
+        _mcp(
+            "create_story",
+            lambda ctx, i: {
+                k: v for k, v in _story_payload(epic(ctx), i).items() if k != "epic_id"
+            }
+            | {"epic_id": epic(ctx)},
+        ),
+        _mcp(
+            "list_stories",
+            lambda ctx, i: {"project_id": str(ctx.dataset.project_id), "limit": 50},
+        ),
+        _mcp(
+            "transition_stories",
+            lambda ctx, i: {
+                "project_id": str(ctx.dataset.project_id),
+                "target_status": "backlog",
+                "story_ids": ctx.stories(i, 50),
+            },
+        ),
+        _mcp(
+            "assign_story_to_sprint",
+            lambda ctx, i: {"sprint_id": ctx.fresh_sprint(), "story_id": ctx.story(i)},
+        ),
+        _mcp(
+            "assign_stories_to_sprint",
+            lambda ctx, i: {"sprint_id": ctx.fresh_sprint(), "story_ids": ctx.stories(i, 10)},
+        ),
+        _mcp("get_sprint_board", lambda ctx, i: {"sprint_id": sprint(ctx)}),
+        _mcp("get_sprint_analytics", lambda ctx, i: {"project_id": str(ctx.dataset.project_id)}),
+        _mcp(
+            "add_comment_to_story",
+            lambda ctx, i: {"story_id": ctx.story(i), "text": f"Commentaire MCP {i}"},
+        ),
+        _mcp(
+            "create_document",
+            lambda ctx, i: {
+                "project_id": str(ctx.dataset.project_id),
+                "type": "tdr",
+                "content": f"Document MCP {i}",
+            },
+        ),
+        _mcp(
+            "search",
+            lambda ctx, i: {"project_id": str(ctx.dataset.project_id), "query": "oauth"},
+        ),
+        _mcp("server_stats", lambda ctx, i: {}),
+    ]
+
+
+# --- Mesure ---
+
+def _summary(latencies: list[float], errors: int, rps: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+
+    def quantile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "p50_ms": round(quantile(0.50), 3),
+        "p95_ms": round(quantile(0.95), 3),
+        "p99_ms": round(quantile(0.99), 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "rps": round(rps, 1),
+        "errors": errors,
+    }
+
+
+async def _measure(
+    send: Callable[[Call], Any],
+    calls: list[Call],
+    throughput_calls: list[Call],
+    concurrency: int,
+) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    for call in calls:
+        start = time.perf_counter()
+        ok = await send(call)
+        latencies.append(time.perf_counter() - start)
+        errors += not ok
+
+    pending = iter(throughput_calls)
+
+    async def worker() -> None:
+        nonlocal errors
+        for call in pending:
+            ok = await send(call)  # pas `errors += not await …` : lu avant l’await
+            errors += not ok
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for _ in range(concurrency):
+            tg.start_soon(worker)
+    elapsed = time.perf_counter() - start
+    return _summary(latencies, errors, len(throughput_calls) / elapsed)
+
+
+async def _run_scenarios(
+    ctx: Context,
+    scenarios: list[Scenario],
+    iterations: int,
+    warmup: int,
+    concurrency: int,
+) -> tuple[dict[str, Any], dict[str, list[str]]]:
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: ctx.db
+
+    results: dict[str, Any] = {}
+    # Exception non gérée : réponse 500 comptée en erreur, la campagne continue
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http, Client(
+        server.mcp
+    ) as mcp_client:
+
+        async def send_rest(call: Call) -> bool:
+            call = dict(call)
+            response = await http.request(call.pop("method"), call.pop("url"), **call)
+            return response.status_code < 400
+
+        async def send_mcp(call: Call) -> bool:
+            result = await mcp_client.call_tool(
+                call["tool"], call["arguments"], raise_on_error=False
+            )
+            return not result.is_error
+
+        for scenario in scenarios:
+            send = send_rest if scenario.kind == "rest" else send_mcp
+            total = warmup + 2 * iterations
+            calls = [scenario.make_call(ctx, i) for i in range(total)]
+            for call in calls[:warmup]:
+                await send(call)
+            results[scenario.name] = await _measure(
+                send, calls[warmup:warmup + iterations], calls[warmup + iterations:], concurrency
+            )
+            print(f"{scenario.name}: {results[scenario.name]}", file=sys.stderr)
+
+        covered = {s.name for s in scenarios}
+        routes = [
+            f"{method.upper()} {path}"
+            for path, operations in app.openapi()["paths"].items()
+            for method in operations
+        ]
+        tools = [f"mcp {tool.name}" for tool in await mcp_client.list_tools()]
+    uncovered = {
+        "rest": [r for r in routes if r not in covered],
+        "mcp": [t for t in tools if t not in covered],
+    }
+    return results, uncovered
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(
+    database_url: str,
+    config: SeedConfig,
+    iterations: int = 30,
+    warmup: int = 3,
+    concurrency: int = 8,
+    only: Optional[str] = None,
+) -> dict[str, Any]:
+    settings = DatabaseSettings(url=database_url)
+    engine = create_db_engine(settings)
+    init_db(engine)
+    db = Database(engine)
+    server.runner = Database(engine, limiter=CapacityLimiter(settings.mcp_max_concurrency))
+
+    start = time.perf_counter()
+    dataset = seed(db, config)
+    seed_s = time.perf_counter() - start
+
+    scenarios = [s for s in build_scenarios() if only is None or only in s.name]
+    results, uncovered = anyio.run(
+        _run_scenarios, Context(db, dataset), scenarios, iterations, warmup, concurrency
+    )
+    engine.dispose()
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "database": engine.dialect.name,
+            "seed": asdict(config),
+            "seed_s": round(seed_s, 2),
+            "iterations": iterations,
+            "concurrency": concurrency,
+        },
+        "scenarios": results,
+        "uncovered": uncovered,
+    }
+
+
+# --- Comparaison ---
+
+def compare(
+    base: dict[str, Any],
+    head: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    overrides: Optional[dict[str, float]] = None,
+) -> list[dict[str, Any]]:
+    """Écarts par scénario commun ; `regression` si p50 ou débit dépasse le seuil."""
+    overrides = overrides or {}
+    rows = []
+    for name, before in base["scenarios"].items():
+        after = head["scenarios"].get(name)
+        if after is None:
+            continue
+        limit = overrides.get(name, threshold)
+        latency = after["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        rps = after["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        rows.append(
+            {
+                "scenario": name,
+                "p50_change": round(latency, 3),
+                "rps_change": round(rps, 3),
+                "threshold": limit,
+                "regression": latency > limit or rps < -limit,
+            }
+        )
+    return rows
+
+
+def _parse_overrides(values: list[str]) -> dict[str, float]:
+    overrides = {}
+    for value in values:
+        name, _, limit = value.rpartition("=")
+        overrides[name] = float(limit)
+    return overrides
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="seeder puis mesurer")
+    run_cmd.add_argument("--database-url", default=None, help="défaut : SQLite temporaire")
+    run_cmd.add_argument("--output", type=Path, default=None)
+    run_cmd.add_argument("--iterations", type=int, default=30)
+    run_cmd.add_argument("--warmup", type=int, default=3)
+    run_cmd.add_argument("--concurrency", type=int, default=8)
+    run_cmd.add_argument("--only", default=None, help="scénarios dont le nom contient ce texte")
+    defaults = SeedConfig()
+    for name in ("projects", "epics", "stories", "comments", "sprints", "documents"):
+        run_cmd.add_argument(f"--{name}", type=int, default=getattr(defaults, name))
+
+    compare_cmd = commands.add_parser("compare", help="comparer deux résultats")
+    compare_cmd.add_argument("base", type=Path)
+    compare_cmd.add_argument("head", type=Path)
+    compare_cmd.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_cmd.add_argument(
+        "--scenario-threshold",
+        action="append",
+        default=[],
+        metavar="NOM=SEUIL",
+        help='ex. "GET /projects/{project_id}/export=0.5"',
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare(
+            json.loads(args.base.read_text()),
+            json.loads(args.head.read_text()),
+            args.threshold,
+            _parse_overrides(args.scenario_threshold),
+        )
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(
+                f"{flag:10} {row['scenario']:55} p50 {row['p50_change']:+.1%}  "
+                f"rps {row['rps_change']:+.1%}  (seuil {row['threshold']:.0%})"
+            )
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    config = SeedConfig(
+        **{name: getattr(args, name) for name in ("projects", "epics", "stories", "comments", "sprints", "documents")}
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        result = run(url, config, args.iterations, args.warmup, args.concurrency, args.only)
+    output = json.dumps(result, indent=2)
+    if args.output is not None:
+        args.output.write_text(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import Session, create_engine
 from sqlalchemy.pool import StaticPool  # <-- ajoute ça
 
 from app.main import create_app
-from app.models.db import get_session
+from app.models.db import Database, create_db_engine, get_db, get_session, init_db
+from app.query_budget import query_budget as _query_budget
+from app.services.cache import entity_cache
+from app.settings import DatabaseSettings
+
+
+@pytest.fixture(autouse=True)
+def _clear_entity_cache():
+    # Cache d’entités vidé entre les tests (désactivable : entity_cache.enabled = False)
+    entity_cache.clear()
+    yield
+    entity_cache.clear()
 
 
 @pytest.fixture
@@ -18,9 +31,25 @@ def engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
+    init_db(engine)
     return engine
 
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Base SQLite sur fichier (WAL, pool) pour les tests de concurrence."""
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{tmp_path / 'test.db'}"))
+    init_db(engine)
+    yield Database(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget(engine):
+    """`with query_budget(n): ...` échoue au-delà de n requêtes SQL (SQL listé)."""
+    return lambda max_queries, label=None: _query_budget(engine, max_queries, label)
+
+
 @pytest.fixture
 def session(engine):
     with Session(engine) as session:
@@ -28,7 +57,7 @@ def session(engine):
 
 
 @pytest.fixture
-def client(session):
+def client(engine, session):
     app = create_app()
 
     # Override de la dépendance DB pour les tests
@@ -36,6 +65,47 @@ def client(session):
         yield session
 
     app.dependency_overrides[get_session] = _get_session_override
+    app.dependency_overrides[get_db] = lambda: Database(engine)
 
     with TestClient(app) as c:
-        yield c
\ No newline at end of file
+        yield c
+
+
+@dataclass
+class SeededProject:
+    project_id: str
+    epic_id: str
+    story_ids: list[str] = field(default_factory=list)
+
+
+@pytest.fixture
+def seed_project(client):
+    """`seed_project(name, stories=n)` : projet, epic et n stories (« Story i »), via l’API."""
+
+    def seed(
+        name: str = "Proj Test",
+        stories: int = 0,
+        story_points: int = 3,
+        priority: str = "medium",
+    ) -> SeededProject:
+        project_id = client.post("/projects", json={"name": name}).json()["id"]
+        epic_id = client.post(
+            f"/projects/{project_id}/epics",
+            json={"project_id": project_id, "title": f"Epic {name}"},
+        ).json()["id"]
+        seeded = SeededProject(project_id, epic_id)
+        if stories:
+            items = [
+                {
+                    "title": f"Story {i}",
+                    "description": "Description suffisante pour le test",
+                    "story_points": story_points,
+                    "priority": priority,
+                }
+                for i in range(stories)
+            ]
+            results = client.post(f"/epics/{epic_id}/stories:batch", json={"items": items})
+            seeded.story_ids = [r["story"]["id"] for r in results.json()["results"]]
+        return seeded
+
+    return seed
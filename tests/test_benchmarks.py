@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastmcp import Client
+
+from app.main import create_app
+from app.mcp import server
+from app.models.db import Database
+from benchmarks.suite import build_scenarios, compare
+
+
+def test_every_route_and_tool_has_a_scenario(engine, monkeypatch):
+    monkeypatch.setattr(server, "runner", Database(engine))
+    names = {s.name for s in build_scenarios()}
+    routes = {
+        f"{method.upper()} {path}"
+        for path, operations in create_app().openapi()["paths"].items()
+        for method in operations
+    }
+
+    async def _tools() -> set[str]:
+        async with Client(server.mcp) as client:
+            return {f"mcp {tool.name}" for tool in await client.list_tools()}
+
+    assert routes <= names
+    assert asyncio.run(_tools()) <= names
+
+
+def test_compare_flags_regressions_with_per_scenario_threshold():
+    base = {"scenarios": {"a": {"p50_ms": 10.0, "rps": 100.0}, "b": {"p50_ms": 10.0, "rps": 100.0}}}
+    head = {"scenarios": {"a": {"p50_ms": 14.0, "rps": 100.0}, "b": {"p50_ms": 14.0, "rps": 60.0}}}
+
+    rows = {r["scenario"]: r for r in compare(base, head, threshold=0.25, overrides={"b": 0.5})}
+    assert rows["a"]["regression"] is True  # +40 % de latence
+    assert rows["b"]["regression"] is False  # -40 % de débit, sous le seuil de 50 %
+
+
+def test_server_errors_are_counted_not_raised(tmp_path, monkeypatch):
+    from app.services import documents as documents_service
+    from benchmarks.seed import SeedConfig
+    from benchmarks.suite import run
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(documents_service, "update_document", fail)
+    monkeypatch.setattr(server, "runner", server.runner)  # remplacé par run()
+    config = SeedConfig(projects=1, epics=1, stories=2, comments=0, sprints=1, documents=1)
+    report = run(
+        f"sqlite:///{tmp_path / 'bench.db'}",
+        config,
+        iterations=2,
+        warmup=1,
+        concurrency=2,
+        only="PUT /documents",
+    )
+    assert report["scenarios"]["PUT /documents/{doc_id}"]["errors"] == 4
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.models.entities import Epic
+from app.services.cache import EntityCache, entity_cache
+
+
+def _epic(client: TestClient) -> str:
+    project_id = client.post("/projects", json={"name": "Proj Cache"}).json()["id"]
+    return client.post(
+        f"/projects/{project_id}/epics",
+        json={"project_id": project_id, "title": "Epic Cache"},
+    ).json()["id"]
+
+
+def test_epic_reads_hit_cache_and_writes_invalidate(client: TestClient):
+    epic_id = _epic(client)
+
+    client.get(f"/epics/{epic_id}")
+    before = client.get("/health/cache").json()
+    assert client.get(f"/epics/{epic_id}").json()["title"] == "Epic Cache"
+    assert client.get("/health/cache").json()["hits"] == before["hits"] + 1
+
+    client.put(f"/epics/{epic_id}", json={"title": "Epic renommé"})
+    assert client.get(f"/epics/{epic_id}").json()["title"] == "Epic renommé"
+
+
+def test_cache_can_be_disabled(client: TestClient, monkeypatch):
+    monkeypatch.setattr(entity_cache, "enabled", False)
+    epic_id = _epic(client)
+
+    client.get(f"/epics/{epic_id}")
+    client.get(f"/epics/{epic_id}")
+    stats = client.get("/health/cache").json()
+    assert stats["hits"] == 0
+    assert stats["size"] == 0
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = EntityCache(max_entries=2, ttl=10)
+    ids = [uuid4() for _ in range(3)]
+    for i in ids:
+        cache.set(Epic, i, str(i))
+    assert cache.get(Epic, ids[0]) is None
+    assert cache.get(Epic, ids[2]) == str(ids[2])
+    assert cache.stats()["evictions"] == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now + 11)
+    assert cache.get(Epic, ids[2]) is None
+
+
+def test_stale_read_is_not_cached_after_invalidation():
+    cache = EntityCache()
+    entity_id = uuid4()
+    generation = cache.generation
+    cache.invalidate(Epic, entity_id)  # écriture concurrente pendant la lecture
+    cache.set(Epic, entity_id, "ancienne valeur", generation)
+    assert cache.get(Epic, entity_id) is None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.models.db import (
+    Database,
+    create_async_db_engine,
+    create_db_engine,
+    get_db,
+    init_db,
+    pool_stats,
+)
+from app.settings import DatabaseSettings
+
+
+def test_settings_from_environment(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost/db")
+    monkeypatch.setenv("DB_POOL_SIZE", "40")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    settings = DatabaseSettings()
+    assert settings.url.startswith("postgresql+psycopg://")
+    assert settings.pool_size == 40
+    assert settings.pool_pre_ping is False
+
+
+def test_file_sqlite_engine_pool_and_pragmas(tmp_path):
+    settings = DatabaseSettings(
+        url=f"sqlite:///{tmp_path / 'test.db'}",
+        pool_size=3,
+        max_overflow=1,
+    )
+    engine = create_db_engine(settings)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+        stats = pool_stats(engine)
+        assert stats["size"] == 3
+        assert stats["checked_out"] == 1
+
+    engine.dispose()
+
+
+def test_pool_stats_endpoint(client: TestClient):
+    resp = client.get("/health/db")
+    assert resp.status_code == 200
+    assert "pool_class" in resp.json()
+
+
+def test_async_mode_runs_routes_on_aiosqlite(tmp_path):
+    settings = DatabaseSettings(url=f"sqlite:///{tmp_path / 'async.db'}", async_mode=True)
+    sync_engine = create_db_engine(settings)
+    init_db(sync_engine)
+    async_engine = create_async_db_engine(settings)
+    assert async_engine.url.drivername == "sqlite+aiosqlite"
+
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: Database(sync_engine, async_engine)
+    with TestClient(app) as client:
+        project_id = client.post("/projects", json={"name": "Async"}).json()["id"]
+        epic = client.post(
+            f"/projects/{project_id}/epics",
+            json={"project_id": project_id, "title": "Epic async"},
+        )
+        assert epic.status_code == 201
+        epics = client.get(f"/projects/{project_id}/epics").json()
+        assert [e["title"] for e in epics] == ["Epic async"]
+        assert client.get("/health/db").json()["async"] is True
+
+    sync_engine.dispose()
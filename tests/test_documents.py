@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import gzip
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import documents as documents_service
+from app.services import revisions as revisions_service
+
+CONTENT = "Décision : " + "architecture hexagonale " * 400  # ~9,6 Kio, non ASCII
+
+
+@pytest.fixture
+def document(client: TestClient, seed_project) -> tuple[str, str]:
+    """Projet et document TDR de ~9,6 Kio (`CONTENT`)."""
+    project_id = seed_project("Proj Docs").project_id
+    doc_id = client.post(
+        f"/projects/{project_id}/documents",
+        json={"project_id": project_id, "type": "tdr", "content": CONTENT},
+    ).json()["id"]
+    return project_id, doc_id
+
+
+def test_summary_listing_skips_content(client: TestClient, query_budget, document):
+    project_id, doc_id = document
+
+    with query_budget(3) as log:
+        resp = client.get(f"/projects/{project_id}/documents", params={"view": "summary"})
+    assert resp.status_code == 200
+    (summary,) = resp.json()
+    assert summary["id"] == doc_id
+    assert summary["content_length"] == len(CONTENT.encode())
+    assert summary["excerpt"] == CONTENT[:200]
+    assert "content" not in summary
+    listing_sql = next(sql for sql in log.statements if "AS excerpt" in sql)
+    assert not re.search(r"(SELECT |, )document\.content(,| FROM)", listing_sql)
+
+    full = client.get(f"/projects/{project_id}/documents").json()
+    assert full[0]["content"] == CONTENT
+
+
+def test_content_full_and_ranges(client: TestClient, monkeypatch, query_budget, document):
+    monkeypatch.setattr(documents_service, "CONTENT_CHUNK_SIZE", 1000)
+    _, doc_id = document
+    raw = CONTENT.encode()
+
+    with query_budget(2):  # taille + contenu, quel que soit le nombre de tranches
+        resp = client.get(
+            f"/documents/{doc_id}/content", headers={"Accept-Encoding": "identity"}
+        )
+    assert resp.status_code == 200
+    assert resp.content == raw
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["content-length"] == str(len(raw))
+    etag = resp.headers["etag"]
+
+    resp = client.get(f"/documents/{doc_id}/content", headers={"Range": "bytes=0-2"})
+    assert resp.status_code == 206
+    assert resp.content == raw[:3]
+    assert resp.headers["content-range"] == f"bytes 0-2/{len(raw)}"
+
+    resp = client.get(f"/documents/{doc_id}/content", headers={"Range": "bytes=995-2500"})
+    assert resp.content == raw[995:2501]
+
+    resp = client.get(f"/documents/{doc_id}/content", headers={"Range": "bytes=-10"})
+    assert resp.content == raw[-10:]
+
+    resp = client.get(f"/documents/{doc_id}/content", headers={"Range": f"bytes={len(raw)}-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{len(raw)}"
+
+    # If-Range périmé : contenu entier
+    resp = client.get(
+        f"/documents/{doc_id}/content",
+        headers={"Range": "bytes=0-2", "If-Range": '"99"', "Accept-Encoding": "identity"},
+    )
+    assert resp.status_code == 200 and resp.content == raw
+
+    resp = client.get(
+        f"/documents/{doc_id}/content",
+        headers={"If-None-Match": etag, "Accept-Encoding": "identity"},
+    )
+    assert resp.status_code == 304
+
+
+def test_content_gzip(client: TestClient, document):
+    _, doc_id = document
+
+    resp = client.get(f"/documents/{doc_id}/content", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.content == CONTENT.encode()  # décompressé par httpx
+    assert int(resp.headers.get("content-length", 0)) < len(CONTENT.encode()) or (
+        "content-length" not in resp.headers
+    )
+
+    # ETag propre à la représentation gzip, jamais accepté par If-Range
+    etag = resp.headers["etag"]
+    assert etag == '"1-gzip"'
+    resp = client.get(
+        f"/documents/{doc_id}/content", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    resp = client.get(
+        f"/documents/{doc_id}/content",
+        headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+    )
+    assert resp.status_code == 200 and resp.headers["etag"] == '"1"'
+    resp = client.get(
+        f"/documents/{doc_id}/content",
+        headers={"Range": "bytes=0-2", "If-Range": etag, "Accept-Encoding": "gzip"},
+    )
+    assert resp.status_code == 200 and resp.headers["etag"] == '"1-gzip"'
+
+
+def test_gzip_stream_roundtrip():
+    from app.api.responses import gzip_stream
+
+    chunks = [b"abc" * 1000, b"", "é".encode() * 10]
+    assert gzip.decompress(b"".join(gzip_stream(iter(chunks)))) == b"".join(chunks)
+
+
+def _lines(n: int, edited: int = -1) -> str:
+    return "".join(
+        f"Ligne {i} {'modifiée' if i == edited else 'du TDR'}\n" for i in range(n)
+    )
+
+
+def test_revisions_snapshots_and_deltas(client: TestClient, monkeypatch):
+    monkeypatch.setattr(revisions_service, "SNAPSHOT_INTERVAL", 4)
+    project_id = client.post("/projects", json={"name": "Proj Revisions"}).json()["id"]
+    versions = [_lines(200)] + [_lines(200, edited=i) for i in range(1, 10)]
+    doc_id = client.post(
+        f"/projects/{project_id}/documents",
+        json={"project_id": project_id, "type": "tdr", "content": versions[0]},
+    ).json()["id"]
+    for content in versions[1:]:
+        assert client.put(f"/documents/{doc_id}", json={"content": content}).status_code == 200
+
+    revisions = client.get(f"/documents/{doc_id}/revisions").json()
+    assert [r["version"] for r in revisions] == list(range(1, 11))
+    kinds = [r["kind"] for r in revisions]
+    assert [i + 1 for i, kind in enumerate(kinds) if kind == "snapshot"] == [1, 5, 9]
+    delta_size = max(r["size"] for r in revisions if r["kind"] == "delta")
+    assert delta_size < len(versions[0]) / 10
+
+    for n, content in enumerate(versions, start=1):
+        resp = client.get(f"/documents/{doc_id}/revisions/{n}")
+        assert resp.status_code == 200
+        assert resp.json()["content"] == content
+        assert resp.headers["etag"] == f'"{n}"'
+
+    assert client.get(f"/documents/{doc_id}/revisions/11").status_code == 404
+    def revision_status(path: str, etag: str) -> int:
+        return client.get(path, headers={"If-None-Match": etag}).status_code
+
+    assert revision_status(f"/documents/{doc_id}/revisions/3", '"3"') == 304
+    # 404 même si l’ETag correspond : l’existence est vérifiée avant le 304
+    assert revision_status(f"/documents/{doc_id}/revisions/11", '"11"') == 404
+    unknown = "00000000-0000-0000-0000-000000000000"
+    assert revision_status(f"/documents/{unknown}/revisions/1", '"1"') == 404
+
+
+def test_revision_of_document_without_history(client: TestClient, session, document):
+    from app.models.entities import DocumentRevision
+    from sqlmodel import delete
+
+    project_id, doc_id = document
+    session.exec(delete(DocumentRevision))
+    session.commit()
+
+    client.put(f"/documents/{doc_id}", json={"content": "Nouvelle version\n"})
+    revisions = client.get(f"/documents/{doc_id}/revisions").json()
+    assert [(r["version"], r["kind"]) for r in revisions] == [(2, "snapshot")]
+    assert client.get(f"/documents/{doc_id}/revisions/1").status_code == 404
+
+
+def test_history_conflict_returns_409(client: TestClient, session, document):
+    from app.models.entities import DocumentRevision
+    from uuid import UUID
+
+    _, doc_id = document
+    session.add(
+        DocumentRevision(document_id=UUID(doc_id), version=2, kind="snapshot", data="x", size=1)
+    )
+    session.commit()
+
+    resp = client.put(f"/documents/{doc_id}", json={"content": "Nouvelle version\n"})
+    assert resp.status_code == 409
+    assert client.get(f"/documents/{doc_id}").json()["version"] == 1
+
+
+def test_delta_roundtrip():
+    old = "a\nb\nc\nsans fin"
+    new = "a\nB\nc\nd\n"
+    assert revisions_service.apply_delta(old, revisions_service.make_delta(old, new)) == new
+    assert revisions_service.apply_delta("", revisions_service.make_delta("", new)) == new
+    assert revisions_service.apply_delta(old, revisions_service.make_delta(old, "")) == ""
+
+
+def test_concurrent_updates_keep_history(file_db):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.models.schemas import DocumentCreate, DocumentUpdate, ProjectCreate
+    from app.services import projects as projects_service
+
+    project = file_db.run_blocking(
+        projects_service.create_project, ProjectCreate(name="Proj Concurrence")
+    )
+    doc = file_db.run_blocking(
+        documents_service.create_document,
+        project.id,
+        DocumentCreate(project_id=project.id, type="tdr", content=_lines(50)),
+    )
+
+    def work(worker: int) -> None:
+        for i in range(10):
+            file_db.run_blocking(
+                documents_service.update_document,
+                doc.id,
+                DocumentUpdate(content=_lines(50, edited=worker * 10 + i)),
+            )
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+
+    current = file_db.run_blocking(documents_service.get_document, doc.id)
+    assert current.version == 1 + 80
+    revisions = file_db.run_blocking(revisions_service.list_revisions, doc.id)
+    assert [r.version for r in revisions] == list(range(1, 82))
+    last = file_db.run_blocking(revisions_service.get_revision, doc.id, current.version)
+    assert last.content == current.content
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_list_epics_cursor_header(client: TestClient):
+    project_id = client.post("/projects", json={"name": "Proj Epics"}).json()["id"]
+    for i in range(3):
+        client.post(
+            f"/projects/{project_id}/epics",
+            json={"project_id": project_id, "title": f"Epic {i}"},
+        )
+
+    # Sans limit : comportement historique, tous les epics
+    resp = client.get(f"/projects/{project_id}/epics")
+    assert len(resp.json()) == 3
+    assert "X-Next-Cursor" not in resp.headers
+
+    resp = client.get(f"/projects/{project_id}/epics", params={"limit": 2})
+    assert len(resp.json()) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(
+        f"/projects/{project_id}/epics", params={"limit": 2, "cursor": cursor}
+    )
+    assert len(resp.json()) == 1
+    assert "X-Next-Cursor" not in resp.headers
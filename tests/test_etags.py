@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_entity_etag_and_not_modified(client: TestClient, seed_project):
+    epic_id = seed_project("Proj ETag").epic_id
+
+    resp = client.get(f"/epics/{epic_id}")
+    etag = resp.headers["etag"]
+    assert etag == '"1"'
+
+    resp = client.get(f"/epics/{epic_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    client.put(f"/epics/{epic_id}", json={"title": "Epic renommé"})
+    resp = client.get(f"/epics/{epic_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == '"2"'
+    assert resp.json()["version"] == 2
+
+
+def test_document_etag(client: TestClient, seed_project):
+    project_id = seed_project("Proj ETag").project_id
+    doc_id = client.post(
+        f"/projects/{project_id}/documents",
+        json={"project_id": project_id, "type": "vision", "content": "v1"},
+    ).json()["id"]
+
+    etag = client.get(f"/documents/{doc_id}").headers["etag"]
+    assert client.get(f"/documents/{doc_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/documents/{doc_id}", json={"content": "v2"})
+    resp = client.get(f"/documents/{doc_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["content"] == "v2"
+
+
+def test_list_etag_changes_with_project_writes(client: TestClient, seed_project):
+    seeded = seed_project("Proj ETag")
+    project_id, epic_id = seeded.project_id, seeded.epic_id
+    url = f"/projects/{project_id}/stories"
+
+    etag = client.get(url).headers["etag"]
+    assert etag.startswith("W/")
+    resp = client.get(url, headers={"If-None-Match": f'"other", {etag}'})
+    assert resp.status_code == 304
+
+    client.post(
+        f"/epics/{epic_id}/stories",
+        json={
+            "epic_id": epic_id,
+            "title": "Nouvelle story",
+            "description": "Description suffisante pour le test",
+            "story_points": 3,
+            "priority": "low",
+        },
+    )
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 1
+    assert resp.headers["etag"] != etag
+
+    assert client.get("/projects/00000000-0000-0000-0000-000000000000/stories").status_code == 404
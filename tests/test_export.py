@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import export as export_service
+
+
+@pytest.fixture
+def exported(client: TestClient, seed_project) -> tuple[str, list[str]]:
+    """Projet à exporter : 3 stories, 2 commentaires, 1 sprint avec une story."""
+    seeded = seed_project("Proj Export", stories=3, story_points=2, priority="high")
+    client.post(f"/stories/{seeded.story_ids[0]}/comments", json={"text": "Premier commentaire"})
+    client.post(f"/epics/{seeded.epic_id}/comments", json={"text": "Commentaire d'epic"})
+    sprint_id = client.post(
+        f"/projects/{seeded.project_id}/sprints",
+        json={"project_id": seeded.project_id, "name": "Sprint 1"},
+    ).json()["id"]
+    client.put(f"/sprints/{sprint_id}/stories/{seeded.story_ids[1]}")
+    return seeded.project_id, seeded.story_ids
+
+
+def test_export_ndjson_streams_every_record(client: TestClient, session, monkeypatch, exported):
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+    project_id, story_ids = exported
+    client.post("/projects", json={"name": "Autre projet"})
+
+    resp = client.get(f"/projects/{project_id}/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    kinds = [r["type"] for r in records]
+    assert kinds.count("project") == 1
+    assert kinds.count("epic") == 1
+    assert kinds.count("story") == 3
+    assert kinds.count("comment") == 2
+    assert kinds.count("sprint") == 1
+    history = [r for r in records if r["type"] == "sprint_history"]
+    assert [h["story_id"] for h in history] == [story_ids[1]]
+
+    batches = list(export_service.iter_records(session, uuid.UUID(project_id)))
+    assert max(len(batch) for batch in batches) == 2
+
+
+def test_export_csv(client: TestClient, exported):
+    project_id, _ = exported
+
+    resp = client.get(f"/projects/{project_id}/export", params={"format": "csv"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    stories = [r for r in rows if r["type"] == "story"]
+    assert len(stories) == 3
+    assert stories[0]["priority"] == "high"
+    assert stories[0]["assigned_to"] == ""
+
+
+def test_export_unknown_project_or_format(client: TestClient, exported):
+    assert client.get(f"/projects/{uuid.uuid4()}/export").status_code == 404
+    project_id, _ = exported
+    resp = client.get(f"/projects/{project_id}/export", params={"format": "xml"})
+    assert resp.status_code == 422
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.services import imports as imports_service
+
+
+def _story(epic_id: str, i: int, **extra) -> dict:
+    return {
+        "type": "story",
+        "epic_id": epic_id,
+        "title": f"Story importée {i}",
+        "description": "Description suffisante pour le test",
+        "story_points": 3,
+        "priority": "medium",
+        **extra,
+    }
+
+
+def _ndjson(records: list) -> bytes:
+    return "".join(
+        (r if isinstance(r, str) else json.dumps(r)) + "\n" for r in records
+    ).encode()
+
+
+def test_import_ndjson_with_row_errors(client: TestClient):
+    project_id = client.post("/projects", json={"name": "Proj Import"}).json()["id"]
+    epic_id = str(uuid.uuid4())
+    body = _ndjson(
+        [
+            {"type": "project", "id": project_id, "name": "Proj Import"},
+            {"type": "epic", "id": epic_id, "title": "Epic importé"},
+            _story(epic_id, 1, status="in_progress", assigned_to="alice"),
+            _story(epic_id, 2, story_points=4),
+            _story(str(uuid.uuid4()), 3),
+            "{pas du json",
+            _story(epic_id, 4),
+        ]
+    )
+
+    resp = client.post(
+        f"/projects/{project_id}/import", params={"chunk_size": 3}, content=body
+    )
+    assert resp.status_code == 202
+    job = client.get(resp.headers["location"]).json()
+    assert job["status"] == "completed"
+    assert job["rows_read"] == 7
+    assert (job["epics_created"], job["stories_created"]) == (1, 2)
+    assert (job["skipped"], job["failed"]) == (1, 3)
+
+    errors = client.get(f"/imports/{job['id']}/errors").json()
+    assert [e["row"] for e in errors] == [4, 5, 6]
+    assert errors[0]["error"][0]["loc"] == ["story_points"]
+    assert errors[1]["error"] == "Epic not found in project"
+
+    stats = client.get(f"/projects/{project_id}/stats").json()
+    assert stats["total"] == {"story_count": 2, "points": 6}
+    assert stats["by_status"]["in_progress"]["story_count"] == 1
+
+
+def test_import_csv(client: TestClient):
+    project_id = client.post("/projects", json={"name": "Proj CSV"}).json()["id"]
+    epic_id = client.post(
+        f"/projects/{project_id}/epics",
+        json={"project_id": project_id, "title": "Epic CSV"},
+    ).json()["id"]
+    body = (
+        "type,epic_id,title,description,story_points,priority,assigned_to\n"
+        f"story,{epic_id},Story CSV 1,Description suffisante pour le test,5,high,\n"
+        f"story,{epic_id},Story CSV 2,Description suffisante pour le test,2,low,bob\n"
+    ).encode()
+
+    resp = client.post(
+        f"/projects/{project_id}/import", params={"format": "csv"}, content=body
+    )
+    job = client.get(resp.headers["location"]).json()
+    assert job["stories_created"] == 2
+    stories = client.get(f"/projects/{project_id}/stories").json()["stories"]
+    assert sorted(s["story_points"] for s in stories) == [2, 5]
+
+
+def test_failed_import_resumes_from_last_chunk(client: TestClient, monkeypatch):
+    project_id = client.post("/projects", json={"name": "Proj Resume"}).json()["id"]
+    epic_id = str(uuid.uuid4())
+    body = _ndjson(
+        [{"type": "epic", "id": epic_id, "title": "Epic repris"}]
+        + [_story(epic_id, i) for i in range(5)]
+    )
+
+    calls = []
+    import_chunk = imports_service.import_chunk
+
+    def _failing_chunk(session, job_id, records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("connexion perdue")
+        return import_chunk(session, job_id, records)
+
+    monkeypatch.setattr(imports_service, "import_chunk", _failing_chunk)
+    resp = client.post(
+        f"/projects/{project_id}/import", params={"chunk_size": 2}, content=body
+    )
+    job = client.get(resp.headers["location"]).json()
+    assert job["status"] == "failed"
+    assert "connexion perdue" in job["message"]
+    assert job["rows_read"] == 2
+
+    monkeypatch.setattr(imports_service, "import_chunk", import_chunk)
+    resp = client.post(
+        f"/projects/{project_id}/import",
+        params={"chunk_size": 2, "resume": job["id"]},
+        content=body,
+    )
+    assert resp.status_code == 202
+    job = client.get(f"/imports/{job['id']}").json()
+    assert job["status"] == "completed"
+    assert (job["epics_created"], job["stories_created"], job["failed"]) == (1, 5, 0)
+
+    resp = client.post(
+        f"/projects/{project_id}/import", params={"resume": job["id"]}, content=body
+    )
+    assert resp.status_code == 409
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, text, tuple_
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from app.models.db import upgrade_schema
+from app.models.entities import Comment, Document, Epic, StorySprintHistory
+from app.services.stories import build_stories_query
+
+
+def _plan(session: Session, query) -> str:
+    compiled = query.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    rows = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_upgrade_adds_missing_indexes():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    # Simule une base créée avant la déclaration des index
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(text(f"DROP INDEX {index.name}"))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # idempotent
+
+    names = {i["name"] for i in inspect(engine).get_indexes("story")}
+    assert {"idx_stories_status", "idx_stories_priority_assigned", "ix_story_epic_id"} <= names
+    names = {i["name"] for i in inspect(engine).get_indexes("storysprinthistory")}
+    assert "idx_stories_sprint" in names
+
+
+def test_project_stories_query_uses_indexes(session: Session):
+    plan = _plan(session, build_stories_query(uuid.uuid4()))
+    assert "idx_epics_project_created" in plan
+    assert "ix_story_epic_id" in plan
+
+    plan = _plan(session, build_stories_query(uuid.uuid4(), status_filter="todo"))
+    assert "SCAN story" not in plan
+
+
+def test_sprint_and_comment_lookups_use_indexes(session: Session):
+    plan = _plan(
+        session,
+        select(StorySprintHistory).where(StorySprintHistory.sprint_id == uuid.uuid4()),
+    )
+    assert "idx_stories_sprint" in plan
+
+    plan = _plan(session, select(Comment).where(Comment.story_id == uuid.uuid4()))
+    assert "idx_comments_story" in plan
+
+    # Pagination keyset des commentaires : filtre et tri servis par l'index
+    plan = _plan(
+        session,
+        select(Comment)
+        .where(
+            Comment.epic_id == uuid.uuid4(),
+            tuple_(Comment.created_at, Comment.id)
+            > tuple_(datetime(2026, 1, 1, tzinfo=timezone.utc), uuid.uuid4()),
+        )
+        .order_by(Comment.created_at, Comment.id),
+    )
+    assert "idx_comments_epic" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_epic_and_document_cursor_pages_use_indexes(session: Session):
+    key = tuple_(datetime(2026, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    for entity, index in (
+        (Epic, "idx_epics_project_created"),
+        (Document, "idx_documents_project_created"),
+    ):
+        plan = _plan(
+            session,
+            select(entity)
+            .where(entity.project_id == uuid.uuid4(), tuple_(entity.created_at, entity.id) > key)
+            .order_by(entity.created_at, entity.id)
+            .limit(50),
+        )
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_upgrade_fills_created_at_for_existing_rows():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    epic_id = uuid.uuid4().hex
+    with engine.begin() as conn:
+        for index in SQLModel.metadata.tables["epic"].indexes:
+            conn.execute(text(f"DROP INDEX {index.name}"))
+        conn.execute(text("ALTER TABLE epic DROP COLUMN created_at"))
+        conn.execute(
+            text(
+                "INSERT INTO epic (id, project_id, title, status, version) "
+                f"VALUES ('{epic_id}', '{uuid.uuid4().hex}', 'Epic ancien', 'backlog', 1)"
+            )
+        )
+
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT created_at FROM epic")).scalar() is not None
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+from anyio import CapacityLimiter
+from fastmcp import Client
+
+from app.mcp import server
+from app.mcp.stats import QuantileSketch
+from app.models.db import Database, create_db_engine, init_db
+from app.services import projects as projects_service
+from app.settings import DatabaseSettings
+
+DELAY = 0.3
+CALLS = 5
+
+
+@pytest.fixture
+def slow_runner(tmp_path, monkeypatch):
+    """Runner MCP sur une base fichier, avec un service volontairement lent (I/O bloquante)."""
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{tmp_path / 'mcp.db'}"))
+    init_db(engine)
+
+    create_project = projects_service.create_project
+
+    def slow_create_project(session, payload):
+        time.sleep(DELAY)
+        return create_project(session, payload)
+
+    monkeypatch.setattr(projects_service, "create_project", slow_create_project)
+
+    def use_limit(limit: int) -> None:
+        monkeypatch.setattr(
+            server, "runner", Database(engine, limiter=CapacityLimiter(limit))
+        )
+
+    yield use_limit
+    engine.dispose()
+
+
+async def _create_projects_in_parallel() -> float:
+    async with Client(server.mcp) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                client.call_tool("create_project", {"name": f"Parallel {i}"})
+                for i in range(CALLS)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    assert sorted(r.data["name"] for r in results) == [f"Parallel {i}" for i in range(CALLS)]
+    return elapsed
+
+
+def test_parallel_tool_calls_do_not_serialize(slow_runner):
+    slow_runner(CALLS)
+    elapsed = asyncio.run(_create_projects_in_parallel())
+    # ~ durée d'un seul appel, loin des CALLS * DELAY d'une exécution en série
+    assert elapsed < DELAY * 2
+
+
+def test_concurrency_limit_queues_tool_calls(slow_runner):
+    slow_runner(1)
+    elapsed = asyncio.run(_create_projects_in_parallel())
+    assert elapsed >= DELAY * CALLS
+
+
+def test_service_errors_become_tool_errors(slow_runner):
+    slow_runner(2)
+
+    async def call_twice() -> str:
+        async with Client(server.mcp) as client:
+            await client.call_tool("create_project", {"name": "Doublon"})
+            result = await client.call_tool(
+                "create_project", {"name": "Doublon"}, raise_on_error=False
+            )
+            return result.content[0].text
+
+    assert "Project name already exists" in asyncio.run(call_twice())
+
+
+def test_quantile_sketch_relative_error():
+    sketch = QuantileSketch(relative_accuracy=0.01, max_bins=256)
+    values = [i / 1000 for i in range(1, 10_001)]  # 1 ms → 10 s
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch.bins) <= 256
+    for q in (0.5, 0.95, 0.99):
+        exact = values[round(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= exact * 0.011
+
+
+def test_server_stats_tool_and_resource(slow_runner):
+    slow_runner(2)
+    server.tool_stats.reset()
+
+    async def calls() -> tuple[dict, dict]:
+        async with Client(server.mcp) as client:
+            await client.call_tool("create_project", {"name": "Stats"})
+            await client.call_tool("create_project", {"name": "Stats"}, raise_on_error=False)
+            for name in ("inconnu_1", "inconnu_2"):
+                await client.call_tool(name, {}, raise_on_error=False)
+            stats = (await client.call_tool("server_stats", {})).data
+            resource = await client.read_resource("stats://tools")
+            return stats, json.loads(resource[0].text)
+
+    stats, resource = asyncio.run(calls())
+    create = stats["tools"]["create_project"]
+    assert create["calls"] == 2
+    assert create["errors"] == 1
+    assert create["error_rate"] == 0.5
+    assert create["latency_ms"]["p50"] >= DELAY * 1000 * 0.98
+    assert create["request_bytes"] == 2 * len('{"name":"Stats"}')
+    assert create["response_bytes"] > 0
+    assert resource["tools"]["create_project"]["calls"] == 2
+    assert resource["tools"]["server_stats"]["calls"] == 1
+    # Noms inconnus : un seul compteur partagé (mémoire bornée)
+    assert stats["tools"]["<unknown>"]["calls"] == 2
+    assert stats["tools"]["<unknown>"]["errors"] == 2
+    assert "inconnu_1" not in stats["tools"]
+
+
+def test_search_epics_list_and_paged_variant(client, engine, monkeypatch):
+    monkeypatch.setattr(server, "runner", Database(engine))
+    project_id = client.post("/projects", json={"name": "Proj Epics MCP"}).json()["id"]
+    titles = ["Zeta auth", "Alpha auth", "Mu auth"]
+    for title in titles:
+        client.post(f"/projects/{project_id}/epics", json={"project_id": project_id, "title": title})
+
+    async def calls() -> tuple[list, list]:
+        async with Client(server.mcp) as mcp_client:
+            listed = (await mcp_client.call_tool("search_epics", {"project_id": project_id})).data
+            paged, cursor = [], None
+            while True:
+                arguments = {"project_id": project_id, "limit": 2}
+                if cursor:
+                    arguments["cursor"] = cursor
+                page = (await mcp_client.call_tool("search_epics_page", arguments)).data
+                paged += page["epics"]
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    return listed, paged
+
+    listed, paged = asyncio.run(calls())
+    assert [e["title"] for e in listed] == titles  # liste, ordre de création
+    assert [e["title"] for e in paged] == titles
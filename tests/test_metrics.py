@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import metrics
+
+
+def _sample(text: str, name: str, **labels: str) -> float:
+    """Valeur d’une série du texte Prometheus (labels donnés en sous-ensemble)."""
+    for line in text.splitlines():
+        match = re.match(rf"{name}(?:\{{(.*)\}})? (\S+)$", line)
+        if not match:
+            continue
+        present = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1) or ""))
+        if all(present.get(k) == v for k, v in labels.items()):
+            return float(match.group(2))
+    raise AssertionError(f"{name} {labels} absent")
+
+
+def test_metrics_route_latency_and_queries(client: TestClient, engine):
+    metrics.install_engine_metrics(engine)
+    metrics.reset()
+
+    project_id = client.post("/projects", json={"name": "Proj Metrics"}).json()["id"]
+    client.get(f"/projects/{project_id}/epics")
+    client.get(f"/projects/{project_id}/epics")
+    client.get("/nope")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+
+    route = "/projects/{project_id}/epics"
+    assert _sample(
+        text, "http_request_duration_seconds_count", method="GET", route=route, status="200"
+    ) == 2
+    assert _sample(
+        text, "http_request_duration_seconds_bucket", route=route, le="+Inf"
+    ) == 2
+    assert _sample(text, "http_request_duration_seconds_count", route="<unmatched>") == 1
+
+    # Requêtes SQL imputées à la route (propagées au thread de travail)
+    assert _sample(text, "http_request_db_queries_count", route=route) == 2
+    assert _sample(text, "http_request_db_queries_sum", route=route) >= 2
+    assert _sample(text, "http_request_db_queries_bucket", route=route, le="0") == 0
+    assert _sample(text, "http_request_db_seconds_sum", route=route) > 0
+    assert _sample(text, "db_query_duration_seconds_count") >= 3
+
+
+def test_histogram_per_thread_shards_are_merged():
+    histogram = metrics.Histogram("t_seconds", "test", (0.1, 1.0))
+
+    def work() -> None:
+        for _ in range(1000):
+            histogram.observe(0.5, (("k", "v"),))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    histogram.observe(2.0, (("k", "v"),))
+
+    text = "\n".join(histogram.render())
+    assert _sample(text, "t_seconds_bucket", le="0.1") == 0
+    assert _sample(text, "t_seconds_bucket", le="1") == 4000
+    assert _sample(text, "t_seconds_bucket", le="+Inf") == 4001
+    assert _sample(text, "t_seconds_count") == 4001
+    assert _sample(text, "t_seconds_sum") == 2002
+
+
+def test_pool_wait_recorded_by_timed_pool(tmp_path):
+    from app.models.db import create_db_engine
+    from app.settings import DatabaseSettings
+
+    db_engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{tmp_path}/m.db"))
+    assert isinstance(db_engine.pool, metrics.TimedQueuePool)
+    metrics.reset()
+    with db_engine.connect():
+        pass
+    assert _sample(metrics.render(), "db_pool_wait_seconds_count") == 1
+    db_engine.dispose()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.models import counters
+from app.models.counters import rebuild_counters
+from app.models.entities import ProjectCounter
+
+
+def _story(title: str, points: int = 3, priority: str = "medium") -> dict:
+    return {
+        "title": title,
+        "description": "Description suffisante pour le test",
+        "story_points": points,
+        "priority": priority,
+    }
+
+
+def test_project_stats_follow_writes(client: TestClient, engine):
+    project_id = client.post("/projects", json={"name": "Proj Stats"}).json()["id"]
+    epic_id = client.post(
+        f"/projects/{project_id}/epics",
+        json={"project_id": project_id, "title": "Epic Stats"},
+    ).json()["id"]
+
+    first = client.post(
+        f"/epics/{epic_id}/stories", json={"epic_id": epic_id, **_story("Une", 5, "high")}
+    ).json()["id"]
+    batch = client.post(
+        f"/epics/{epic_id}/stories:batch",
+        json={"items": [_story("Deux"), _story("Trois", 8)]},
+    ).json()
+    second, third = [r["story"]["id"] for r in batch["results"]]
+
+    client.put(f"/stories/{first}", json={"status": "todo", "assigned_to": "alice"})
+    client.patch("/stories:batch", json={"items": [{"id": second, "story_points": 13}]})
+    client.post(
+        f"/projects/{project_id}/stories:transition",
+        json={"target_status": "todo", "story_ids": [second, third]},
+    )
+
+    stats = client.get(f"/projects/{project_id}/stats").json()
+    assert stats["total"] == {"story_count": 3, "points": 26}
+    assert stats["by_status"] == {"todo": {"story_count": 3, "points": 26}}
+    assert stats["by_priority"]["high"] == {"story_count": 1, "points": 5}
+    assert stats["by_assignee"]["alice"] == {"story_count": 1, "points": 5}
+    assert stats["by_assignee"][""] == {"story_count": 2, "points": 21}
+
+    # Dérive simulée puis reconstruction : mêmes chiffres
+    with engine.begin() as conn:
+        conn.execute(delete(ProjectCounter))
+    assert client.get(f"/projects/{project_id}/stats").json()["total"]["story_count"] == 0
+    rebuild_counters(engine)
+    assert client.get(f"/projects/{project_id}/stats").json() == stats
+
+
+def test_counters_without_on_conflict(client: TestClient, monkeypatch):
+    # Dialecte sans upsert : UPDATE de la ligne, INSERT si absente
+    monkeypatch.setattr(counters, "_UPSERT_DIALECTS", {})
+    project_id = client.post("/projects", json={"name": "Proj Repli"}).json()["id"]
+    epic_id = client.post(
+        f"/projects/{project_id}/epics",
+        json={"project_id": project_id, "title": "Epic Repli"},
+    ).json()["id"]
+    for title in ("Story une", "Story deux"):
+        resp = client.post(f"/epics/{epic_id}/stories", json={"epic_id": epic_id, **_story(title)})
+        assert resp.status_code == 201
+
+    stats = client.get(f"/projects/{project_id}/stats").json()
+    assert stats["total"] == {"story_count": 2, "points": 6}
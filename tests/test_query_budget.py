@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from fastmcp import Client
+
+from app.mcp import server
+from app.metrics import MetricsMiddleware
+from app.models.db import Database
+from app.query_budget import QueryBudgetExceeded, query_budget as budget
+
+
+@pytest.mark.parametrize("stories", [2, 20])
+def test_route_budgets_do_not_grow_with_rows(
+    client: TestClient, query_budget, seed_project, stories
+):
+    seeded = seed_project("Proj Budget", stories=stories)
+    project_id, epic_id, story_ids = seeded.project_id, seeded.epic_id, seeded.story_ids
+    sprint_id = client.post(
+        f"/projects/{project_id}/sprints",
+        json={"project_id": project_id, "name": "Sprint Budget"},
+    ).json()["id"]
+
+    with query_budget(3, "GET /projects/{id}/stories"):
+        assert client.get(f"/projects/{project_id}/stories").status_code == 200
+    with query_budget(6, "PUT /sprints/{id}/stories"):
+        resp = client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids})
+        assert resp.status_code == 200
+    with query_budget(4, "POST /epics/{id}/stories"):
+        client.post(
+            f"/epics/{epic_id}/stories",
+            json={
+                "epic_id": epic_id,
+                "title": "Story en plus",
+                "description": "Description suffisante pour le test",
+                "story_points": 5,
+                "priority": "low",
+            },
+        )
+    with query_budget(5, "POST /projects/{id}/stories:transition"):
+        resp = client.post(
+            f"/projects/{project_id}/stories:transition",
+            json={"target_status": "todo", "filter": {"status": "backlog"}},
+        )
+        assert len(resp.json()["moved"]) == stories + 1
+
+
+def test_mcp_tool_budget(client: TestClient, engine, query_budget, seed_project, monkeypatch):
+    project_id = seed_project("Proj Budget", stories=10).project_id
+    monkeypatch.setattr(server, "runner", Database(engine))
+
+    async def calls() -> dict:
+        async with Client(server.mcp) as mcp_client:  # démarrage (init_db) hors budget
+            with query_budget(4, "mcp list_stories"):
+                await mcp_client.call_tool("list_stories", {"project_id": project_id})
+            with query_budget(5, "mcp list_stories include"):
+                result = await mcp_client.call_tool(
+                    "list_stories",
+                    {"project_id": project_id, "include": ["comment_count", "last_comment"]},
+                )
+            return result.structured_content
+
+    result = asyncio.run(calls())
+    assert all(s["comment_count"] == 0 for s in result["stories"])
+
+
+def test_exceeded_budget_lists_sql(engine, session):
+    from sqlalchemy import text
+
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        with budget(engine, 1, "deux requêtes"):
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT   2"))
+    message = str(exc.value)
+    assert "deux requêtes : 2 requêtes SQL pour un budget de 1" in message
+    assert "1. SELECT 1" in message and "2. SELECT 2" in message
+
+
+def test_over_budget_requests_are_logged(client: TestClient, engine, caplog):
+    from app.metrics import install_engine_metrics
+
+    install_engine_metrics(engine)
+    middleware = next(m for m in client.app.user_middleware if m.cls is MetricsMiddleware)
+    middleware.kwargs["query_budget"] = 0
+    client.app.middleware_stack = client.app.build_middleware_stack()
+
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        client.post("/projects", json={"name": "Proj Log"})
+    assert "POST /projects" in caplog.text
+    assert "budget 0" in caplog.text
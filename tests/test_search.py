@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _seed(client: TestClient, name: str) -> tuple[str, str, str]:
+    project_id = client.post("/projects", json={"name": name}).json()["id"]
+    epic_id = client.post(
+        f"/projects/{project_id}/epics",
+        json={"project_id": project_id, "title": "Authentification SSO"},
+    ).json()["id"]
+    story_id = client.post(
+        f"/epics/{epic_id}/stories",
+        json={
+            "epic_id": epic_id,
+            "title": "Page de login",
+            "description": "Formulaire de connexion avec authentification OAuth",
+            "story_points": 3,
+            "priority": "high",
+        },
+    ).json()["id"]
+    client.post(
+        f"/stories/{story_id}/comments",
+        json={"text": "Penser au rate limiting du login"},
+    )
+    client.post(
+        f"/projects/{project_id}/documents",
+        json={"project_id": project_id, "type": "tdr", "content": "Choix OAuth2 vs SAML"},
+    )
+    return project_id, epic_id, story_id
+
+
+def test_search_ranks_hits_across_entities(client: TestClient):
+    project_id, epic_id, story_id = _seed(client, "Proj Search")
+    _seed(client, "Other Search")  # ne doit pas remonter
+
+    resp = client.get(f"/projects/{project_id}/search", params={"q": "authent"})
+    assert resp.status_code == 200
+    hits = resp.json()["hits"]
+    assert {(h["entity_type"], h["id"]) for h in hits} == {
+        ("epic", epic_id),
+        ("story", story_id),
+    }
+    assert all("<mark>" in h["snippet"] for h in hits)
+    assert hits[0]["score"] >= hits[-1]["score"]
+
+    resp = client.get(
+        f"/projects/{project_id}/search", params={"q": "login", "type": "comment"}
+    )
+    assert [h["entity_type"] for h in resp.json()["hits"]] == ["comment"]
+
+
+def test_search_index_follows_updates(client: TestClient):
+    project_id, _, story_id = _seed(client, "Proj Updates")
+
+    client.put(f"/stories/{story_id}", json={"title": "Page de déconnexion"})
+
+    resp = client.get(f"/projects/{project_id}/search", params={"q": "deconnexion"})
+    assert [h["id"] for h in resp.json()["hits"]] == [story_id]
+
+
+def test_list_filters_use_search_index(client: TestClient):
+    project_id, epic_id, story_id = _seed(client, "Proj Filters")
+
+    data = client.get(
+        f"/projects/{project_id}/stories", params={"search": "oauth"}
+    ).json()
+    assert [s["id"] for s in data["stories"]] == [story_id]
+
+    epics = client.get(f"/projects/{project_id}/epics", params={"search": "sso"}).json()
+    assert [e["id"] for e in epics] == [epic_id]
+
+    docs = client.get(f"/projects/{project_id}/documents", params={"search": "saml"}).json()
+    assert len(docs) == 1
+
+
+def test_postgres_headline_only_for_kept_rows():
+    import uuid
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.services import search
+
+    statements: list[str] = []
+
+    class _Result:
+        def all(self) -> list:
+            return []
+
+    class _PostgresSession:
+        def exec(self, statement, params):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+            return _Result()
+
+    search._search_postgres(_PostgresSession(), uuid.uuid4(), ["auth"], ["story", "document"], 5)
+    (sql,) = statements
+    ranked = sql[sql.index("FROM (") : sql.index(") AS ranked")]
+    assert "ts_headline" not in ranked  # classement + LIMIT sans extrait
+    assert "LIMIT" in ranked
+    assert sql.count("ts_headline") == 1
+
+
+def test_search_falls_back_to_like_without_full_text(client: TestClient, session):
+    import uuid
+
+    from app.services import search
+
+    project_id, epic_id, story_id = _seed(client, "Proj Like")
+    _seed(client, "Other Like")
+    hits = search._search_like(
+        session, uuid.UUID(project_id), ["authent"], list(search.ALL_ENTITY_TYPES), 10
+    )
+    assert {(h.entity_type, str(h.id)) for h in hits} == {("epic", epic_id), ("story", story_id)}
+    assert all("<mark>" in h.snippet and h.score == 0 for h in hits)
+
+    hits = search._search_like(session, uuid.UUID(project_id), ["login"], ["comment"], 10)
+    assert [h.entity_type for h in hits] == ["comment"]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture
+def sprint_setup(client: TestClient, seed_project):
+    """`sprint_setup(stories=3)` : projet, sprint « Sprint 1 » et stories de 5 points."""
+
+    def setup(stories: int = 3) -> tuple[str, str, list[str]]:
+        seeded = seed_project("Proj Sprint", stories=stories, story_points=5)
+        sprint_id = client.post(
+            f"/projects/{seeded.project_id}/sprints",
+            json={"project_id": seeded.project_id, "name": "Sprint 1"},
+        ).json()["id"]
+        return seeded.project_id, sprint_id, seeded.story_ids
+
+    return setup
+
+
+def test_list_stories_sprint_filter(client: TestClient, sprint_setup):
+    project_id, sprint_id, story_ids = sprint_setup()
+    client.put(f"/sprints/{sprint_id}/stories/{story_ids[0]}")
+    client.put(f"/sprints/{sprint_id}/stories/{story_ids[2]}")
+
+    data = client.get(
+        f"/projects/{project_id}/stories", params={"sprint_id": sprint_id}
+    ).json()
+    assert data["total"] == 2
+    assert {s["id"] for s in data["stories"]} == {story_ids[0], story_ids[2]}
+
+
+def test_sprint_board_groups_by_status(client: TestClient, sprint_setup):
+    _, sprint_id, story_ids = sprint_setup()
+    for story_id in story_ids[:2]:
+        client.put(f"/sprints/{sprint_id}/stories/{story_id}")
+    client.put(f"/stories/{story_ids[1]}", json={"status": "todo"})
+
+    resp = client.get(f"/sprints/{sprint_id}/board")
+    assert resp.status_code == 200
+    board = resp.json()
+    columns = {c["status"]: c for c in board["columns"]}
+    assert list(columns) == ["backlog", "todo", "in_progress", "in_review", "done"]
+    assert [s["id"] for s in columns["backlog"]["stories"]] == [story_ids[0]]
+    assert columns["todo"]["story_count"] == 1
+    assert columns["todo"]["points"] == 5
+    assert columns["done"]["story_count"] == 0
+    assert board["total_points"] == 10
+
+
+def test_sprint_board_empty_and_unknown(client: TestClient, sprint_setup):
+    _, sprint_id, _ = sprint_setup(stories=0)
+
+    board = client.get(f"/sprints/{sprint_id}/board").json()
+    assert board["sprint"]["id"] == sprint_id
+    assert board["total_points"] == 0
+
+    resp = client.get(f"/sprints/{uuid.uuid4()}/board")
+    assert resp.status_code == 404
+
+
+def test_bulk_assign_stories(client: TestClient, sprint_setup):
+    project_id, sprint_id, story_ids = sprint_setup()
+    client.put(f"/sprints/{sprint_id}/stories/{story_ids[0]}")
+
+    resp = client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["assigned"] == story_ids[1:]
+    assert data["already_assigned"] == [story_ids[0]]
+    assert data["story_count"] == 3
+
+    resp = client.put(
+        f"/sprints/{sprint_id}/stories", json={"story_ids": [str(uuid.uuid4())]}
+    )
+    assert resp.status_code == 404
+
+
+def test_bulk_assign_reports_active_sprint_conflicts(client: TestClient, sprint_setup):
+    project_id, sprint_id, story_ids = sprint_setup()
+    client.put(f"/sprints/{sprint_id}/start")
+    client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids[:2]})
+    other_id = client.post(
+        f"/projects/{project_id}/sprints",
+        json={"project_id": project_id, "name": "Sprint 2"},
+    ).json()["id"]
+
+    resp = client.put(f"/sprints/{other_id}/stories", json={"story_ids": story_ids})
+    assert resp.status_code == 400
+    conflicts = resp.json()["detail"]["conflicts"]
+    assert {c["story_id"] for c in conflicts} == set(story_ids[:2])
+    # tout ou rien : la story libre n’a pas été affectée
+    board = client.get(f"/sprints/{other_id}/board").json()
+    assert board["total_points"] == 0
+
+
+def test_sprint_capacity_is_enforced(client: TestClient, sprint_setup):
+    _, sprint_id, story_ids = sprint_setup(stories=21)
+
+    resp = client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids})
+    assert resp.status_code == 400
+    assert "capacity" in resp.json()["detail"]
+
+    resp = client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids[:20]})
+    assert resp.json()["story_count"] == 20
+    resp = client.put(f"/sprints/{sprint_id}/stories/{story_ids[20]}")
+    assert resp.status_code == 400
+
+
+def test_sprint_analytics_snapshots_closed_sprints(client: TestClient, engine, sprint_setup):
+    project_id, sprint_id, story_ids = sprint_setup()
+    client.put(f"/sprints/{sprint_id}/stories", json={"story_ids": story_ids[:2]})
+    client.put(f"/sprints/{sprint_id}/start")
+    for step in ("todo", "in_progress", "in_review", "done"):
+        client.put(f"/stories/{story_ids[0]}", json={"status": step})
+    client.put(f"/sprints/{sprint_id}/close")
+
+    other_id = client.post(
+        f"/projects/{project_id}/sprints",
+        json={"project_id": project_id, "name": "Sprint 2"},
+    ).json()["id"]
+    client.put(f"/sprints/{other_id}/stories/{story_ids[2]}")
+    client.put(f"/sprints/{other_id}/close")
+
+    grouped_queries: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        if "GROUP BY" in statement:
+            grouped_queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        resp = client.get(f"/projects/{project_id}/sprints/analytics")
+        assert resp.status_code == 200
+        data = resp.json()
+        first, second = data["sprints"]
+        assert first["sprint_id"] == sprint_id
+        assert first["points_committed"] == 10
+        assert first["points_done"] == 5
+        assert first["stories_by_status"]["done"] == 1
+        assert first["stories_by_status"]["backlog"] == 1
+        assert second["points_committed"] == 5
+        assert data["velocity"]["sprint_ids"] == [other_id, sprint_id]
+        assert data["velocity"]["average"] == 2.5
+        assert grouped_queries == []  # sprints clos : instantanés de la clôture
+
+        again = client.get(f"/projects/{project_id}/sprints/analytics", params={"last": 1})
+        assert again.json()["velocity"]["points_done"] == [0]
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    # Chiffres figés à la clôture, sauf stories ajoutées / retirées du sprint
+    client.put(f"/stories/{story_ids[1]}", json={"story_points": 8})
+    first = client.get(f"/projects/{project_id}/sprints/analytics").json()["sprints"][0]
+    assert first["points_committed"] == 10
+
+    client.delete(f"/sprints/{sprint_id}/stories/{story_ids[1]}")
+    first = client.get(f"/projects/{project_id}/sprints/analytics").json()["sprints"][0]
+    assert first["points_committed"] == 5
+    assert first["story_count"] == 1
+
+
+def test_assign_story_from_another_project_is_rejected(
+    client: TestClient, sprint_setup, seed_project
+):
+    _, sprint_id, _ = sprint_setup()
+    (other_story,) = seed_project("Autre projet", stories=1).story_ids
+
+    resp = client.put(f"/sprints/{sprint_id}/stories/{other_story}")
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Story not found in sprint project"
+    board = client.get(f"/sprints/{sprint_id}/board").json()
+    assert all(not column["stories"] for column in board["columns"])
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def test_list_stories_paginates_in_sql(client: TestClient, seed_project):
+    project_id = seed_project("Proj Stories", stories=5).project_id
+
+    resp = client.get(f"/projects/{project_id}/stories", params={"limit": 2})
+    assert resp.status_code == 200
+    first = resp.json()
+    assert first["total"] == 5
+    assert len(first["stories"]) == 2
+
+    resp = client.get(
+        f"/projects/{project_id}/stories", params={"limit": 2, "offset": 4}
+    )
+    last = resp.json()
+    assert last["total"] == 5
+    assert len(last["stories"]) == 1
+
+    # Les pages ne se recouvrent pas (ordre stable)
+    ids = {s["id"] for s in first["stories"]} | {s["id"] for s in last["stories"]}
+    assert len(ids) == 3
+
+
+def test_list_stories_reads_only_read_model_columns(client: TestClient, engine, seed_project):
+    seeded = seed_project("Proj Stories", stories=2)
+    project_id, epic_id = seeded.project_id, seeded.epic_id
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        resp = client.get(f"/projects/{project_id}/stories")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.headers["etag"].startswith("W/")
+    story = resp.json()["stories"][0]
+    assert set(story) == {
+        "id", "epic_id", "title", "description", "story_points",
+        "priority", "status", "assigned_to", "version",
+    }
+    assert story["epic_id"] == epic_id
+    listing = next(s for s in statements if "FROM story" in s)
+    assert listing.startswith("SELECT story.id, story.epic_id, story.title")
+
+
+def test_list_stories_without_total(client: TestClient, seed_project):
+    project_id = seed_project("Proj Stories", stories=3).project_id
+
+    resp = client.get(
+        f"/projects/{project_id}/stories",
+        params={"limit": 2, "include_total": "false"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] is None
+    assert len(data["stories"]) == 2
+
+
+def test_list_stories_cursor_pagination(client: TestClient, seed_project):
+    project_id = seed_project("Proj Stories", stories=5).project_id
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "include_total": "false"}
+        if cursor is not None:
+            params["cursor"] = cursor
+        data = client.get(f"/projects/{project_id}/stories", params=params).json()
+        seen.extend(s["title"] for s in data["stories"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"Story {i}" for i in range(5)]  # ordre de création
+
+
+def test_list_stories_invalid_cursor(client: TestClient, seed_project):
+    project_id = seed_project("Proj Stories", stories=1).project_id
+
+    resp = client.get(f"/projects/{project_id}/stories", params={"cursor": "nope"})
+    assert resp.status_code == 400
+
+
+def _story_item(i: int) -> dict:
+    return {
+        "title": f"Batch {i}",
+        "description": "Description suffisante pour le lot",
+        "story_points": 2,
+        "priority": "low",
+    }
+
+
+def test_create_stories_batch_reports_per_item(client: TestClient, seed_project):
+    seeded = seed_project("Proj Stories")
+    project_id, epic_id = seeded.project_id, seeded.epic_id
+    items = [_story_item(i) for i in range(1000)]
+    items[1]["story_points"] = 4  # hors Fibonacci
+
+    resp = client.post(f"/epics/{epic_id}/stories:batch", json={"items": items})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["succeeded"] == 999
+    assert data["failed"] == 1
+    assert data["results"][0]["story"]["status"] == "backlog"
+    assert data["results"][1]["error"][0]["loc"] == ["story_points"]
+
+    listed = client.get(f"/projects/{project_id}/stories", params={"limit": 3}).json()
+    assert listed["total"] == 999
+    assert [s["title"] for s in listed["stories"]] == ["Batch 0", "Batch 2", "Batch 3"]
+
+
+def test_update_stories_batch_applies_workflow_rules(client: TestClient, seed_project):
+    seeded = seed_project("Proj Stories", stories=3)
+    project_id, epic_id = seeded.project_id, seeded.epic_id
+    ids = [
+        s["id"]
+        for s in client.get(f"/projects/{project_id}/stories").json()["stories"]
+    ]
+
+    resp = client.patch(
+        "/stories:batch",
+        json={
+            "items": [
+                {"id": ids[0], "status": "todo", "assigned_to": "alice"},
+                {"id": ids[1], "status": "done"},  # saute des étapes
+                {"id": ids[2], "title": "Renommée"},
+                {"id": ids[0], "status": "in_progress"},
+                {"id": "00000000-0000-0000-0000-000000000000", "title": "Absente"},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert results[0]["story"]["assigned_to"] == "alice"
+    assert "Invalid status transition" in results[1]["error"]
+    assert results[2]["story"]["title"] == "Renommée"
+    assert results[3]["error"] == "Duplicate story id in batch"
+    assert results[4]["error"] == "Story not found"
+
+    assert client.get(f"/stories/{ids[0]}").json()["status"] == "todo"
+    assert client.get(f"/stories/{ids[1]}").json()["status"] == "backlog"
+    assert client.get(f"/stories/{ids[2]}").json()["title"] == "Renommée"
+
+
+def test_bulk_transition_reports_moved_and_rejected(client: TestClient, seed_project):
+    project_id = seed_project("Proj Stories", stories=4).project_id
+    ids = sorted(
+        s["id"] for s in client.get(f"/projects/{project_id}/stories").json()["stories"]
+    )
+    client.put(f"/stories/{ids[1]}", json={"status": "todo"})
+    client.put(f"/stories/{ids[2]}", json={"status": "todo"})
+    client.put(f"/stories/{ids[2]}", json={"status": "in_progress"})
+    unknown = "00000000-0000-0000-0000-000000000000"
+
+    resp = client.post(
+        f"/projects/{project_id}/stories:transition",
+        json={"target_status": "in_progress", "story_ids": [*ids[:3], unknown]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["moved"] == [ids[1]]
+    assert data["unchanged"] == [ids[2]]
+    assert [(r["id"], r["status"]) for r in data["rejected"]] == [(ids[0], "backlog")]
+    assert data["not_found"] == [unknown]
+    assert client.get(f"/stories/{ids[1]}").json()["status"] == "in_progress"
+
+    resp = client.post(
+        f"/projects/{project_id}/stories:transition",
+        json={"target_status": "todo", "filter": {"status": "backlog"}},
+    )
+    assert sorted(resp.json()["moved"]) == [ids[0], ids[3]]
+    stats = client.get(f"/projects/{project_id}/stats").json()
+    assert stats["by_status"]["todo"]["story_count"] == 2
+    assert stats["by_status"]["in_progress"]["story_count"] == 2
+
+    resp = client.post(
+        f"/projects/{project_id}/stories:transition", json={"target_status": "done"}
+    )
+    assert resp.status_code == 400
+
+
+def test_list_stories_include_comments(client: TestClient, query_budget, seed_project):
+    project_id = seed_project("Proj Stories", stories=3).project_id
+    stories = client.get(f"/projects/{project_id}/stories").json()["stories"]
+    first, second = stories[0]["id"], stories[1]["id"]
+    for text in ("Premier commentaire", "Deuxième commentaire", "Dernier commentaire"):
+        client.post(f"/stories/{first}/comments", json={"text": text, "author": "alice"})
+    client.post(f"/stories/{second}/comments", json={"text": "Seul commentaire"})
+
+    with query_budget(4):
+        resp = client.get(
+            f"/projects/{project_id}/stories",
+            params={"include": "comment_count,last_comment"},
+        )
+    assert resp.status_code == 200
+    by_id = {s["id"]: s for s in resp.json()["stories"]}
+    assert by_id[first]["comment_count"] == 3
+    assert by_id[first]["last_comment"]["text"] == "Dernier commentaire"
+    assert by_id[second]["comment_count"] == 1
+    others = [s for s in by_id.values() if s["id"] not in (first, second)]
+    assert others[0]["comment_count"] == 0
+    assert others[0]["last_comment"] is None
+
+    counts = client.get(
+        f"/projects/{project_id}/stories", params={"include": "comment_count"}
+    ).json()["stories"]
+    assert {s["id"]: s["comment_count"] for s in counts}[first] == 3
+    assert all(s["last_comment"] is None for s in counts)
+
+    bad = client.get(f"/projects/{project_id}/stories", params={"include": "author"})
+    assert bad.status_code == 422
+
+
+def test_epic_comments_pagination(client: TestClient, seed_project):
+    epic_id = seed_project("Proj Stories").epic_id
+    for i in range(5):
+        client.post(f"/epics/{epic_id}/comments", json={"text": f"Commentaire {i}"})
+
+    resp = client.get(f"/epics/{epic_id}/comments", params={"limit": 2})
+    assert len(resp.json()) == 2
+    seen = [c["id"] for c in resp.json()]
+    cursor = resp.headers["x-next-cursor"]
+    while cursor:
+        resp = client.get(f"/epics/{epic_id}/comments", params={"limit": 2, "cursor": cursor})
+        seen += [c["id"] for c in resp.json()]
+        cursor = resp.headers.get("x-next-cursor")
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_concurrent_updates_keep_every_version_bump(file_db):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.models.schemas import EpicCreate, EpicUpdate, ProjectCreate, StoryCreate, StoryUpdate
+    from app.services import epics, projects, stories
+
+    project = file_db.run_blocking(projects.create_project, ProjectCreate(name="Proj Concurrence"))
+    epic = file_db.run_blocking(
+        epics.create_epic, project.id, EpicCreate(project_id=project.id, title="Epic Concurrence")
+    )
+    story = file_db.run_blocking(
+        stories.create_story,
+        epic.id,
+        StoryCreate(
+            epic_id=epic.id,
+            title="Story Concurrence",
+            description="Description suffisante pour le test",
+            story_points=3,
+            priority="medium",
+        ),
+    )
+
+    def work(worker: int) -> None:
+        for i in range(10):
+            file_db.run_blocking(
+                stories.update_story, story.id, StoryUpdate(title=f"Titre {worker}-{i}")
+            )
+            file_db.run_blocking(epics.update_epic, epic.id, EpicUpdate(title=f"Epic {worker}-{i}"))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+
+    assert file_db.run_blocking(stories.get_story, story.id).version == 1 + 80
+    assert file_db.run_blocking(epics.get_epic, epic.id).version == 1 + 80
@@ -3,7 +3,11 @@ from __future__ import annotations
 import pytest
 from fastapi import HTTPException
 
-from app.services.stories import validate_status_transition
+from app.services.stories import (
+    WORKFLOW_ORDER,
+    allowed_predecessors,
+    validate_status_transition,
+)
 
 
 def test_valid_status_transition_next_step():
@@ -19,4 +23,16 @@ def test_invalid_status_transition_skip_step():
     # backlog -> in_progress doit lever HTTP 400
     with pytest.raises(HTTPException) as exc:
         validate_status_transition("backlog", "in_progress")
-    assert exc.value.status_code == 400
\ No newline at end of file
+    assert exc.value.status_code == 400
+
+def test_allowed_predecessors_match_transition_rule():
+    for target in WORKFLOW_ORDER:
+        for current in WORKFLOW_ORDER:
+            if current == target:
+                continue
+            try:
+                validate_status_transition(current, target)
+                valid = True
+            except HTTPException:
+                valid = False
+            assert (current in allowed_predecessors(target)) == valid